@@ -0,0 +1,84 @@
+"""기사 중복 제거(SimHash) 마이크로 벤치마크.
+
+네이버 부동산 기사와 비슷한 길이의 합성 기사를 만들어 simhash()와 deduplicate_articles()의
+기사당 처리 시간을 측정합니다. 기사 수를 늘려도 기사당 시간이 거의 일정해야 합니다.
+
+사용법:
+    python benchmarks/dedup_benchmark.py [--articles 100] [--chars 3000] [--repeat 3] [--max-ms-per-article 15]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'tistory'))
+
+from article_dedup import deduplicate_articles, simhash  # noqa: E402
+
+
+WORDS = [
+    '서울', '아파트', '매매가격', '전세가율', '기준금리', '공급', '대책', '청약', '거래량', '상승', '하락', '보합',
+    '수도권', '지방', '정부', '발표', '규제', '완화', '대출', '분양', '재건축', '재개발', '입주', '물량',
+]
+
+
+def make_article(rng, chars):
+    """한글 음절과 부동산 용어, 숫자를 섞은 합성 기사 본문."""
+    parts = []
+    length = 0
+    while length < chars:
+        if rng.random() < 0.2:
+            part = rng.choice(WORDS)
+        else:
+            part = ''.join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(1, 4)))
+        if rng.random() < 0.1:
+            part += f" {rng.randint(0, 999)}.{rng.randint(0, 99)}%"
+        parts.append(part)
+        length += len(part) + 1
+    return ' '.join(parts)[:chars]
+
+
+def make_corpus(count, chars, seed=1):
+    """절반은 서로 다른 기사, 나머지는 앞 기사를 조금 고친 전재 기사로 구성합니다."""
+    rng = random.Random(seed)
+    originals = [make_article(rng, chars) for _ in range((count + 1) // 2)]
+    copies = [f"[{rng.choice(WORDS)}] " + original[:-20] for original in originals]
+    return (originals + copies)[:count]
+
+
+def measure(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=100)
+    parser.add_argument('--chars', type=int, default=3000, help='기사당 글자 수')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-ms-per-article', type=float, default=None,
+                        help='simhash 기사당 처리 시간(ms)이 이 값을 넘으면 실패로 끝냄')
+    args = parser.parse_args()
+
+    texts = make_corpus(args.articles, args.chars)
+    fingerprint_seconds = measure(lambda: [simhash(text) for text in texts], args.repeat)
+    dedup_seconds = measure(lambda: deduplicate_articles(texts), args.repeat)
+    _, stats = deduplicate_articles(texts)
+
+    per_article_ms = fingerprint_seconds / len(texts) * 1000
+    print(f"기사 {len(texts)}개 x {args.chars}자: 군집 {stats['clusters']}개")
+    print(f"simhash            {fingerprint_seconds:>8.3f}초  (기사당 {per_article_ms:.2f}ms)")
+    print(f"deduplicate        {dedup_seconds:>8.3f}초  (기사당 {dedup_seconds / len(texts) * 1000:.2f}ms)")
+
+    if args.max_ms_per_article is not None and per_article_ms > args.max_ms_per_article:
+        print(f"기준 초과: simhash 기사당 {per_article_ms:.2f}ms > {args.max_ms_per_article}ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
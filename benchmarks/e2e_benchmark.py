@@ -0,0 +1,542 @@
+"""오프라인 종단 간(end-to-end) 파이프라인 벤치마크.
+
+네이버 뉴스 목록 API(airsList.naver), 기사 페이지, Gemini, Tistory(/manage/, /manage/post.json, /manage/posts.json), SMTP를
+로컬 대역 서버로 띄운 뒤 실제 generate_post_with_gemini → post_to_tistory_requests → send_email 경로를
+반복 실행하고, 단계별 지연 시간 백분위수와 분당 게시 수를 보고합니다.
+--min-posts-per-minute, --max-p90을 지정하면 기준을 벗어날 때 종료 코드 1로 끝나므로 CI에서 성능 회귀를 잡을 수 있습니다.
+
+사용법:
+    python benchmarks/e2e_benchmark.py [--runs 10] [--concurrency 1] [--articles 30]
+        [--article-latency 0.05] [--straggler-rate 0.0] [--straggler-delay 5] [--error-rate 0.0]
+        [--gemini-ttfb 0.3] [--gemini-chunks 20] [--gemini-chunk-delay 0.02] [--gemini-per-1k-chars 0.0]
+        [--auth-latency 0.0] [--publish-error-rate 0.0] [--overlap] [--warm-state] [--no-stream] [--map-reduce] [--warm-cache]
+        [--json report.json]
+        [--min-posts-per-minute N] [--max-p90 stage=seconds ...]
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import re
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'tistory'))
+
+BLOG_NAME = 'bench'
+SESSION_COOKIE = 'TSSESSION=bench-session; _T_ANO=bench'
+
+REGIONS = ('서울', '경기', '인천', '부산', '대구', '세종', '강남구', '송파구', '마포구', '분당')
+SUBJECTS = ('아파트 매매가격', '전세가격', '청약 경쟁률', '미분양 물량', '주택 거래량', '재건축 단지 시세', '오피스텔 월세')
+MOVES = ('상승했습니다', '하락했습니다', '보합세를 보였습니다', '반등했습니다', '둔화됐습니다')
+CAUSES = ('기준금리 동결', 'DSR 규제 강화', '공급 대책 발표', '대출 금리 인하', '양도세 개편 논의', '입주 물량 증가')
+
+
+def make_article_text(article_id, paragraphs=12):
+    """기사 id마다 달라지는 부동산 기사 본문을 생성합니다. 4번째 기사마다 바로 앞 기사의 통신사 전재본이 됩니다.
+
+    문장 대부분을 무작위 음절 단어로 채워, 서로 다른 기사끼리는 SimHash 거리가 충분히 벌어지게 합니다.
+    """
+    source_id = article_id - 1 if article_id % 4 == 3 else article_id
+    rng = random.Random(source_id)
+
+    def word():
+        return ''.join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(2, 4)))
+
+    lines = []
+    for _ in range(paragraphs):
+        words = [word() for _ in range(rng.randint(12, 20))]
+        words.insert(rng.randrange(len(words)), f"{rng.choice(REGIONS)} {rng.choice(SUBJECTS)}")
+        words.insert(rng.randrange(len(words)), f"{rng.choice(CAUSES)} 영향으로 {rng.randint(1, 90) / 100:.2f}% {rng.choice(MOVES)}")
+        lines.append(' '.join(words) + '.')
+    if source_id != article_id:
+        lines.append(f"(전재 {article_id})")
+    return lines
+
+
+def make_article_page(article_id):
+    body = '<br>'.join(make_article_text(article_id))
+    nav = ''.join(f'<li><a href="/section/{i}">메뉴 {i}</a></li>' for i in range(50))
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>기사 {article_id}</title></head>
+<body><ul class="nav">{nav}</ul>
+<article id="dic_area"><div id="newsct_article">{body}
+<script>trackArticle({article_id});</script></div></article>
+<footer>{'<p>footer</p>' * 20}</footer></body></html>""".encode('utf-8')
+
+
+def make_post_text(sections=9):
+    """출력 형식(```html 블록, '# ' 제목, 시장 전망 섹션, 태그:: 줄, 2,800자 이상)을 따르는 생성 결과를 만듭니다."""
+    lines = ['```html', '# 오늘의 부동산 시장 분석 리포트: 금리와 공급 대책의 영향', '']
+    for s in range(1, sections + 1):
+        lines.append('<h2>향후 3-6개월 예상 시나리오</h2>' if s == sections
+                     else f'<h2>{s}. {SUBJECTS[s % len(SUBJECTS)]} 동향</h2>')
+        for p in range(4):
+            lines.append(
+                f"{REGIONS[(s + p) % len(REGIONS)]} 지역의 {SUBJECTS[(s * p) % len(SUBJECTS)]}은 "
+                f"{CAUSES[(s + p) % len(CAUSES)]} 이후 {MOVES[p % len(MOVES)]} "
+                f"**실수요자**라면 {CAUSES[p % len(CAUSES)]} 흐름을 함께 살펴보는 것이 좋습니다."
+            )
+        lines.extend(['* 핵심 지표 점검', '* 지역별 온도차 확인', ''])
+    lines.extend(['태그::부동산,아파트,금리,전세,청약', '```'])
+    return '\n'.join(lines)
+
+
+# --- HTTP 대역 서버 (네이버, 기사, Gemini, Tistory) ---
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b'', content_type='application/json; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def _post_text(self):
+        # 실제 생성 결과처럼 제목은 같아도 본문은 실행마다 다르게 함 (게시 대기열은 같은 payload만 하나로 봄)
+        with self.server.lock:
+            self.server.generated += 1
+            number = self.server.generated
+        return self.server.post_text.replace('* 핵심 지표 점검', f'* 핵심 지표 점검 ({number}차 분석)', 1)
+
+    def do_GET(self):
+        options = self.server.options
+        parts = urlsplit(self.path)
+        path = parts.path
+
+        if path == '/news/airsList.naver':
+            query = dict(parse_qsl(parts.query))
+            page, size = int(query.get('page', 1)), int(query.get('size', 30))
+            ids = range((page - 1) * size, min(page * size, options.articles))
+            base = f"http://127.0.0.1:{self.server.server_port}"
+            items = [{'linkUrl': f"{base}/article/{i % 7:03d}/{i:010d}", 'title': f"기사 {i}"} for i in ids]
+            self._send(200, json.dumps({'list': items}).encode('utf-8'))
+        elif path.startswith('/article/'):
+            article_id = int(path.rsplit('/', 1)[-1])
+            etag = f'"{article_id}"'
+            roll = random.random()
+            if roll < options.error_rate:
+                self._send(503, b'busy', 'text/plain')
+                return
+            # 일부 요청은 꼬리 지연(straggler)으로 늦게 응답
+            straggler = roll < options.error_rate + options.straggler_rate
+            time.sleep(options.straggler_delay if straggler else options.article_latency)
+            if self.headers.get('If-None-Match') == etag:
+                self._send(304, headers={'ETag': etag})
+            else:
+                self._send(200, make_article_page(article_id), 'text/html; charset=utf-8', {'ETag': etag})
+        elif path == f'/{BLOG_NAME}/manage/':
+            time.sleep(options.auth_latency)
+            if 'TSSESSION=' in (self.headers.get('Cookie') or ''):
+                self._send(200, b'<html>manage</html>', 'text/html; charset=utf-8')
+            else:
+                self._send(302, headers={'Location': 'https://www.tistory.com/auth/login'})
+        elif path == f'/{BLOG_NAME}/manage/posts.json':
+            keyword = dict(parse_qsl(parts.query)).get('searchKeyword', '')
+            with self.server.lock:
+                items = [{'id': i + 1, 'title': post['title'], 'permalink': f"/{BLOG_NAME}/{i + 1}",
+                          'published': post['published']}
+                         for i, post in reversed(list(enumerate(self.server.posts))) if keyword in post['title']]
+            self._send(200, json.dumps({'items': items}, ensure_ascii=False).encode('utf-8'))
+        elif re.fullmatch(rf'/{BLOG_NAME}/\d+', path):
+            index = int(path.rsplit('/', 1)[-1]) - 1
+            with self.server.lock:
+                post = self.server.posts[index] if index < len(self.server.posts) else None
+            if post is None:
+                self._send(404)
+            else:
+                self._send(200, post['content'].encode('utf-8'), 'text/html; charset=utf-8')
+        else:
+            self._send(404)
+
+    def do_POST(self):
+        options = self.server.options
+        path = urlsplit(self.path).path
+        body = self._read_body()
+
+        if path == f'/{BLOG_NAME}/manage/post.json':
+            time.sleep(options.publish_latency)
+            payload = json.loads(body)
+            with self.server.lock:
+                self.server.posts.append({'title': payload['title'], 'content': payload['content'],
+                                          'published': datetime.now(ZoneInfo('Asia/Seoul')).strftime('%Y-%m-%d %H:%M:%S')})
+                entry = len(self.server.posts)
+            # 글은 게시되었지만 응답이 실패한 경우 (재시도할 때 중복 게시가 생기기 쉬운 상황)
+            if random.random() < options.publish_error_rate:
+                self._send(503, b'busy', 'text/plain')
+                return
+            self._send(200, json.dumps({'entryId': entry, 'entryUrl': f"/{BLOG_NAME}/{entry}"}).encode('utf-8'))
+        elif path.endswith(':generateContent'):
+            prompt = self._prompt_text(body)
+            summaries = re.findall(r'^\[기사 (\d+)\]$', prompt, re.MULTILINE)
+            if summaries:
+                # 요약(map) 프롬프트에는 기사별 요약을 짧게 응답
+                time.sleep(options.gemini_ttfb + self._prefill_delay(options, prompt))
+                text = '\n'.join(f"[기사 {n}]\n- {make_article_text(int(n))[0][:80]}" for n in summaries)
+            else:
+                time.sleep(options.gemini_ttfb + self._prefill_delay(options, prompt)
+                           + options.gemini_chunk_delay * options.gemini_chunks)
+                text = self._post_text()
+            self._send(200, json.dumps(self._gemini_chunk(text)).encode('utf-8'))
+        elif path.endswith(':streamGenerateContent'):
+            self._stream_gemini(options, self._prompt_text(body))
+        else:
+            self._send(404)
+
+    @staticmethod
+    def _prompt_text(body):
+        request = json.loads(body)
+        return ''.join(part.get('text', '') for content in request.get('contents', []) for part in content['parts'])
+
+    @staticmethod
+    def _prefill_delay(options, prompt):
+        """프롬프트 길이에 비례하는 입력 처리 시간"""
+        return options.gemini_per_1k_chars * len(prompt) / 1000
+
+    @staticmethod
+    def _gemini_chunk(text):
+        return {'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'index': 0}]}
+
+    def _stream_gemini(self, options, prompt):
+        """REST 스트리밍 응답(JSON 배열)을 청크 전송 인코딩으로 조금씩 내보냅니다."""
+        text = self._post_text()
+        size = math.ceil(len(text) / options.gemini_chunks)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def write(data):
+            data = data.encode('utf-8')
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            self.wfile.flush()
+
+        time.sleep(options.gemini_ttfb + self._prefill_delay(options, prompt))
+        write('[')
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(options.gemini_chunk_delay)
+                write(',')
+            write(json.dumps(self._gemini_chunk(piece)))
+        write(']')
+        self.wfile.write(b'0\r\n\r\n')
+
+
+# --- SMTP 수신 대역 서버 ---
+class SmtpSinkHandler(socketserver.StreamRequestHandler):
+    """EHLO/AUTH/MAIL/RCPT/DATA/QUIT만 처리하고 받은 메일 수를 세는 최소 SMTP 서버입니다."""
+
+    def _reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self._reply('220 bench SMTP sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line[:4].upper()
+            if verb == b'EHLO':
+                self.wfile.write(b'250-bench\r\n250 AUTH PLAIN\r\n')
+            elif verb == b'AUTH':
+                self._reply('235 2.7.0 Authentication successful')
+            elif verb == b'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.messages.append(time.time())
+                self._reply('250 OK')
+            elif verb == b'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('250 OK')
+
+
+class SmtpSinkServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_stub_servers(options):
+    http_server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    http_server.daemon_threads = True
+    http_server.options = options
+    http_server.posts = []
+    http_server.generated = 0
+    http_server.lock = threading.Lock()
+    http_server.post_text = make_post_text()
+
+    smtp_server = SmtpSinkServer(('127.0.0.1', 0), SmtpSinkHandler)
+    smtp_server.messages = []
+
+    for server in (http_server, smtp_server):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return http_server, smtp_server
+
+
+def configure_environment(http_port, smtp_port, work_dir, warm_cache, map_reduce=False):
+    """파이프라인이 로컬 대역 서버를 사용하도록 환경 변수를 설정합니다."""
+    base = f"http://127.0.0.1:{http_port}"
+    os.environ.update({
+        'NAVER_NEWS_API_URL': f"{base}/news/airsList.naver",
+        'GEMINI_API_ENDPOINT': base,
+        'TISTORY_BASE_URL': f"{base}/{{blog}}",
+        'TISTORY_SESSION_FILE': os.path.join(work_dir, 'tistory_session'),
+        # 대역 서버용 가짜 쿠키이므로 CI에서도 평문 세션 파일을 사용
+        'TISTORY_SESSION_PLAINTEXT': '1',
+        'SMTP_SERVER': '127.0.0.1',
+        'SMTP_PORT': str(smtp_port),
+        'SMTP_STARTTLS': '0',
+        'ARTICLE_CACHE_DIR': os.path.join(work_dir, 'articles'),
+        # 콜드 캐시: 저장된 항목을 즉시 만료시켜 매 실행마다 기사를 새로 받음
+        'ARTICLE_CACHE_MAX_AGE': str(7 * 24 * 3600) if warm_cache else '0',
+        'GEMINI_MAP_REDUCE': '1' if map_reduce else '0',
+        'SUMMARY_STORE_PATH': os.path.join(work_dir, 'summaries.sqlite3'),
+        'SUMMARY_STORE_MAX_AGE': str(7 * 24 * 3600) if warm_cache else '0',
+        'PUBLISH_OUTBOX_PATH': os.path.join(work_dir, 'publish_outbox.sqlite3'),
+        # 대역 서버에는 호출 속도 제한이 없으므로 게시 간격을 두지 않고, 재시도는 짧게 기다림
+        'PUBLISH_RPM': '6000',
+        'PUBLISH_BURST': '100',
+        'PUBLISH_BACKOFF_BASE': '0.2',
+        'PUBLISH_BACKOFF_CAP': '1',
+    })
+    os.environ.pop('TISTORY_SESSION_KEY', None)
+
+
+def run_pipeline(pipeline, index, stream, overlap, warm=None):
+    """run 명령과 같은 순서로 글 생성 → 게시 → 결과 메일 전송을 한 번 실행합니다.
+
+    overlap=True이면 run 명령처럼 run_posting_pipeline()으로 로그인과 글 생성을 동시에 진행합니다.
+    warm(WarmState)이 주어지면 daemon 명령처럼 실행 사이에 모델, 연결 풀, 세션을 재사용합니다.
+    """
+    with pipeline['span']('run', index=index) as attrs:
+        builder = pipeline['StreamingPostBuilder']() if stream else None
+        if overlap:
+            # 실행마다 다른 글로 게시되도록 실행 번호를 게시 slot으로 사용
+            result = pipeline['run_posting_pipeline']('bench-api-key', BLOG_NAME, 'bench-id', 'bench-pw',
+                                                      builder=builder, slot=f"bench-{index}",
+                                                      **(warm.pipeline_options() if warm else {}))
+            if not result:
+                attrs['success'] = False
+                return False
+            success, message = result
+        else:
+            content = pipeline['generate_post_with_gemini']('bench-api-key', builder=builder)
+            if not content:
+                attrs['success'] = False
+                return False
+            post = builder.close() if builder else content
+            success, message = pipeline['post_to_tistory_requests'](BLOG_NAME, 'bench-id', 'bench-pw', post)
+
+        pipeline['send_email'](f"블로그 포스팅 {'성공' if success else '실패'}: {message}", message,
+                               'bench@example.com', 'bench-pw', 'owner@example.com')
+        attrs['success'] = success
+        return success
+
+
+def stage_durations(spans):
+    """최상위 'run' 구간마다 하위 구간 이름별 소요 시간 합계를 모아 {단계: [초, ...]}로 반환합니다."""
+    durations = {}
+
+    def walk(node, totals):
+        totals[node['name']] = totals.get(node['name'], 0.0) + (node['duration'] or 0.0)
+        for child in node['children']:
+            walk(child, totals)
+
+    for root in spans:
+        if root['name'] != 'run':
+            continue
+        totals = {}
+        walk(root, totals)
+        for name, seconds in totals.items():
+            durations.setdefault(name, []).append(seconds)
+    return durations
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def parse_thresholds(items):
+    thresholds = {}
+    for item in items:
+        stage, _, seconds = item.partition('=')
+        if not seconds:
+            raise SystemExit(f"--max-p90 형식은 stage=seconds 입니다: {item}")
+        thresholds[stage] = float(seconds)
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='전체 파이프라인 실행 횟수')
+    parser.add_argument('--concurrency', type=int, default=1, help='동시에 실행할 파이프라인 수')
+    parser.add_argument('--articles', type=int, default=30, help='뉴스 목록에 실을 기사 수')
+    parser.add_argument('--article-latency', type=float, default=0.05, help='기사 페이지 응답 지연(초)')
+    parser.add_argument('--straggler-rate', type=float, default=0.0, help='꼬리 지연으로 응답할 기사 요청 비율')
+    parser.add_argument('--straggler-delay', type=float, default=5.0, help='꼬리 지연 요청의 응답 지연(초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='503으로 응답할 기사 요청 비율')
+    parser.add_argument('--gemini-ttfb', type=float, default=0.3, help='Gemini 첫 응답까지의 지연(초)')
+    parser.add_argument('--gemini-chunks', type=int, default=20, help='Gemini 스트리밍 청크 수')
+    parser.add_argument('--gemini-chunk-delay', type=float, default=0.02, help='Gemini 청크 사이 지연(초)')
+    parser.add_argument('--gemini-per-1k-chars', type=float, default=0.0,
+                        help='Gemini 프롬프트 1000자당 추가 응답 지연(초)')
+    parser.add_argument('--auth-latency', type=float, default=0.0, help='Tistory 세션 확인(/manage/) 응답 지연(초)')
+    parser.add_argument('--publish-latency', type=float, default=0.1, help='post.json 응답 지연(초)')
+    parser.add_argument('--publish-error-rate', type=float, default=0.0,
+                        help='글을 게시한 뒤 503으로 응답할 post.json 요청 비율 (--overlap 경로의 게시 대기열 재시도 확인)')
+    parser.add_argument('--overlap', action='store_true',
+                        help='단계 그래프(run_posting_pipeline)로 로그인과 글 생성을 동시에 실행')
+    parser.add_argument('--warm-state', action='store_true',
+                        help='daemon 명령처럼 실행 사이에 Gemini 모델, 연결 풀, Tistory 세션을 유지함 (--overlap 포함)')
+    parser.add_argument('--no-stream', action='store_true', help='Gemini 응답을 스트리밍하지 않음')
+    parser.add_argument('--map-reduce', action='store_true', help='기사 묶음 요약(map) 후 최종 글 생성(reduce)')
+    parser.add_argument('--warm-cache', action='store_true', help='실행 사이에 기사 캐시를 유지함')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--min-posts-per-minute', type=float, help='분당 게시 수가 이보다 낮으면 실패')
+    parser.add_argument('--max-p90', action='append', default=[], metavar='STAGE=SECONDS',
+                        help='단계별 p90 상한 (여러 번 지정 가능)')
+    parser.add_argument('--verbose', action='store_true', help='파이프라인 출력을 그대로 표시함')
+    args = parser.parse_args()
+    args.overlap = args.overlap or args.warm_state
+    thresholds = parse_thresholds(args.max_p90)
+
+    http_server, smtp_server = start_stub_servers(args)
+    work_dir = tempfile.mkdtemp(prefix='e2e_benchmark_')
+    configure_environment(http_server.server_port, smtp_server.server_address[1], work_dir, args.warm_cache,
+                          args.map_reduce)
+
+    import real_estate_posting
+    from instrumentation import get_instrumentation, reset_instrumentation, span
+    from post_renderer import StreamingPostBuilder
+    from session_vault import SessionVault
+
+    # 저장된 세션을 미리 넣어 Selenium 로그인 없이 세션 확인 경로를 거치게 함
+    SessionVault(os.environ['TISTORY_SESSION_FILE']).save(SESSION_COOKIE)
+
+    pipeline = {
+        'span': span,
+        'StreamingPostBuilder': StreamingPostBuilder,
+        'generate_post_with_gemini': real_estate_posting.generate_post_with_gemini,
+        'post_to_tistory_requests': real_estate_posting.post_to_tistory_requests,
+        'run_posting_pipeline': real_estate_posting.run_posting_pipeline,
+        'send_email': real_estate_posting.send_email,
+    }
+
+    warm = None
+    if args.warm_state:
+        warm = real_estate_posting.WarmState('bench-api-key', BLOG_NAME, 'bench-id', 'bench-pw')
+
+    print(f"실행 {args.runs}회, 동시 {args.concurrency}개, 기사 {args.articles}개 "
+          f"(꼬리 지연 {args.straggler_rate:.0%}, 오류 {args.error_rate:.0%}), "
+          f"{'스트리밍' if not args.no_stream else '일괄 응답'}, {'웜' if args.warm_cache else '콜드'} 캐시, "
+          f"{'단계 동시 실행' if args.overlap else '순차 실행'}{', 웜 상태 유지' if warm else ''}"
+          f"{', map-reduce 요약' if args.map_reduce else ''}\n")
+
+    reset_instrumentation()
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, 'w'))
+    started = time.perf_counter()
+    with output, ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix='run') as pool:
+        results = list(pool.map(lambda i: run_pipeline(pipeline, i, not args.no_stream, args.overlap, warm),
+                                range(args.runs)))
+    wall_seconds = time.perf_counter() - started
+    if warm:
+        warm.close()
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    succeeded = sum(1 for ok in results if ok)
+    posts_per_minute = succeeded / wall_seconds * 60
+    report = get_instrumentation().report()
+    durations = stage_durations(report['spans'])
+    policy_counters = {name: value for name, value in sorted(report['counters'].items())
+                       if name.startswith('fetch_') and ':' not in name}
+    map_counters = {name: value for name, value in sorted(report['counters'].items()) if name.startswith('map_')}
+    outbox_counters = {name: value for name, value in sorted(report['counters'].items())
+                       if name.startswith('outbox_')}
+    duplicate_posts = len(http_server.posts) - len({(post['title'], post['content']) for post in http_server.posts})
+
+    stages = {
+        name: {
+            'count': len(values),
+            'p50': percentile(values, 50),
+            'p90': percentile(values, 90),
+            'p99': percentile(values, 99),
+            'max': max(values),
+        }
+        for name, values in sorted(durations.items(), key=lambda item: -max(item[1]))
+    }
+
+    print(f"{'stage':<18} {'n':>4} {'p50(s)':>8} {'p90(s)':>8} {'p99(s)':>8} {'max(s)':>8}")
+    for name, row in stages.items():
+        print(f"{name:<18} {row['count']:>4} {row['p50']:>8.3f} {row['p90']:>8.3f} {row['p99']:>8.3f} {row['max']:>8.3f}")
+    print(f"\n성공 {succeeded}/{args.runs}, 게시 {len(http_server.posts)}건 (중복 {duplicate_posts}건), 메일 {len(smtp_server.messages)}건, "
+          f"{wall_seconds:.2f}초, 분당 {posts_per_minute:.1f}건")
+    if policy_counters:
+        print("수집 정책: " + ", ".join(f"{name} {value}" for name, value in policy_counters.items()))
+    if map_counters:
+        print("요약(map): " + ", ".join(f"{name} {value}" for name, value in map_counters.items()))
+    if outbox_counters:
+        print("게시 대기열: " + ", ".join(f"{name} {value}" for name, value in outbox_counters.items()))
+
+    failures = []
+    if succeeded < args.runs:
+        failures.append(f"실패한 실행 {args.runs - succeeded}회")
+    if duplicate_posts:
+        failures.append(f"중복 게시 {duplicate_posts}건")
+    if args.min_posts_per_minute is not None and posts_per_minute < args.min_posts_per_minute:
+        failures.append(f"분당 게시 수 {posts_per_minute:.1f} < {args.min_posts_per_minute}")
+    for stage, limit in thresholds.items():
+        if stage not in stages:
+            failures.append(f"{stage} 단계가 기록되지 않았습니다")
+        elif stages[stage]['p90'] > limit:
+            failures.append(f"{stage} p90 {stages[stage]['p90']:.3f}초 > {limit}초")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'options': vars(args),
+                'runs': args.runs,
+                'succeeded': succeeded,
+                'wall_seconds': round(wall_seconds, 6),
+                'posts_per_minute': round(posts_per_minute, 3),
+                'stages': stages,
+                'fetch_policy': policy_counters,
+                'map_reduce': map_counters,
+                'outbox': outbox_counters,
+                'duplicate_posts': duplicate_posts,
+                'failures': failures,
+            }, f, ensure_ascii=False, indent=2)
+
+    if failures:
+        print("\n성능 기준 미달:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
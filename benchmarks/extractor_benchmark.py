@@ -0,0 +1,96 @@
+"""기사 본문 추출 백엔드 벤치마크.
+
+저장된 네이버 기사 페이지(*.html) 코퍼스로 백엔드별 처리량과 최대 메모리 사용량을 비교하고,
+기본 파서(html.parser)와 추출 결과가 같은지 확인합니다. 코퍼스를 지정하지 않으면 네이버 기사 구조를
+흉내 낸 합성 페이지를 사용합니다.
+
+사용법:
+    python benchmarks/extractor_benchmark.py [--corpus DIR] [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'tistory'))
+
+from article_extractor import EXTRACTORS  # noqa: E402
+
+
+def make_synthetic_page(index, paragraphs=40):
+    """네이버 기사 페이지와 비슷한 크기와 구조의 HTML을 생성합니다."""
+    nav = ''.join(f'<li><a href="/section/{i}">메뉴 {i}</a></li>' for i in range(200))
+    related = ''.join(f'<div class="related"><a href="/article/{i}">관련 기사 제목 {i}</a><p>요약 {i}</p></div>'
+                      for i in range(150))
+    body = '<br>'.join(f'{index}번 기사 {p}번째 문단: 서울 아파트 매매가격이 0.{p}% 상승했습니다.'
+                       for p in range(paragraphs))
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>기사 {index}</title>
+<script>var analytics = {{"id": {index}}};</script><style>.ad {{ display: none; }}</style></head>
+<body><header><ul class="nav">{nav}</ul></header>
+<div id="ct"><h2 class="media_end_head_headline">부동산 기사 {index}</h2>
+<article id="dic_area"><div id="newsct_article">
+<div class="ad">광고 영역</div>{body}
+<script>trackArticle({index});</script>
+<div class="journalist_card">기자 정보</div><a class="link_news">다른 기사</a>
+</div></article></div>
+<aside>{related}</aside><footer>{'<p>footer</p>' * 100}</footer></body></html>""".encode('utf-8')
+
+
+def load_corpus(corpus_dir, synthetic_count):
+    if corpus_dir:
+        paths = sorted(glob.glob(os.path.join(corpus_dir, '*.html')))
+        if not paths:
+            raise SystemExit(f"코퍼스 디렉터리에 .html 파일이 없습니다: {corpus_dir}")
+        pages = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+        return pages
+    return [make_synthetic_page(i) for i in range(synthetic_count)]
+
+
+def run_backend(extract, pages):
+    return [extract(page, 'utf-8') for page in pages]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='저장된 기사 페이지(*.html) 디렉터리')
+    parser.add_argument('--synthetic', type=int, default=50, help='코퍼스가 없을 때 생성할 페이지 수')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.synthetic)
+    total_mb = sum(len(page) for page in pages) / (1024 * 1024)
+    print(f"코퍼스: {len(pages)}페이지, {total_mb:.1f}MB\n")
+
+    reference = run_backend(EXTRACTORS['html.parser'], pages)
+    print(f"{'backend':<12} {'pages/s':>9} {'MB/s':>7} {'peak MB':>8} {'일치율':>7}")
+    for name, extract in EXTRACTORS.items():
+        try:
+            run_backend(extract, pages[:1])
+        except ImportError as e:
+            print(f"{name:<12} 건너뜀 ({e})")
+            continue
+
+        best = float('inf')
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            run_backend(extract, pages)
+            best = min(best, time.perf_counter() - started)
+
+        tracemalloc.start()
+        results = run_backend(extract, pages)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        matched = sum(1 for got, expected in zip(results, reference) if got == expected)
+        print(f"{name:<12} {len(pages) / best:>9.1f} {total_mb / best:>7.2f} {peak / (1024 * 1024):>8.2f} "
+              f"{matched / len(pages):>7.0%}")
+
+
+if __name__ == '__main__':
+    main()
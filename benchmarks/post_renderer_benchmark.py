@@ -0,0 +1,81 @@
+"""포스트 파싱/렌더링 마이크로 벤치마크.
+
+Gemini 출력 형식을 흉내 낸 대용량 보고서를 크기별로 생성해 prepare_post()의 처리 시간을 측정합니다.
+줄당 처리 시간(us/line)이 크기와 관계없이 거의 일정하면 선형 시간으로 동작하는 것입니다.
+
+사용법:
+    python benchmarks/post_renderer_benchmark.py [--max-lines 256000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'tistory'))
+
+from post_renderer import StreamingPostBuilder, prepare_post  # noqa: E402
+
+
+SECTION = [
+    '<h2 style="font-size: 22px;">주요 동향 분석</h2>',
+    '서울 아파트 매매가격은 <strong>0.12%</strong> 상승했습니다.',
+    '',
+    '<ul>',
+    '<li>대출 규제 강화로 거래량 감소</li>',
+    '<li>수도권 공급 물량 증가</li>',
+    '</ul>',
+    '<p style="line-height: 1.8;">전세가율은 보합세를 유지하고 있습니다.</p>',
+    '<h3 style="font-size: 18px;">실수요자 가이드</h3>',
+    '금리 변동에 대비한 <strong>고정금리</strong> 대출을 검토하세요.',
+]
+
+
+def make_report(line_count):
+    lines = ['```html', '# 2025-01-01 부동산 시장 분석 리포트']
+    while len(lines) < line_count:
+        lines.extend(SECTION)
+    lines.append('태그::부동산분석,시장동향,투자전략,정책변화,지역별분석')
+    lines.append('```')
+    return '\n'.join(lines)
+
+
+def measure(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def stream_in_chunks(report, chunk_size=64):
+    builder = StreamingPostBuilder()
+    for i in range(0, len(report), chunk_size):
+        builder.feed(report[i:i + chunk_size])
+    return builder.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-lines', type=int, default=256000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lines':>10} {'chars':>12} {'prepare(s)':>12} {'us/line':>9} {'stream(s)':>11} {'us/line':>9}")
+    line_count = 1000
+    per_line = []
+    while line_count <= args.max_lines:
+        report = make_report(line_count)
+        whole = measure(lambda: prepare_post(report), args.repeat)
+        streamed = measure(lambda: stream_in_chunks(report), args.repeat)
+        per_line.append(whole / line_count * 1e6)
+        print(f"{line_count:>10} {len(report):>12} {whole:>12.4f} {per_line[-1]:>9.2f} "
+              f"{streamed:>11.4f} {streamed / line_count * 1e6:>9.2f}")
+        line_count *= 4
+
+    print(f"\n줄당 처리 시간 비율 (최대/최소): {max(per_line) / min(per_line):.2f}x "
+          f"(1에 가까울수록 선형)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""명령행 시작 시간 벤치마크.
+
+real_estate_posting.py의 가벼운 명령(--help, render, notify --dry-run)을 새 프로세스로 반복 실행해
+시작부터 종료까지 걸린 시간의 중앙값을 보고하고, `-X importtime` 출력으로 무거운 의존성
+(google.generativeai, selenium, requests, bs4, lxml)이 불러와지지 않았는지 확인합니다.
+render와 notify는 임시 CHECKPOINT_DIR에 미리 저장해 둔 응답과 게시 결과를 사용하므로 네트워크가 필요 없습니다.
+기준은 같은 옵션으로 빈 스크립트를 실행한 인터프리터 시작 시간(기준선)에 명령이 더한 시간으로 판단하므로
+러너의 속도와 관계없이 비교할 수 있습니다. --max-added-ms를 지정하면 중앙값에서 기준선을 뺀 시간이 기준을 넘거나
+무거운 의존성이 불러와졌을 때 종료 코드 1로 끝납니다.
+
+사용법:
+    python benchmarks/startup_benchmark.py [--runs 10] [--max-added-ms 150] [--json startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'tistory')
+SCRIPT = os.path.join(SOURCE_DIR, 'real_estate_posting.py')
+sys.path.insert(0, SOURCE_DIR)
+
+# 가벼운 명령에서 불러오면 안 되는 최상위 모듈
+HEAVY_MODULES = ('google', 'selenium', 'requests', 'bs4', 'lxml', 'urllib3')
+
+COMMANDS = {
+    'help': ['--help'],
+    'render': ['render', '--run-id', 'bench'],
+    'notify': ['notify', '--run-id', 'bench', '--dry-run'],
+}
+
+RESPONSE = '\n'.join([
+    '# 2025-01-01 부동산 시장 분석 리포트',
+    '<h2 style="font-size: 22px;">시장 동향</h2>',
+    '<p style="line-height: 1.8;">서울 아파트 매매가격은 보합세를 보였습니다.</p>',
+    '태그::부동산분석,시장동향,투자전략,정책변화,지역별분석',
+])
+
+
+def seed_checkpoint(root):
+    from checkpoint_store import CheckpointStore
+
+    checkpoint = CheckpointStore(root).bind('bench')
+    checkpoint.save('response', RESPONSE)
+    checkpoint.save('publish', {'success': True, 'message': '2025-01-01 부동산 시장 분석 리포트'})
+
+
+def imported_modules(stderr):
+    """-X importtime 출력에서 불러온 최상위 모듈 이름 집합을 반환합니다."""
+    modules = set()
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            modules.add(name.split('.')[0])
+    return modules
+
+
+def interpreter_startup():
+    # 명령과 같은 -X importtime 옵션으로 측정해 그 부담도 기준선에 포함
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-X', 'importtime', '-c', 'pass'], check=True, capture_output=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def run_command(args, env, cwd):
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', SCRIPT, *args], env=env, cwd=cwd,
+                            capture_output=True, text=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} 실패 (종료 코드 {result.returncode}):\n{result.stdout}{result.stderr}")
+    return elapsed, imported_modules(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-added-ms', type=float, default=None,
+                        help='명령별 시작 시간 중앙값에서 인터프리터 기준선을 뺀 시간의 기준 (밀리초)')
+    parser.add_argument('--json', metavar='FILE', help='결과를 JSON으로 저장할 파일')
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix='startup-bench-')
+    env = dict(os.environ, CHECKPOINT_DIR=os.path.join(work, 'checkpoints'),
+               PIPELINE_REPORT=os.path.join(work, 'pipeline_report.json'))
+    seed_checkpoint(env['CHECKPOINT_DIR'])
+
+    # 인터프리터 자체의 시작 시간 (기준선)
+    baseline = statistics.median(interpreter_startup() for _ in range(args.runs))
+
+    report = {'baseline_ms': round(baseline, 1), 'commands': {}}
+    failed = False
+    print(f"인터프리터 기준선: {baseline:.1f}ms\n")
+    print(f"{'command':<10} {'median(ms)':>11} {'added(ms)':>10} {'max(ms)':>9}  heavy modules")
+    for name, command in COMMANDS.items():
+        timings = []
+        heavy = set()
+        for _ in range(args.runs):
+            elapsed, modules = run_command(command, env, work)
+            timings.append(elapsed)
+            heavy |= modules.intersection(HEAVY_MODULES)
+        median = statistics.median(timings)
+        added = median - baseline
+        over_budget = args.max_added_ms is not None and added > args.max_added_ms
+        failed = failed or over_budget or bool(heavy)
+        report['commands'][name] = {'median_ms': round(median, 1), 'added_ms': round(added, 1),
+                                    'max_ms': round(max(timings), 1), 'heavy_modules': sorted(heavy)}
+        print(f"{name:<10} {median:>11.1f} {added:>10.1f} {max(timings):>9.1f}  {', '.join(sorted(heavy)) or '-'}"
+              f"{'  (기준 초과)' if over_budget else ''}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if failed:
+        print("\n시작 시간 기준을 넘었거나 무거운 의존성이 불러와졌습니다.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
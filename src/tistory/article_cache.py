@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+# 추출 결과가 바뀌면 올려서 이전 형식의 항목을 버림 (2: 인코딩 선언이 없는 페이지의 lxml 디코딩 수정)
+ENTRY_VERSION = 2
+
+
+# --- 기사 디스크 캐시 ---
+class ArticleCache:
+    """URL을 키로 추출된 기사 본문과 ETag/Last-Modified를 디스크에 저장합니다.
+
+    fresh_for(초) 이내에 확인된 항목은 네트워크 요청 없이 사용하고,
+    그 이후에는 조건부 요청(If-None-Match/If-Modified-Since)으로 재검증합니다.
+    max_age(초) 동안 확인되지 않은 항목과 max_bytes를 넘는 오래된 항목은 prune()에서 삭제됩니다.
+    """
+
+    def __init__(self, cache_dir, max_age=7 * 24 * 3600, max_bytes=50 * 1024 * 1024, fresh_for=600):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.fresh_for = fresh_for
+        self.stats = {'hit': 0, 'revalidated': 0, 'miss': 0}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, url):
+        """캐시 항목 dict를 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        path = self._path(url)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('version', 1) != ENTRY_VERSION or time.time() - entry.get('checked_at', 0) > self.max_age:
+            self._remove(path)
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry.get('checked_at', 0) <= self.fresh_for
+
+    @staticmethod
+    def conditional_headers(entry):
+        """재검증 요청에 사용할 조건부 헤더를 반환합니다."""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, text, etag=None, last_modified=None):
+        now = time.time()
+        entry = {
+            'version': ENTRY_VERSION,
+            'url': url,
+            'text': text,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': now,
+            'checked_at': now,
+        }
+        self._write(self._path(url), entry)
+
+    def touch(self, entry):
+        """304 응답으로 재검증된 항목의 확인 시각을 갱신합니다."""
+        entry['checked_at'] = time.time()
+        self._write(self._path(entry['url']), entry)
+
+    def record(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _write(self, path, entry):
+        # 동시 수집 중 부분적으로 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def prune(self):
+        """만료된 항목을 지우고, 전체 크기가 max_bytes 이하가 될 때까지 오래된 항목부터 삭제합니다."""
+        now = time.time()
+        entries = []
+        for dir_entry in os.scandir(self.cache_dir):
+            if not dir_entry.name.endswith('.json'):
+                continue
+            try:
+                stat = dir_entry.stat()
+            except OSError:
+                # 같은 디렉터리를 쓰는 다른 실행이 먼저 지운 항목
+                continue
+            if now - stat.st_mtime > self.max_age:
+                self._remove(dir_entry.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def summary(self):
+        total = sum(self.stats.values())
+        saved = self.stats['hit'] + self.stats['revalidated']
+        return (f"기사 캐시: 적중 {self.stats['hit']}, 재검증(304) {self.stats['revalidated']}, "
+                f"미스 {self.stats['miss']} (파싱 생략 {saved}/{total})")
@@ -0,0 +1,98 @@
+import hashlib
+import re
+from collections import Counter
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+# --- SimHash 계산 함수 ---
+# _BIT_TABLES[k]는 바이트 값을 그 값의 k번째 비트(0 또는 1)로 바꾸는 bytes.translate 표
+_BIT_TABLES = [bytes(value >> bit & 1 for value in range(256)) for bit in range(8)]
+
+
+def simhash(text, ngram=3, bits=64):
+    """공백을 정규화한 문자 n-gram의 빈도로 가중한 SimHash 지문을 계산합니다.
+
+    n-gram마다 해시를 한 번만 계산해 빈도만큼 이어 붙인 뒤, 바이트 위치와 비트별로 1의 개수를
+    bytes.translate/count로 한꺼번에 셉니다. 비트마다 가중치를 더하던 방식과 같은 지문을 반환합니다.
+    """
+    normalized = _WHITESPACE_RE.sub(' ', text).strip()
+    if len(normalized) < ngram:
+        shingles = Counter([normalized])
+    else:
+        shingles = Counter(normalized[i:i + ngram] for i in range(len(normalized) - ngram + 1))
+
+    size = bits // 8
+    digests = b''.join([
+        hashlib.blake2b(shingle.encode('utf-8'), digest_size=size).digest() * count
+        for shingle, count in shingles.items()
+    ])
+    total = len(digests) // size
+
+    # 비트가 1인 n-gram의 가중치 합이 나머지보다 크면(가중치 합 > 0) 지문의 해당 비트를 켬
+    fingerprint = 0
+    for position in range(size):
+        column = digests[position::size]
+        shift = (size - 1 - position) * 8  # 다이제스트는 big-endian 정수로 해석
+        for bit, table in enumerate(_BIT_TABLES):
+            if 2 * column.translate(table).count(1) > total:
+                fingerprint |= 1 << (shift + bit)
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+# --- 유사 기사 군집화 함수 ---
+def cluster_articles(texts, threshold=10, fingerprints=None):
+    """SimHash 해밍 거리가 threshold 이하인 기사끼리 묶어 인덱스 목록의 리스트로 반환합니다.
+
+    군집은 각 군집의 첫 기사가 나타난 순서대로 정렬됩니다. fingerprints가 주어지면 지문을 다시 계산하지 않습니다.
+    """
+    if fingerprints is None:
+        fingerprints = [simhash(text) for text in texts]
+    clusters = []
+    for index, fingerprint in enumerate(fingerprints):
+        for cluster in clusters:
+            if hamming_distance(fingerprints[cluster[0]], fingerprint) <= threshold:
+                cluster.append(index)
+                break
+        else:
+            clusters.append([index])
+    return clusters
+
+
+# --- 중복 기사 제거 함수 ---
+def deduplicate_articles(texts, threshold=10, fingerprints=None):
+    """거의 같은 기사 군집마다 가장 긴 기사 하나만 남기고, 보도한 매체 수를 앞에 표시합니다.
+
+    (남은 기사 목록, 통계 dict)를 반환합니다. 통계에는 입력/군집 수, 절약한 문자 수와
+    남은 기사 각각의 원래 인덱스(kept_indices), 남은 기사가 대표하는 군집의 원래 인덱스 목록(clusters_of_kept)이 들어갑니다.
+    """
+    clusters = cluster_articles(texts, threshold, fingerprints)
+
+    kept = []
+    kept_indices = []
+    for cluster in clusters:
+        index = max(cluster, key=lambda i: len(texts[i]))
+        representative = texts[index]
+        if len(cluster) > 1:
+            representative = f"[{len(cluster)}개 매체 보도]\n{representative}"
+        kept.append(representative)
+        kept_indices.append(index)
+
+    chars_before = sum(len(text) for text in texts)
+    chars_after = sum(len(text) for text in kept)
+    stats = {
+        'articles': len(texts),
+        'clusters': len(clusters),
+        'duplicates': len(texts) - len(clusters),
+        'chars_before': chars_before,
+        'chars_after': chars_after,
+        'chars_saved': chars_before - chars_after,
+        'kept_indices': kept_indices,
+        'clusters_of_kept': clusters,
+    }
+    return kept, stats
@@ -0,0 +1,129 @@
+import importlib.util
+import os
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EncodingDetector, UnicodeDammit
+
+
+# 네이버 뉴스 본문 요소 id와 제거할 요소 선택자
+ARTICLE_BODY_IDS = ('articleBodyContents', 'newsct_article')
+ARTICLE_BODY_SELECTOR = '#articleBodyContents, #newsct_article'
+NOISE_SELECTOR = 'script, style, .ad, .promotion, .link_news, .journalist_card'
+NOISE_CLASSES = ('ad', 'promotion', 'link_news', 'journalist_card')
+
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.-]+)', re.IGNORECASE)
+
+# 인코딩 선언이 없는 문서에서 차례로 시도할 인코딩 (네이버 뉴스와 국내 언론사 페이지)
+UNDECLARED_ENCODINGS = ('utf-8', 'cp949')
+
+
+def charset_from_content_type(content_type):
+    """Content-Type 헤더에 명시된 charset을 반환합니다. 명시되지 않았으면 None을 반환합니다."""
+    match = _CHARSET_RE.search(content_type or '')
+    return match.group(1) if match else None
+
+
+# --- 추출 백엔드 ---
+def _extract_with_soup(soup):
+    # 네이버 뉴스 본문 선택자 (일반적인 경우)
+    article_body = soup.select_one(ARTICLE_BODY_SELECTOR)
+    if not article_body:
+        return None
+
+    # 불필요한 요소(광고, 스크립트 등) 제거
+    for el in article_body.select(NOISE_SELECTOR):
+        el.decompose()
+
+    return article_body.get_text(separator='\n', strip=True)
+
+
+def extract_with_html_parser(html, encoding=None):
+    """문서 전체를 html.parser로 파싱합니다. (기존 동작)"""
+    if isinstance(html, bytes):
+        soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+    else:
+        soup = BeautifulSoup(html, 'html.parser')
+    return _extract_with_soup(soup)
+
+
+def extract_with_strainer(html, encoding=None):
+    """SoupStrainer로 본문 요소의 하위 트리만 파싱합니다."""
+    only_body = SoupStrainer(id=list(ARTICLE_BODY_IDS))
+    if isinstance(html, bytes):
+        soup = BeautifulSoup(html, 'html.parser', parse_only=only_body, from_encoding=encoding)
+    else:
+        soup = BeautifulSoup(html, 'html.parser', parse_only=only_body)
+    return _extract_with_soup(soup)
+
+
+def extract_with_lxml(html, encoding=None):
+    """lxml로 바이트를 직접 디코딩/파싱하고 XPath로 본문만 추출합니다."""
+    import lxml.html
+
+    if isinstance(html, str):
+        # 인코딩 선언이 포함된 str은 lxml이 거부하므로 UTF-8 바이트로 변환
+        html, encoding = html.encode('utf-8'), 'utf-8'
+    elif not encoding and not EncodingDetector.find_declared_encoding(html, is_html=True):
+        # 헤더와 meta 태그 모두 charset이 없으면 lxml은 latin-1로 디코딩하므로 인코딩을 직접 판별
+        encoding = UnicodeDammit(html, list(UNDECLARED_ENCODINGS), is_html=True).original_encoding or 'utf-8'
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    root = lxml.html.fromstring(html, parser=parser)
+
+    id_test = ' or '.join(f'@id="{body_id}"' for body_id in ARTICLE_BODY_IDS)
+    matches = root.xpath(f'//*[{id_test}]')
+    if not matches:
+        return None
+    article_body = matches[0]
+
+    texts = (text.strip() for text in _iter_lxml_text(article_body))
+    return '\n'.join(text for text in texts if text)
+
+
+def _is_noise(el):
+    if el.tag in ('script', 'style'):
+        return True
+    return any(name in NOISE_CLASSES for name in (el.get('class') or '').split())
+
+
+def _iter_lxml_text(el):
+    # 불필요한 요소의 하위 텍스트는 건너뛰되, 뒤따르는 텍스트(tail)는 별도 문자열로 유지 (BeautifulSoup과 동일)
+    if el.text:
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str) and not _is_noise(child):
+            yield from _iter_lxml_text(child)
+        if child.tail:
+            yield child.tail
+
+
+EXTRACTORS = {
+    'html.parser': extract_with_html_parser,
+    'strainer': extract_with_strainer,
+    'lxml': extract_with_lxml,
+}
+
+
+def resolve_backend(backend=None):
+    """추출 백엔드 이름을 결정합니다. 'auto'는 lxml이 설치되어 있으면 lxml, 아니면 strainer입니다."""
+    backend = backend or os.environ.get("ARTICLE_EXTRACTOR", "auto")
+    if backend == 'auto':
+        return 'lxml' if importlib.util.find_spec('lxml') else 'strainer'
+    if backend not in EXTRACTORS:
+        raise ValueError(f"알 수 없는 기사 추출 백엔드입니다: {backend} (지원: auto, {', '.join(EXTRACTORS)})")
+    return backend
+
+
+# --- 기사 본문 추출 함수 ---
+def extract_article_text(html, encoding=None, backend=None):
+    """네이버 뉴스 기사 HTML(str 또는 bytes)에서 본문 텍스트를 추출합니다. 본문이 없으면 None을 반환합니다.
+
+    선택한 백엔드에서 오류가 발생하면 문서 전체를 html.parser로 파싱하는 기존 방식으로 재시도합니다.
+    """
+    backend = resolve_backend(backend)
+    if backend != 'html.parser':
+        try:
+            return EXTRACTORS[backend](html, encoding)
+        except Exception as e:
+            print(f"{backend} 백엔드로 기사 본문 추출 중 오류 발생, 기본 파서로 재시도합니다: {e}")
+    return extract_with_html_parser(html, encoding)
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from article_cache import ArticleCache
+from fetch_policy import FetchPolicy
+from instrumentation import count
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# (연결 타임아웃, 읽기 타임아웃) 초 단위
+DEFAULT_TIMEOUT = (3.05, 10)
+
+_DONE = object()
+
+
+# --- HTTP 세션 생성 함수 ---
+def create_http_session(pool_size=16, headers=None):
+    """keep-alive 연결을 재사용하는 공유 requests 세션을 생성합니다."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+
+# --- 호스트별 동시 요청 제한 ---
+class HostLimiter:
+    """호스트마다 동시에 진행되는 요청 수를 제한합니다."""
+
+    def __init__(self, per_host):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def for_url(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+
+def _fetch_one(session, limiter, policy, url, deadline_at, extract, cache):
+    """기사 하나를 가져와 결과 dict를 반환합니다."""
+    result = {'url': url, 'text': None, 'status_code': None, 'elapsed': 0.0, 'error': None, 'cache': None}
+
+    entry = cache.get(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        cache.record('hit')
+        result.update(text=entry['text'], cache='hit')
+        return result
+
+    with limiter.for_url(url):
+        started = time.perf_counter()
+        if time.monotonic() >= deadline_at:
+            result['error'] = "전체 수집 시간 초과로 요청하지 않음"
+            return result
+        try:
+            response = policy.get(session, url, headers=ArticleCache.conditional_headers(entry), deadline_at=deadline_at)
+            result['status_code'] = response.status_code
+
+            if response.status_code == 304 and entry:
+                # 변경되지 않은 기사: 다운로드와 파싱 모두 생략
+                cache.touch(entry)
+                cache.record('revalidated')
+                result.update(text=entry['text'], cache='revalidated')
+                return result
+
+            response.raise_for_status()
+            count('bytes_fetched', len(response.content))
+            result['text'] = extract(response) if extract else response.text
+            if cache:
+                cache.put(url, result['text'], response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                cache.record('miss')
+                result['cache'] = 'miss'
+        except requests.exceptions.RequestException as e:
+            result['error'] = str(e)
+        except Exception as e:
+            result['error'] = f"본문 처리 중 오류: {e}"
+        finally:
+            result['elapsed'] = time.perf_counter() - started
+            # 어느 호스트가 느린지 알 수 있도록 호스트별 요청 수와 소요 시간 합계 기록
+            host = urlsplit(url).netloc
+            count(f'fetch_requests:{host}')
+            count(f'fetch_seconds:{host}', result['elapsed'])
+
+    return result
+
+
+# --- 기사 동시 수집 함수 ---
+def iter_fetch_articles(urls, session=None, max_workers=8, per_host=4, timeout=DEFAULT_TIMEOUT,
+                        deadline=60.0, extract=None, cache=None, max_in_flight=None, policy=None):
+    """URL 이터러블을 지연 소비하며 기사를 동시에 가져오고, 입력 순서대로 결과를 하나씩 내보냅니다.
+
+    동시에 진행 중인 요청은 최대 max_in_flight개(기본값: max_workers의 2배)이며,
+    소비자가 결과를 가져가야 다음 URL을 읽으므로 대량 수집에서도 메모리 사용량이 일정합니다.
+    전체 deadline이 지나면 urls를 더 읽지 않고, 이미 요청한 기사의 결과만 내보낸 뒤 끝냅니다.
+    결과 형식과 나머지 인자는 fetch_articles()와 같습니다.
+    """
+    own_session = session is None
+    if own_session:
+        session = create_http_session(pool_size=max_workers)
+    own_policy = policy is None
+    if own_policy:
+        policy = FetchPolicy(timeout)
+
+    limiter = HostLimiter(per_host)
+    deadline_at = time.monotonic() + deadline
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="article-fetch")
+    max_in_flight = max_in_flight or max_workers * 2
+    url_iter = iter(urls)
+    pending = deque()
+
+    try:
+        while True:
+            # deadline이 지나면 새 URL을 읽지 않음 (목록 API의 다음 페이지 요청도 멈춤)
+            while len(pending) < max_in_flight and time.monotonic() < deadline_at:
+                url = next(url_iter, _DONE)
+                if url is _DONE:
+                    break
+                future = executor.submit(_fetch_one, session, limiter, policy, url, deadline_at, extract, cache)
+                pending.append((url, future))
+            if not pending:
+                return
+
+            url, future = pending.popleft()
+            try:
+                yield future.result(timeout=max(0.0, deadline_at - time.monotonic()))
+            except FutureTimeoutError:
+                future.cancel()
+                yield {'url': url, 'text': None, 'status_code': None,
+                       'elapsed': deadline, 'error': "전체 수집 시간 초과", 'cache': None}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if own_policy:
+            policy.close()
+        if own_session:
+            session.close()
+
+
+def fetch_articles(urls, session=None, max_workers=8, per_host=4, timeout=DEFAULT_TIMEOUT,
+                   deadline=60.0, extract=None, cache=None, policy=None):
+    """여러 기사를 스레드 풀로 동시에 가져오고, 원래 순서대로 결과를 반환합니다.
+
+    각 결과는 url, text, status_code, elapsed(초), error 키를 가진 dict입니다.
+    extract가 주어지면 응답 객체를 받아 추출한 텍스트를 text에 저장합니다.
+    전체 deadline(초)을 넘긴 요청은 error가 채워진 채로 반환됩니다.
+    cache(ArticleCache)가 주어지면 변경되지 않은 기사는 다운로드와 추출을 건너뛰고,
+    결과의 cache 키에 'hit', 'revalidated', 'miss' 중 하나가 기록됩니다.
+    policy(FetchPolicy)를 지정하지 않으면 timeout을 기본값으로 하는 기본 정책(재시도 2회, 헤지 없음)을 사용합니다.
+    전체 deadline이 지나면 그때까지 받은 기사만 사용하고, 재시도와 요청별 타임아웃도 deadline을 넘지 않습니다.
+    """
+    urls = list(urls)
+    return list(iter_fetch_articles(urls, session=session, max_workers=max_workers, per_host=per_host,
+                                    timeout=timeout, deadline=deadline, extract=extract, cache=cache,
+                                    max_in_flight=max(len(urls), 1), policy=policy))
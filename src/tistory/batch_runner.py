@@ -0,0 +1,236 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from post_renderer import StreamingPostBuilder, prepare_post
+from rate_limit import RateLimiter
+from real_estate_posting import (
+    DEFAULT_CATEGORY_ID,
+    DEFAULT_TOPIC,
+    TistoryOutboxSender,
+    create_gemini_model,
+    create_analysis_prompt,
+    default_outbox,
+    default_outbox_publisher,
+    fetch_news_articles_text,
+    generate_content_with_gemini,
+    get_tistory_cookies_with_selenium,
+    post_to_tistory_requests,
+    publish_via_outbox,
+    validate_response,
+)
+from session_vault import SessionVault, get_session_cookie
+
+
+# 주제별 뉴스 수집 함수와 프롬프트 생성 함수
+# 같은 수집 함수를 쓰는 주제끼리는 한 번 수집한 기사를 공유합니다.
+TOPICS = {
+    DEFAULT_TOPIC: {
+        'fetch': fetch_news_articles_text,
+        'prompt': create_analysis_prompt,
+    },
+}
+
+DEFAULT_ACCOUNT = {'id_env': 'TISTORY_ID', 'pw_env': 'TISTORY_PW'}
+
+
+# --- 배치 설정 로딩 함수 ---
+def load_batch_config(path):
+    """배치 작업 설정(JSON)을 읽고 필수 항목을 검증합니다.
+
+    블로그마다 게시 대기열이 한 계정의 세션으로 게시하므로 같은 블로그에 서로 다른 계정을 쓸 수 없고,
+    같은 블로그와 주제의 글은 게시 대기열에서 같은 글로 보므로 한 번만 설정할 수 있습니다.
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+
+    jobs = config.get('jobs')
+    if not jobs:
+        raise ValueError("배치 설정에 jobs 항목이 없습니다.")
+    blog_accounts = {}
+    blog_topics = set()
+    for i, job in enumerate(jobs):
+        if 'blog' not in job:
+            raise ValueError(f"jobs[{i}]에 blog 항목이 없습니다.")
+        topic = job.setdefault('topic', DEFAULT_TOPIC)
+        if topic not in TOPICS:
+            raise ValueError(f"jobs[{i}]의 주제를 알 수 없습니다: {topic} (지원: {', '.join(TOPICS)})")
+        job.setdefault('category', DEFAULT_CATEGORY_ID)
+        account = job.setdefault('account', 'default')
+        if blog_accounts.setdefault(job['blog'], account) != account:
+            raise ValueError(f"jobs[{i}]의 블로그 {job['blog']}는 다른 작업에서 계정 "
+                             f"'{blog_accounts[job['blog']]}'(으)로 설정되어 있습니다: '{account}'")
+        if (job['blog'], topic) in blog_topics:
+            raise ValueError(f"jobs[{i}]: 블로그 {job['blog']}의 주제 {topic} 작업이 이미 있습니다.")
+        blog_topics.add((job['blog'], topic))
+    return config
+
+
+# --- 배치 실행기 ---
+class BatchRunner:
+    """여러 블로그/주제 작업을 제한된 작업자 풀에서 동시에 실행합니다.
+
+    - 뉴스 수집: 같은 수집 함수와 날짜의 작업은 한 번만 수집하고 결과를 공유합니다.
+    - Gemini 생성: gemini_concurrency개까지 동시에, 분당 gemini_rpm회 이하로 호출합니다.
+    - 인증: 계정마다 한 번만 세션을 확인/로그인하고 모든 작업에서 재사용합니다. 로그인에 실패한 계정은
+      login_retry_after초 동안만 다시 시도하지 않고, 그 뒤의 작업에서 다시 로그인합니다.
+    - 게시: 게시 대기열을 거쳐 블로그별 호출 속도 제한과 재시도를 지키며, 같은 글은 한 번만 게시합니다.
+    """
+
+    def __init__(self, config, api_key):
+        self.jobs = config['jobs']
+        self.accounts = config.get('accounts', {})
+        self.job_workers = config.get('job_workers', 4)
+        self.fetch_pool = ThreadPoolExecutor(max_workers=config.get('fetch_workers', 2),
+                                             thread_name_prefix="batch-fetch")
+        self.generate_slots = threading.BoundedSemaphore(config.get('gemini_concurrency', 3))
+        self.gemini_limiter = RateLimiter(config.get('gemini_rpm', 10))
+        self.publish_slots = threading.BoundedSemaphore(config.get('publish_workers', 2))
+
+        self._news_lock = threading.Lock()
+        self._news_futures = {}
+        self._account_locks = defaultdict(threading.Lock)
+        self._sessions = {}
+        self._login_failed_at = {}
+        self.login_retry_after = config.get('login_retry_after', 60.0)
+
+        self.model = create_gemini_model(api_key)
+        self.today_date = datetime.now(ZoneInfo("Asia/Seoul")).strftime('%Y-%m-%d')
+
+        self.outbox = default_outbox()
+        self.publisher = None
+        if self.outbox is not None:
+            blog_accounts = {job['blog']: job['account'] for job in self.jobs}
+            sender = TistoryOutboxSender(
+                None, None,
+                auth=lambda blog_name: self._account_session(blog_accounts[blog_name], blog_name)[2],
+                on_auth_failure=lambda blog_name: self._reject_session(blog_accounts[blog_name]),
+            )
+            self.publisher = default_outbox_publisher(self.outbox, sender)
+
+    def _news_text(self, topic):
+        fetch = TOPICS[topic]['fetch']
+        key = (fetch, self.today_date)
+        with self._news_lock:
+            if key not in self._news_futures:
+                self._news_futures[key] = self.fetch_pool.submit(fetch, self.today_date)
+            future = self._news_futures[key]
+        return future.result()
+
+    def _account_session(self, account_name, blog_name):
+        """계정별 세션 쿠키와 저장소를 반환합니다. 같은 계정의 로그인은 한 번만 수행됩니다.
+
+        로그인에 실패하면 쿠키 자리에 None을 반환하며, 실패는 저장하지 않고 login_retry_after초 동안만
+        같은 계정의 다른 작업이 로그인을 반복하지 않도록 합니다.
+        """
+        with self._account_locks[account_name]:
+            if account_name in self._sessions:
+                return self._sessions[account_name]
+
+            account = self.accounts.get(account_name, DEFAULT_ACCOUNT)
+            tistory_id = os.environ.get(account.get('id_env', ''))
+            tistory_pw = os.environ.get(account.get('pw_env', ''))
+            vault = SessionVault(
+                os.path.join(".cache", f"tistory_session_{account_name}"),
+                key=os.environ.get("TISTORY_SESSION_KEY"),
+            )
+            failed_at = self._login_failed_at.get(account_name)
+            if failed_at is not None and time.monotonic() - failed_at < self.login_retry_after:
+                return tistory_id, tistory_pw, None, vault
+
+            cookie_str = get_session_cookie(
+                vault, blog_name, lambda: get_tistory_cookies_with_selenium(tistory_id, tistory_pw)
+            )
+            if not cookie_str:
+                self._login_failed_at[account_name] = time.monotonic()
+                return tistory_id, tistory_pw, None, vault
+            self._login_failed_at.pop(account_name, None)
+            self._sessions[account_name] = (tistory_id, tistory_pw, cookie_str, vault)
+            return self._sessions[account_name]
+
+    def _reject_session(self, account_name):
+        """Tistory가 세션을 거부한 계정의 세션을 지워 다음 게시 시도에서 다시 로그인하게 합니다."""
+        with self._account_locks[account_name]:
+            session = self._sessions.pop(account_name, None)
+        if session is not None:
+            session[3].clear()
+
+    def run_job(self, job):
+        """작업 하나를 수집 → 생성 → 포스팅 순서로 실행하고 결과 dict를 반환합니다."""
+        started = time.perf_counter()
+        result = {'blog': job['blog'], 'topic': job['topic'], 'success': False, 'message': '', 'elapsed': 0.0}
+        try:
+            articles_text = self._news_text(job['topic'])
+            if not articles_text:
+                result['message'] = "뉴스 기사 수집 실패"
+                return result
+
+            prompt = TOPICS[job['topic']]['prompt'](self.today_date, articles_text)
+            builder = StreamingPostBuilder()
+            with self.generate_slots:
+                self.gemini_limiter.acquire()
+                content = generate_content_with_gemini(self.model, prompt, builder=builder, echo=False)
+            if not content:
+                result['message'] = "Gemini 글 생성 실패"
+                return result
+            with self.generate_slots:
+                content, repaired = validate_response(self.model, content, self.today_date,
+                                                      limiter=self.gemini_limiter)
+            post = prepare_post(content) if repaired else builder.close()
+
+            tistory_id, tistory_pw, cookie_str, vault = self._account_session(job['account'], job['blog'])
+            if not cookie_str:
+                result['message'] = "쿠키 획득 실패"
+                return result
+
+            with self.publish_slots:
+                if self.publisher is not None:
+                    success, message = publish_via_outbox(self.publisher, job['blog'], post, category=job['category'],
+                                                          slot=self.today_date, topic=job['topic'])
+                else:
+                    success, message = post_to_tistory_requests(
+                        job['blog'], tistory_id, tistory_pw, post,
+                        category=job['category'], tistory_cookie_str=cookie_str, vault=vault,
+                    )
+            result.update(success=success, message=message)
+            return result
+        except Exception as e:
+            result['message'] = f"작업 실행 중 예외 발생: {e}"
+            return result
+        finally:
+            result['elapsed'] = time.perf_counter() - started
+            status = "성공" if result['success'] else "실패"
+            print(f"[{job['blog']}/{job['topic']}] {status} ({result['elapsed']:.1f}초): {result['message']}")
+
+    def run(self):
+        """모든 작업을 실행하고 설정 순서대로 결과 목록을 반환합니다."""
+        try:
+            with ThreadPoolExecutor(max_workers=self.job_workers, thread_name_prefix="batch-job") as pool:
+                return list(pool.map(self.run_job, self.jobs))
+        finally:
+            self.fetch_pool.shutdown(wait=False)
+            if self.outbox is not None:
+                self.outbox.close()
+
+
+def format_batch_summary(results, elapsed):
+    succeeded = sum(1 for r in results if r['success'])
+    lines = [f"배치 실행 결과: {succeeded}/{len(results)}건 성공 (총 {elapsed:.1f}초)", ""]
+    for r in results:
+        status = "성공" if r['success'] else "실패"
+        lines.append(f"- [{status}] {r['blog']} / {r['topic']} ({r['elapsed']:.1f}초): {r['message']}")
+    return '\n'.join(lines)
+
+
+# --- 메인 실행 로직 ---
+if __name__ == "__main__":
+    # real_estate_posting.py batch 명령과 같음
+    from real_estate_posting import main
+
+    sys.exit(main(['batch', *sys.argv[1:]]))
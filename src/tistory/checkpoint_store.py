@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+
+# 체크포인트를 남기는 단계 (실행 순서)
+CHECKPOINT_STAGES = ('articles', 'prompt', 'draft', 'response', 'post', 'publish')
+
+
+def new_run_id():
+    """KST 기준 실행 시각으로 실행 ID를 만듭니다. (예: 20240101-080000)"""
+    return datetime.now(ZoneInfo("Asia/Seoul")).strftime('%Y%m%d-%H%M%S')
+
+
+# --- 내용 주소 기반 체크포인트 저장소 ---
+class CheckpointStore:
+    """단계 출력을 내용의 SHA-256 해시로 저장하고, 실행 ID별 목록(manifest)에 단계 이름과 해시를 기록합니다.
+
+    objects/<해시 앞 2자리>/<해시>.json: 단계 출력(JSON). 같은 내용은 한 번만 저장됩니다.
+    runs/<실행 ID>.json: 실행 상태와 단계별 해시
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'runs'), exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest}.json")
+
+    def _manifest_path(self, run_id):
+        return os.path.join(self.root, 'runs', f"{run_id}.json")
+
+    @staticmethod
+    def _write_json(path, value):
+        # 중단되어도 반쯤 쓰인 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def put_object(self, value):
+        data = json.dumps(value, ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha256(data.encode('utf-8')).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            self._write_json(path, value)
+        return digest
+
+    def get_object(self, digest):
+        try:
+            with open(self._object_path(digest), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def manifest(self, run_id):
+        """실행 목록 dict를 반환합니다. 없으면 None을 반환합니다."""
+        try:
+            with open(self._manifest_path(run_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, run_id, stage, value):
+        digest = self.put_object(value)
+        with self._lock:
+            manifest = self.manifest(run_id) or {'run_id': run_id, 'created_at': time.time(), 'stages': {}}
+            manifest['stages'][stage] = digest
+            manifest['updated_at'] = time.time()
+            self._write_json(self._manifest_path(run_id), manifest)
+        return digest
+
+    def load(self, run_id, stage):
+        manifest = self.manifest(run_id)
+        if not manifest or stage not in manifest['stages']:
+            return None
+        return self.get_object(manifest['stages'][stage])
+
+    def last_stage(self, run_id):
+        """실행 순서상 마지막으로 완료된 단계 이름을 반환합니다."""
+        manifest = self.manifest(run_id) or {'stages': {}}
+        done = [stage for stage in CHECKPOINT_STAGES if stage in manifest['stages']]
+        return done[-1] if done else None
+
+    def latest_run_id(self, unfinished_only=True):
+        """가장 최근 실행 ID를 반환합니다. unfinished_only이면 게시에 성공하지 않은 실행만 봅니다."""
+        runs = []
+        for name in os.listdir(os.path.join(self.root, 'runs')):
+            if not name.endswith('.json'):
+                continue
+            manifest = self.manifest(name[:-len('.json')])
+            if not manifest:
+                continue
+            if unfinished_only:
+                published = self.get_object(manifest['stages']['publish']) if 'publish' in manifest['stages'] else None
+                if published and published.get('success'):
+                    continue
+            runs.append((manifest['created_at'], manifest['run_id']))
+        return max(runs)[1] if runs else None
+
+    def prune(self, max_age, keep=None):
+        """max_age(초)보다 오래된 실행 목록을 지우고, 어떤 실행도 참조하지 않는 출력을 삭제합니다.
+
+        keep이 주어지면 최근 keep개를 넘는 오래된 실행 목록도 지웁니다. 남은 실행이 참조하는 출력은 다른 실행과
+        공유하더라도 지우지 않습니다.
+        """
+        now = time.time()
+        referenced = set()
+        runs_dir = os.path.join(self.root, 'runs')
+        runs = []
+        for name in os.listdir(runs_dir):
+            if not name.endswith('.json'):
+                continue
+            manifest = self.manifest(name[:-len('.json')])
+            if manifest is None or now - manifest.get('updated_at', manifest.get('created_at', 0)) > max_age:
+                os.remove(os.path.join(runs_dir, name))
+            else:
+                runs.append((manifest['created_at'], manifest['run_id'], manifest))
+        runs.sort(reverse=True)
+        for rank, (_, run_id, manifest) in enumerate(runs):
+            if keep is not None and rank >= keep:
+                os.remove(self._manifest_path(run_id))
+            else:
+                referenced.update(manifest['stages'].values())
+
+        removed = 0
+        objects_dir = os.path.join(self.root, 'objects')
+        for prefix in os.listdir(objects_dir):
+            for name in os.listdir(os.path.join(objects_dir, prefix)):
+                if name.endswith('.json') and name[:-len('.json')] not in referenced:
+                    os.remove(os.path.join(objects_dir, prefix, name))
+                    removed += 1
+        return removed
+
+    def bind(self, run_id):
+        return RunCheckpoint(self, run_id)
+
+
+class RunCheckpoint:
+    """실행 ID 하나에 묶인 체크포인트입니다. 단계 함수가 load()/save()만으로 출력을 복원하고 저장할 수 있습니다."""
+
+    def __init__(self, store, run_id):
+        self.store = store
+        self.run_id = run_id
+
+    def load(self, stage):
+        return self.store.load(self.run_id, stage)
+
+    def save(self, stage, value):
+        return self.store.save(self.run_id, stage, value)
+
+    def last_stage(self):
+        return self.store.last_stage(self.run_id)
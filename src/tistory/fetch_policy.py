@@ -0,0 +1,233 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlsplit
+
+import requests
+
+from instrumentation import count
+
+
+# 재시도할 HTTP 상태 코드 (일시적인 서버 오류와 요청 제한)
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# 재시도할 예외 (연결 실패, 타임아웃, 응답 도중 끊김)
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """연속 실패로 차단된 호스트에 요청하려 할 때 발생합니다."""
+
+
+# --- 호스트별 적응형 타임아웃 ---
+class AdaptiveTimeout:
+    """호스트별 응답 시간의 이동 평균(srtt)과 편차(rttvar)로 읽기 타임아웃을 정합니다.
+
+    TCP 재전송 타임아웃처럼 srtt + 4 * rttvar를 사용하되 [min_read, 기본 읽기 타임아웃] 범위로 제한합니다.
+    측정값이 없는 호스트는 기본 타임아웃을 그대로 사용합니다.
+    """
+
+    def __init__(self, default, min_read=2.0, alpha=0.125, beta=0.25):
+        self.default = default
+        self.min_read = min_read
+        self.alpha = alpha
+        self.beta = beta
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def observe(self, host, seconds):
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                self._stats[host] = (seconds, seconds / 2)
+            else:
+                srtt, rttvar = stats
+                rttvar = (1 - self.beta) * rttvar + self.beta * abs(srtt - seconds)
+                srtt = (1 - self.alpha) * srtt + self.alpha * seconds
+                self._stats[host] = (srtt, rttvar)
+
+    def timeout_for(self, host):
+        """(연결 타임아웃, 읽기 타임아웃)을 반환합니다."""
+        connect, read = self.default
+        with self._lock:
+            stats = self._stats.get(host)
+        if stats is None:
+            return connect, read
+        srtt, rttvar = stats
+        return connect, min(max(srtt + 4 * rttvar, self.min_read), read)
+
+    def straggler_after(self, host, fallback):
+        """이 시간(초) 안에 응답이 없으면 느린 요청으로 봅니다. 측정값이 없으면 fallback을 사용합니다."""
+        with self._lock:
+            stats = self._stats.get(host)
+        if stats is None:
+            return fallback
+        srtt, rttvar = stats
+        return max(srtt + 2 * rttvar, fallback / 4)
+
+
+# --- 호스트별 회로 차단기 ---
+class CircuitBreaker:
+    """호스트의 연속 실패가 failure_threshold번에 이르면 cooldown초 동안 요청을 막습니다.
+
+    cooldown이 지나면 요청 하나만 시험 삼아 허용하고, 성공하면 차단을 풀고 실패하면 다시 막습니다.
+    시험 요청이 성공도 실패도 기록하지 못하고 끝나면 release()로 시험 자리를 돌려줘야 합니다.
+    """
+
+    def __init__(self, failure_threshold=5, cooldown=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def allow(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state['opened_at'] is None:
+                return True
+            if time.monotonic() - state['opened_at'] < self.cooldown or state['probing']:
+                return False
+            # 시험 요청을 보낸 스레드만 release()로 자리를 돌려줄 수 있도록 스레드 ID를 기록
+            state['probing'] = threading.get_ident()
+            return True
+
+    def release(self, host):
+        """이 스레드의 시험 요청이 결과를 기록하지 못하고 끝났으면 다음 요청이 다시 시험할 수 있게 합니다."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is not None and state['probing'] == threading.get_ident():
+                state['probing'] = False
+
+    def record_success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def record_failure(self, host):
+        with self._lock:
+            state = self._hosts.setdefault(host, {'failures': 0, 'opened_at': None, 'probing': False})
+            state['failures'] += 1
+            if state['probing'] or state['failures'] >= self.failure_threshold:
+                if state['opened_at'] is None or state['probing']:
+                    count('fetch_circuit_opened')
+                state['opened_at'] = time.monotonic()
+                state['probing'] = False
+
+
+# --- 기사 요청 정책 ---
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _discard(future):
+    """헤지 요청에서 쓰지 않는 쪽 요청을 취소하고, 이미 시작했으면 끝난 뒤 응답을 닫아 연결을 풀에 돌려줍니다."""
+    if not future.cancel():
+        future.add_done_callback(_close_response)
+
+
+class FetchPolicy:
+    """기사 GET 요청에 적응형 타임아웃, 지터를 넣은 지수 백오프 재시도, 회로 차단기, 헤지 요청을 적용합니다.
+
+    hedge=True이면 호스트의 평소 응답 시간보다 오래 걸리는 요청에 같은 요청을 하나 더 보내고
+    먼저 성공한 응답을 사용합니다. deadline_at(time.monotonic 기준)이 주어지면 재시도와 타임아웃이
+    그 시각을 넘지 않습니다.
+    """
+
+    def __init__(self, timeout, retries=2, backoff_base=0.25, backoff_cap=4.0,
+                 failure_threshold=5, cooldown=30.0, hedge=False, hedge_after=1.0, max_hedges=32):
+        self.timeouts = AdaptiveTimeout(timeout)
+        self.breaker = CircuitBreaker(failure_threshold, cooldown)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge_after = hedge_after
+        self._hedge_pool = (ThreadPoolExecutor(max_workers=max_hedges, thread_name_prefix="fetch-hedge")
+                            if hedge else None)
+
+    def backoff(self, attempt):
+        """attempt번째 재시도 전 대기 시간 (full jitter 지수 백오프)."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _timeout(self, host, deadline_at):
+        connect, read = self.timeouts.timeout_for(host)
+        if deadline_at is None:
+            return connect, read
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise requests.exceptions.Timeout("전체 수집 시간 초과")
+        return min(connect, remaining), min(read, remaining)
+
+    def _send(self, session, url, headers, timeout, host):
+        if self._hedge_pool is None:
+            return session.get(url, timeout=timeout, headers=headers)
+
+        primary = self._hedge_pool.submit(session.get, url, timeout=timeout, headers=headers)
+        done, _ = wait([primary], timeout=self.timeouts.straggler_after(host, self.hedge_after))
+        if done:
+            return primary.result()
+
+        count('fetch_hedged')
+        backup = self._hedge_pool.submit(session.get, url, timeout=timeout, headers=headers)
+        error = None
+        for future in as_completed([primary, backup]):
+            try:
+                response = future.result()
+            except requests.exceptions.RequestException as e:
+                error = e
+                continue
+            if future is backup:
+                count('fetch_hedge_wins')
+            _discard(primary if future is backup else backup)
+            return response
+        raise error
+
+    def get(self, session, url, headers=None, deadline_at=None):
+        """정책을 적용해 GET 요청을 보냅니다.
+
+        재시도 후에도 실패하면 마지막 예외를 다시 발생시키거나, 재시도 대상 상태 코드의 마지막 응답을 반환합니다.
+        """
+        host = urlsplit(url).netloc
+        if not self.breaker.allow(host):
+            count('fetch_circuit_rejected')
+            raise CircuitOpenError(f"{host} 호스트의 연속 실패로 요청을 차단했습니다")
+
+        # 재시도 대상이 아닌 예외(리다이렉트 초과, 디코딩 오류, 전체 시간 초과 등)로 끝나도 시험 요청 자리가 남지 않도록 함
+        attempt = 0
+        try:
+            while True:
+                # 남은 시간이 없으면 호스트 실패로 세지 않고 바로 포기
+                timeout = self._timeout(host, deadline_at)
+                started = time.perf_counter()
+                response = error = None
+                try:
+                    response = self._send(session, url, headers, timeout, host)
+                except RETRY_EXCEPTIONS as e:
+                    error = e
+
+                if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                    self.timeouts.observe(host, time.perf_counter() - started)
+                    self.breaker.record_success(host)
+                    return response
+
+                self.breaker.record_failure(host)
+                delay = self.backoff(attempt)
+                out_of_time = deadline_at is not None and time.monotonic() + delay >= deadline_at
+                if attempt >= self.retries or out_of_time or not self.breaker.allow(host):
+                    if error is not None:
+                        raise error
+                    return response
+
+                count('fetch_retries')
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            self.breaker.release(host)
+
+    def close(self):
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,179 @@
+import contextvars
+import functools
+import io
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+# --- 실행 계측기 ---
+class Instrumentation:
+    """파이프라인 단계별 중첩 구간(span), 카운터, cProfile 결과를 모아 JSON 보고서로 만듭니다.
+
+    구간은 같은 스레드(컨텍스트) 안에서 중첩되며, 부모가 없는 스레드의 구간은 최상위에 기록됩니다.
+    profile=True이면 profile_section()으로 감싼 CPU 구간을 cProfile로 측정해 이름별로 합산합니다.
+    """
+
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = []
+        self.counters = {}
+        self._profiles = {}
+
+    @contextmanager
+    def span(self, name, **attrs):
+        parent = _current_span.get()
+        node = {
+            'name': name,
+            'start': round(time.perf_counter() - self._origin, 6),
+            'duration': None,
+            'attrs': attrs,
+            'children': [],
+        }
+        if parent is None:
+            node['attrs'].setdefault('thread', threading.current_thread().name)
+        with self._lock:
+            (parent['children'] if parent is not None else self.spans).append(node)
+
+        token = _current_span.set(node)
+        started = time.perf_counter()
+        try:
+            yield node['attrs']
+        except BaseException as e:
+            node['attrs']['error'] = repr(e)
+            raise
+        finally:
+            node['duration'] = round(time.perf_counter() - started, 6)
+            _current_span.reset(token)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def profile_section(self, name):
+        if not self.profile:
+            yield
+            return
+
+        # 프로파일링할 때만 cProfile/pstats를 불러와 시작 시간을 줄임
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 같은 스레드에서 이미 다른 구간을 프로파일링 중이면 바깥 구간에 포함
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with self._lock:
+                if name in self._profiles:
+                    self._profiles[name].add(profiler)
+                else:
+                    self._profiles[name] = pstats.Stats(profiler, stream=io.StringIO())
+
+    def _profile_summary(self, top=15):
+        summary = {}
+        for name, stats in self._profiles.items():
+            rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+            summary[name] = {
+                'total_seconds': round(stats.total_tt, 6),
+                'top_cumulative': [
+                    {
+                        'function': f"{func[0]}:{func[1]}({func[2]})",
+                        'calls': ncalls,
+                        'tottime': round(tottime, 6),
+                        'cumtime': round(cumtime, 6),
+                    }
+                    for func, (_, ncalls, tottime, cumtime, _) in rows
+                ],
+            }
+        return summary
+
+    def report(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'total_seconds': round(time.perf_counter() - self._origin, 6),
+                'spans': self.spans,
+                'counters': dict(self.counters),
+                'profiles': self._profile_summary(),
+            }
+
+    def write_report(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def format_summary(self):
+        """최상위 구간과 그 하위 구간의 소요 시간을 사람이 읽기 쉬운 문자열로 만듭니다."""
+        lines = []
+
+        def walk(nodes, depth):
+            for node in nodes:
+                duration = node['duration'] if node['duration'] is not None else 0.0
+                lines.append(f"{'  ' * depth}{node['name']}: {duration:.3f}초")
+                if depth < 2:
+                    walk(node['children'], depth + 1)
+
+        walk(self.spans, 0)
+        return '\n'.join(lines)
+
+
+_instrumentation = Instrumentation(profile=os.environ.get("PIPELINE_PROFILE") == "1")
+
+
+def get_instrumentation():
+    return _instrumentation
+
+
+def reset_instrumentation(profile=None):
+    """새 실행을 위해 계측 상태를 초기화합니다."""
+    global _instrumentation
+    if profile is None:
+        profile = os.environ.get("PIPELINE_PROFILE") == "1"
+    _instrumentation = Instrumentation(profile=profile)
+    return _instrumentation
+
+
+def span(name, **attrs):
+    return _instrumentation.span(name, **attrs)
+
+
+def count(name, value=1):
+    _instrumentation.count(name, value)
+
+
+def annotate(**attrs):
+    """현재 구간에 속성을 추가합니다. 열린 구간이 없으면 무시합니다."""
+    node = _current_span.get()
+    if node is not None:
+        node['attrs'].update(attrs)
+
+
+def traced(name):
+    """함수 호출 전체를 하나의 구간으로 기록하는 데코레이터입니다."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profile_section(name):
+    return _instrumentation.profile_section(name)
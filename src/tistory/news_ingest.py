@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+
+from instrumentation import count
+
+
+NAVER_NEWS_API_URL = "https://m2.land.naver.com/news/airsList.naver"
+
+
+def iter_dates(end_date, days):
+    """end_date(YYYY-MM-DD)부터 과거로 days일 동안의 날짜 문자열을 최신순으로 내보냅니다."""
+    end = date.fromisoformat(end_date)
+    for offset in range(days):
+        yield (end - timedelta(days=offset)).isoformat()
+
+
+# --- 뉴스 목록 수집 제너레이터 ---
+# 날짜별로 요청할 최대 페이지 수 (기본 페이지 크기 30개 기준 하루 1,500개)
+DEFAULT_MAX_PAGES = 50
+
+
+def iter_news_items(session, end_date, days=1, page_size=30, max_pages=DEFAULT_MAX_PAGES, timeout=None, api_url=None):
+    """airsList.naver API의 날짜별 모든 페이지를 지연 순회하며 뉴스 항목 dict를 내보냅니다.
+
+    다음 페이지는 소비자가 현재 페이지의 항목을 모두 가져간 뒤에만 요청합니다.
+    페이지가 비어 있거나 page_size보다 적은 항목이 오면 해당 날짜의 마지막 페이지로 봅니다.
+    API가 page 값을 무시하고 같은 목록을 돌려주는 경우에 대비해, 새 linkUrl이 하나도 없는 페이지가 오거나
+    max_pages에 이르면 해당 날짜의 순회를 멈춥니다. max_pages가 None이면 페이지 수를 제한하지 않습니다.
+    """
+    for base_date in iter_dates(end_date, days):
+        page = 1
+        link_urls = set()
+        while max_pages is None or page <= max_pages:
+            response = session.get(
+                api_url or NAVER_NEWS_API_URL,
+                params={'baseDate': base_date, 'page': page, 'size': page_size},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            count('news_pages')
+            count('bytes_fetched', len(response.content))
+            items = response.json().get('list', [])
+            yield from items
+
+            if len(items) < page_size:
+                break
+            new_urls = {item.get('linkUrl') for item in items} - link_urls
+            if not new_urls:
+                count('news_repeated_pages')
+                break
+            link_urls |= new_urls
+            page += 1
+
+
+def iter_news_link_urls(items, max_articles=None, skip=None, stop_after_skipped=None):
+    """뉴스 항목에서 중복 없이 linkUrl을 내보냅니다. max_articles개에 도달하면 멈춥니다.
+
+    skip(url)이 참인 URL은 내보내지 않고 max_articles에도 세지 않습니다.
+    목록은 최신순이므로, 건너뛴 URL이 stop_after_skipped개 연속되면 이후는 모두 이미 본 기사로 보고 멈춥니다.
+    """
+    seen = set()
+    emitted = 0
+    skipped_in_row = 0
+    for item in items:
+        url = item['linkUrl']
+        if url in seen:
+            continue
+        seen.add(url)
+        if skip is not None and skip(url):
+            count('news_urls_skipped')
+            skipped_in_row += 1
+            if stop_after_skipped and skipped_in_row >= stop_after_skipped:
+                return
+            continue
+        skipped_in_row = 0
+        yield url
+        emitted += 1
+        if max_articles and emitted >= max_articles:
+            return
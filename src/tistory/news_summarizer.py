@@ -0,0 +1,142 @@
+import contextvars
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import count, span
+from prompt_packer import estimate_tokens, lead_paragraphs
+from summary_store import article_fingerprint
+
+
+# 기사 구분 표시 ([기사 1], [기사 2], ...)
+_ARTICLE_MARK_RE = re.compile(r'^\s*\[기사\s*(\d+)\]\s*', re.MULTILINE)
+
+# 요약 형식이 바뀌면 올려서 이전에 저장한 요약을 쓰지 않게 합니다
+SUMMARY_PROMPT_VERSION = 1
+
+
+# --- 요약(map) 프롬프트 템플릿 함수 ---
+def create_extraction_prompt(texts):
+    """기사 묶음에서 분석에 필요한 사실만 기사별로 뽑아내는 짧은 프롬프트를 생성합니다."""
+    articles = "\n\n".join(f"[기사 {i}]\n{text}" for i, text in enumerate(texts, 1))
+    return f"""
+다음 부동산 뉴스 기사 {len(texts)}개에서 시장 분석에 필요한 사실만 뽑아 기사별로 요약하세요.
+
+요약 지침:
+- 기사마다 '[기사 번호]' 줄로 시작하고, 그 아래에 핵심 사실을 3~5개의 '- ' 목록으로 작성
+- 수치(가격, 변동률, 금리, 물량), 지역, 정책/제도 이름, 발표 주체를 빠짐없이 유지
+- 의견, 전망, 수식어는 생략하고 기사에 없는 내용은 추가하지 않음
+- 부동산과 관련 없는 기사는 '- 관련 없음' 한 줄로 작성
+
+{articles}
+"""
+
+
+def parse_group_summaries(text, count):
+    """요약 응답을 기사별 요약 목록으로 나눕니다. 기사 수만큼 나뉘지 않으면 None을 반환합니다."""
+    marks = list(_ARTICLE_MARK_RE.finditer(text))
+    summaries = {}
+    for i, mark in enumerate(marks):
+        end = marks[i + 1].start() if i + 1 < len(marks) else len(text)
+        summaries[int(mark.group(1))] = text[mark.end():end].strip()
+    if sorted(summaries) != list(range(1, count + 1)) or not all(summaries.values()):
+        return None
+    return [summaries[i] for i in range(1, count + 1)]
+
+
+# --- map-reduce 요약기 ---
+class MapReduceSummarizer:
+    """기사를 묶음 단위로 동시에 요약(map)해 최종 분석 프롬프트(reduce)에 들어갈 분량을 줄입니다.
+
+    - 묶음 하나에는 group_tokens 토큰 안팎의 기사를 넣고, 최대 max_workers개 묶음을 동시에 요약합니다.
+    - limiter(RateLimiter)가 주어지면 요약 호출마다 호출 속도 제한을 적용합니다.
+    - store(SummaryStore)가 주어지면 기사 지문, 모델 이름, 요약 프롬프트 버전을 키로 기사별 요약을 저장하고, 다음 실행에서 재사용합니다.
+    - 요약에 실패한 묶음은 기사 앞부분 문단으로 대신합니다.
+    """
+
+    def __init__(self, model, store=None, limiter=None, max_workers=8, group_tokens=8000, model_name=''):
+        self.model = model
+        self.store = store
+        self.limiter = limiter
+        self.max_workers = max_workers
+        self.group_tokens = group_tokens
+        self.model_name = model_name
+
+    def _groups(self, indices, texts):
+        """토큰 추정치가 group_tokens를 넘지 않도록 기사 인덱스를 순서대로 묶습니다."""
+        groups = []
+        current = []
+        used = 0
+        for index in indices:
+            tokens = estimate_tokens(texts[index])
+            if current and used + tokens > self.group_tokens:
+                groups.append(current)
+                current = []
+                used = 0
+            current.append(index)
+            used += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    def _summarize_group(self, texts):
+        with span('summarize_group') as span_attrs:
+            span_attrs['articles'] = len(texts)
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                response = self.model.generate_content(create_extraction_prompt(texts))
+                summaries = parse_group_summaries(response.text, len(texts))
+            except Exception as e:
+                print(f"기사 요약 중 오류 발생: {e}")
+                summaries = None
+            count('map_calls')
+            span_attrs['parsed'] = summaries is not None
+            return summaries
+
+    def summarize(self, texts):
+        """기사 본문 목록과 같은 순서의 요약 목록과 통계 dict를 반환합니다."""
+        summaries = [None] * len(texts)
+        fingerprints = [article_fingerprint(text) for text in texts] if self.store else []
+        misses = []
+        for index, text in enumerate(texts):
+            stored = self.store.get(fingerprints[index], self.model_name, SUMMARY_PROMPT_VERSION) if self.store else None
+            if stored:
+                summaries[index] = stored
+            else:
+                misses.append(index)
+        count('map_cache_hits', len(texts) - len(misses))
+
+        groups = self._groups(misses, texts)
+        failed = 0
+        new_summaries = {}
+        if groups:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="summarize") as executor:
+                # 요약 구간(span)이 호출한 구간 아래에 기록되도록 묶음마다 컨텍스트를 복사해 실행
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self._summarize_group, [texts[i] for i in group])
+                    for group in groups
+                ]
+                results = [future.result() for future in futures]
+            for group, group_summaries in zip(groups, results):
+                if group_summaries is None:
+                    failed += len(group)
+                    group_summaries = [lead_paragraphs(texts[i], 3) for i in group]
+                elif self.store:
+                    for index, summary in zip(group, group_summaries):
+                        new_summaries[fingerprints[index]] = summary
+                for index, summary in zip(group, group_summaries):
+                    summaries[index] = summary
+
+        if self.store and groups:
+            self.store.put_many(self.model_name, SUMMARY_PROMPT_VERSION, new_summaries)
+            self.store.prune()
+
+        stats = {
+            'articles': len(texts),
+            'cache_hits': len(texts) - len(misses),
+            'groups': len(groups),
+            'failed': failed,
+            'chars_before': sum(len(text) for text in texts),
+            'chars_after': sum(len(summary) for summary in summaries),
+        }
+        return summaries, stats
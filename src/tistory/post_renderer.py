@@ -0,0 +1,262 @@
+import io
+import re
+
+
+# --- Helper function for BMP filtering ---
+def remove_non_bmp_chars(s):
+    return "".join(c for c in s if c <= '\uFFFF')
+
+
+# --- HTML 스타일링 함수 ---
+def get_html_styles():
+    """Tistory 블로그용 HTML 스타일을 반환합니다."""
+    return {
+        'h1': "font-family: 'Noto Sans KR', sans-serif; font-size: 26px; font-weight: bold; margin-bottom: 25px; color: #2c3e50; text-align: center;",
+        'h2': "font-family: 'Noto Sans KR', sans-serif; font-size: 22px; font-weight: bold; margin-top: 30px; margin-bottom: 18px; border-bottom: 3px solid #3498db; padding-bottom: 8px; color: #2c3e50;",
+        'h3': "font-family: 'Noto Sans KR', sans-serif; font-size: 18px; font-weight: bold; margin-top: 25px; margin-bottom: 15px; color: #34495e;",
+        'p': "font-family: 'Noto Sans KR', sans-serif; line-height: 1.8; margin: 12px 0; color: #2c3e50; font-size: 16px;",
+        'ul': "font-family: 'Noto Sans KR', sans-serif; line-height: 1.7; margin: 15px 0; padding-left: 20px;",
+        'li': "margin-bottom: 8px; color: #2c3e50;",
+        'strong': "color: #e74c3c; font-weight: bold;",
+        'highlight_box': "background-color: #f8f9fa; border-left: 4px solid #3498db; padding: 15px; margin: 20px 0; border-radius: 5px;"
+    }
+
+
+# 변환 시마다 다시 만들지 않도록 스타일이 적용된 태그 문자열을 미리 계산
+_STYLES = get_html_styles()
+_BLANK_P = '<p data-ke-size="size16"><br data-mce-bogus="1"></p>\n'
+_UL_OPEN = f'<ul style="{_STYLES["ul"]}" data-ke-list-type="disc">\n'
+_LI_OPEN = f'<li style="{_STYLES["li"]}" data-ke-list-type="disc">'
+_P_OPEN = f'<p style="{_STYLES["p"]}" data-ke-size="size16">'
+_STRONG_OPEN = f'<strong style="{_STYLES["strong"]}">'
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# 본문 블록 종류
+BLANK = 'blank'        # 빈 줄
+HEADING1 = 'h1'        # H1 제목 (목록을 닫지 않음)
+RAW = 'raw'            # H2/H3 섹션 제목, 기존 p 태그, 한 줄 HTML 표 (그대로 출력)
+LIST_OPEN = 'ul'       # 목록 시작
+LIST_ITEM = 'li'       # 목록 항목
+LIST_CLOSE = '/ul'     # 목록 끝
+TEXT = 'text'          # 일반 텍스트 줄
+
+
+def classify_line(line):
+    """앞뒤 공백이 제거된 본문 한 줄을 (블록 종류, 내용) 튜플로 분류합니다."""
+    if not line:
+        return BLANK, ''
+    if line.startswith('<h1'):
+        return HEADING1, line
+    if line.startswith('<h2') or line.startswith('<h3') or line.startswith('<p') or line.startswith('<table'):
+        return RAW, line
+    if line.startswith('<ul>'):
+        return LIST_OPEN, ''
+    if line.startswith('<li>'):
+        return LIST_ITEM, line[4:-5]
+    if line.startswith('</ul>'):
+        return LIST_CLOSE, ''
+    return TEXT, line
+
+
+# --- 구조화된 포스트 문서 ---
+class PostDocument:
+    """제목, 본문 블록 목록, 태그로 구성된 포스트 문서입니다."""
+
+    def __init__(self, title='', blocks=None, tags=None):
+        self.title = title
+        self.blocks = blocks if blocks is not None else []
+        self.tags = tags if tags is not None else []
+
+
+# --- Tistory HTML 작성기 ---
+class TistoryHtmlWriter:
+    """본문 블록을 받는 즉시 io.StringIO에 Tistory 형식의 HTML로 기록합니다."""
+
+    def __init__(self):
+        self._out = io.StringIO()
+        self._in_list = False
+
+    def _close_list(self):
+        if self._in_list:
+            self._out.write('</ul>\n')
+            self._in_list = False
+
+    def write_block(self, kind, text):
+        out = self._out
+        if kind == TEXT:
+            self._close_list()
+            # strong 태그 처리
+            if '<strong>' in text:
+                text = text.replace('<strong>', _STRONG_OPEN)
+            out.write(_P_OPEN)
+            out.write(text)
+            out.write('</p>\n')
+        elif kind == BLANK:
+            out.write(_BLANK_P)
+        elif kind == RAW:
+            self._close_list()
+            out.write(text)
+            out.write('\n')
+        elif kind == LIST_ITEM:
+            out.write(_LI_OPEN)
+            out.write(text)
+            out.write('</li>\n')
+        elif kind == HEADING1:
+            out.write(text)
+            out.write('\n')
+        elif kind == LIST_OPEN:
+            out.write(_UL_OPEN)
+            self._in_list = True
+        elif kind == LIST_CLOSE:
+            out.write('</ul>\n')
+            self._in_list = False
+
+    def getvalue(self):
+        # 목록이 열려있으면 닫기
+        self._close_list()
+        return self._out.getvalue().strip()
+
+
+def render_tistory_html(document):
+    """PostDocument의 본문 블록을 Tistory 형식의 HTML로 렌더링합니다."""
+    writer = TistoryHtmlWriter()
+    for kind, text in document.blocks:
+        writer.write_block(kind, text)
+    return writer.getvalue()
+
+
+# --- HTML 콘텐츠 변환 함수 ---
+def convert_to_tistory_html(content):
+    """Gemini가 생성한 콘텐츠를 Tistory 형식의 HTML로 변환합니다."""
+    writer = TistoryHtmlWriter()
+    for line in content.split('\n'):
+        writer.write_block(*classify_line(line.strip()))
+    return writer.getvalue()
+
+
+# --- 스트리밍 포스트 조립기 ---
+class StreamingPostBuilder:
+    """Gemini 응답을 청크 단위로 받아 한 번의 순회로 PostDocument와 본문 HTML을 조립합니다.
+
+    완성된 줄은 즉시 블록으로 분류해 HTML로 기록하고, 제목(첫 줄)과 마지막 '태그::' 줄은 따로 분리합니다.
+    close()는 {'title', 'html', 'tags'} 형식의 dict를 반환하며, 구조화된 문서는 document 속성에 남습니다.
+    """
+
+    def __init__(self):
+        self.document = PostDocument()
+        self.writer = TistoryHtmlWriter()
+        self.title = None
+        self._buffer = ''
+        self._leading = True          # ```html 코드 블록과 앞쪽 빈 줄을 건너뛰는 중
+        self._held = []               # 마지막 비어있지 않은 줄과 그 뒤의 빈 줄 (끝의 ``` 제거용)
+        self._tag_line = None         # 현재까지 마지막 '태그::' 줄
+        self._after_tag = []          # 태그 줄 뒤에 도착한 줄 (더 뒤에 태그 줄이 오면 본문으로 환원)
+        self._body_started = False
+        self._blank_run = []
+
+    def feed(self, chunk):
+        """응답 청크를 추가하고, 완성된 줄을 처리합니다."""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            self._normalize(line)
+        return self
+
+    def close(self):
+        """남은 내용을 처리하고 완성된 포스트 dict를 반환합니다."""
+        self._normalize(self._buffer)
+        self._buffer = ''
+
+        # 콘텐츠 끝의 ``` 코드 블록 종료 표시 제거
+        if self._held:
+            last = self._held[0].rstrip()
+            if last.endswith('```'):
+                self._held[0] = last[:-3]
+        for line in self._held:
+            self._split(line)
+        self._held = []
+
+        for line in self._after_tag:
+            self._emit_body(line)
+        self._after_tag = []
+        document = self.document
+        if self._tag_line is not None:
+            tag_string = _TAG_RE.sub('', self._tag_line).split('::', 1)[-1]
+            document.tags = [tag.strip() for tag in tag_string.split(',') if tag.strip()]
+        if not self._body_started:
+            # 본문이 비어 있으면 빈 단락 하나로 변환 (기존 동작과 동일)
+            self._append_block(BLANK, '')
+
+        title = (self.title or '').replace('# ', '').strip()
+        document.title = remove_non_bmp_chars(_TAG_RE.sub('', title).strip())
+        return {
+            'title': document.title,
+            'html': self.writer.getvalue(),
+            'tags': document.tags,
+        }
+
+    def _normalize(self, line):
+        # <body> 와 </body> 태그 제거, 앞쪽 ```html 코드 블록 제거
+        line = line.replace('<body>', '').replace('</body>', '')
+        if self._leading:
+            stripped = line.strip()
+            if stripped.startswith('```html'):
+                stripped = stripped[7:].strip()
+            if not stripped:
+                return
+            self._leading = False
+            line = stripped
+
+        if line.strip():
+            for held_line in self._held:
+                self._split(held_line)
+            self._held = [line]
+        else:
+            self._held.append(line)
+
+    def _split(self, line):
+        if self.title is None:
+            self.title = line
+            return
+
+        if '태그::' in line.strip():
+            if self._tag_line is not None:
+                # 더 뒤에 태그 줄이 있으므로 이전 태그 줄은 본문으로 처리
+                self._emit_body(self._tag_line)
+                for pending in self._after_tag:
+                    self._emit_body(pending)
+                self._after_tag = []
+            self._tag_line = line.strip()
+        elif self._tag_line is not None:
+            self._after_tag.append(line)
+        else:
+            self._emit_body(line)
+
+    def _emit_body(self, line):
+        # 본문 앞뒤의 빈 줄은 변환하지 않음
+        if not line.strip():
+            if self._body_started:
+                self._blank_run.append(None)
+            return
+        for _ in self._blank_run:
+            self._append_block(BLANK, '')
+        self._blank_run = []
+        self._body_started = True
+        self._append_block(*classify_line(line.strip()))
+
+    def _append_block(self, kind, text):
+        self.document.blocks.append((kind, text))
+        self.writer.write_block(kind, text)
+
+
+# --- 포스트 조립 함수 ---
+def prepare_post(content):
+    """Gemini가 생성한 전체 콘텐츠에서 제목, 태그, 본문 HTML을 분리합니다."""
+    return StreamingPostBuilder().feed(content).close()
+
+
+def parse_post(content):
+    """Gemini가 생성한 전체 콘텐츠를 한 번의 순회로 PostDocument로 파싱합니다."""
+    builder = StreamingPostBuilder().feed(content)
+    builder.close()
+    return builder.document
@@ -0,0 +1,280 @@
+import re
+
+from instrumentation import count, span
+from post_renderer import get_html_styles
+
+
+# create_analysis_prompt()의 형식 요구사항
+MIN_CHARS = 2800
+MIN_TAGS = 5
+DEFAULT_TAG_LINE = '태그::부동산분석,시장동향,투자전략,정책변화,지역별분석'
+
+# 검사 항목 (실패 시 이 순서로 고침)
+FENCE = 'fence'      # 남아 있는 ``` 코드 블록 표시
+TITLE = 'title'      # '# '로 시작하는 제목 줄
+TABLE = 'table'      # 한 줄짜리 HTML 표가 아닌 표 (마크다운 표, 태그가 맞지 않거나 여러 줄로 나뉜 HTML 표)
+TAGS = 'tags'        # 태그가 MIN_TAGS개 이상인 '태그::' 줄
+SECTION = 'section'  # 시장 전망 섹션 (<h2>OUTLOOK_HEADING</h2>)
+LENGTH = 'length'    # 제목과 태그를 뺀 본문 글자 수
+
+OUTLOOK_HEADING = '향후 3-6개월 예상 시나리오'
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+_H2_RE = re.compile(r'<h2[^>]*>(.*?)</h2>', re.DOTALL)
+_OUTLOOK_RE = re.compile(r'전망|시나리오')
+_TABLE_TAG_RE = re.compile(r'<(/?)(table|thead|tbody|tr|th|td)\b', re.IGNORECASE)
+
+
+def _lines(content):
+    return content.replace('<body>', '').replace('</body>', '').split('\n')
+
+
+def _tag_line_index(lines):
+    for index in range(len(lines) - 1, -1, -1):
+        if '태그::' in lines[index]:
+            return index
+    return None
+
+
+def _tag_count(line):
+    return len([tag for tag in _TAG_RE.sub('', line).split('::', 1)[-1].split(',') if tag.strip()])
+
+
+def _table_blocks(lines):
+    """표 블록의 (시작, 끝) 줄 번호 목록을 반환합니다.
+
+    마크다운 표는 '|'로 시작하는 연속된 줄, HTML 표는 <table>부터 </table>까지(닫히지 않으면 빈 줄이나 태그 줄 앞까지)입니다.
+    """
+    blocks = []
+    index = 0
+    while index < len(lines):
+        line = lines[index].strip()
+        if not (line.startswith('|') or '<table' in line):
+            index += 1
+            continue
+        end = index + 1
+        if line.startswith('|'):
+            while end < len(lines) and lines[end].strip().startswith('|'):
+                end += 1
+        elif '</table>' not in line:
+            while end < len(lines) and lines[end].strip() and '태그::' not in lines[end]:
+                end += 1
+                if '</table>' in lines[end - 1]:
+                    break
+        blocks.append((index, end))
+        index = end
+    return blocks
+
+
+def _is_table_line(line):
+    """<table>로 시작해 </table>로 끝나고 표 태그의 여닫음이 맞는 한 줄이면 True입니다. (렌더러가 그대로 출력하는 표)"""
+    line = line.strip()
+    if not (line.startswith('<table') and line.endswith('</table>')):
+        return False
+    balance = {}
+    for closing, name in _TABLE_TAG_RE.findall(line):
+        balance[name.lower()] = balance.get(name.lower(), 0) + (-1 if closing else 1)
+    return not any(balance.values())
+
+
+def body_length(content):
+    """제목 줄과 태그 줄을 뺀 본문에서 HTML 태그를 제외한 글자 수(공백 포함, 연속된 공백은 하나로)를 반환합니다."""
+    lines = [line for line in _lines(content) if line.strip() and not line.strip().startswith('```')]
+    tag_index = _tag_line_index(lines)
+    if tag_index is not None:
+        del lines[tag_index]
+    if lines and lines[0].strip().startswith('# '):
+        del lines[0]
+    return len(_SPACE_RE.sub(' ', _TAG_RE.sub(' ', ' '.join(lines))).strip())
+
+
+# --- 형식 검사 함수 ---
+def validate_post(content, min_chars=MIN_CHARS):
+    """Gemini 응답이 형식 요구사항을 지키는지 검사하고, 어긋난 항목 목록을 반환합니다. 빈 목록이면 통과입니다."""
+    lines = _lines(content)
+    issues = []
+    if any(line.strip().startswith('```') for line in lines):
+        issues.append(FENCE)
+
+    first = next((line.strip() for line in lines if line.strip() and not line.strip().startswith('```')), '')
+    if not first.startswith('# '):
+        issues.append(TITLE)
+
+    if any(end - start > 1 or not _is_table_line(lines[start]) for start, end in _table_blocks(lines)):
+        issues.append(TABLE)
+
+    tag_index = _tag_line_index(lines)
+    if tag_index is None or _tag_count(lines[tag_index]) < MIN_TAGS:
+        issues.append(TAGS)
+
+    if not any(_OUTLOOK_RE.search(_TAG_RE.sub('', heading)) for heading in _H2_RE.findall(content)):
+        issues.append(SECTION)
+
+    if body_length(content) < min_chars:
+        issues.append(LENGTH)
+    return issues
+
+
+# --- 부분 재요청 프롬프트 ---
+def _excerpt(content, limit=1500):
+    return _SPACE_RE.sub(' ', _TAG_RE.sub(' ', content)).strip()[:limit]
+
+
+def create_title_prompt(today_date, content):
+    return f"""
+다음은 {today_date} 부동산 시장 분석 보고서의 일부입니다.
+이 보고서의 제목을 '# '로 시작하는 한 줄로만 작성하세요. 제목에 날짜({today_date})를 포함하고, 다른 내용은 쓰지 마세요.
+
+{_excerpt(content)}
+"""
+
+
+def create_tags_prompt(content):
+    return f"""
+다음 부동산 시장 분석 보고서에 어울리는 태그를 {MIN_TAGS}~8개 골라
+'태그::태그1,태그2,태그3' 형식의 한 줄로만 작성하세요. 태그에는 공백과 # 기호를 넣지 마세요.
+
+{_excerpt(content)}
+"""
+
+
+def create_table_prompt(table):
+    return f"""
+다음 표를 HTML 표 하나로 고쳐 쓰세요. 표의 내용은 바꾸지 마세요.
+<table>로 시작해 </table>로 끝나는 한 줄로만 작성하고, 머리글 칸은 <th>, 나머지 칸은 <td> 태그를 쓰세요.
+다른 설명이나 코드 블록 표시(```)는 쓰지 마세요.
+
+{table}
+"""
+
+
+def create_outlook_prompt(today_date, content):
+    styles = get_html_styles()
+    return f"""
+{today_date} 부동산 시장 분석 보고서에 빠진 시장 전망 섹션을 약 500자 분량으로 작성하세요.
+보고서 내용을 바탕으로 향후 3-6개월의 예상 시나리오를 정리하세요.
+
+형식:
+- 첫 줄은 <h2 style="{styles['h2']}">{OUTLOOK_HEADING}</h2>
+- 문단은 <p style="{styles['p']}">, 목록은 <ul>, <li> 태그, 강조는 <strong> 태그
+- 제목(#), 태그 줄, 코드 블록 표시(```)는 쓰지 마세요.
+
+보고서 일부:
+{_excerpt(content)}
+"""
+
+
+def create_section_prompt(today_date, content, missing_chars):
+    styles = get_html_styles()
+    headings = [_TAG_RE.sub('', heading).strip() for heading in _H2_RE.findall(content)]
+    return f"""
+{today_date} 부동산 시장 분석 보고서에 덧붙일 섹션 하나를 약 {missing_chars}자 분량으로 작성하세요.
+기존 섹션({', '.join(headings) or '없음'})과 겹치지 않는 주제(예: 체크리스트, 용어 정리, 주요 일정)를 고르세요.
+
+형식:
+- 첫 줄은 <h2 style="{styles['h2']}">섹션 제목</h2>
+- 문단은 <p style="{styles['p']}">, 목록은 <ul>, <li> 태그, 강조는 <strong> 태그
+- 제목(#), 태그 줄, 코드 블록 표시(```)는 쓰지 마세요.
+
+보고서 일부:
+{_excerpt(content)}
+"""
+
+
+def _ask(model, stage, prompt, limiter=None):
+    """작은 후속 프롬프트로 응답을 받습니다. 실패하면 None을 반환합니다."""
+    with span(f"repair_{stage}"):
+        count('repair_calls')
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return model.generate_content(prompt).text.strip()
+        except Exception as e:
+            print(f"형식 보정 요청 중 오류 발생 ({stage}): {e}")
+            return None
+
+
+# --- 부분 보정 함수 ---
+def repair_post(model, content, today_date, min_chars=MIN_CHARS, limiter=None):
+    """형식 검사에 실패한 부분만 고치고 (보정된 응답, 보고 dict)를 반환합니다.
+
+    코드 블록 표시, 형식만 어긋난 제목, 여러 줄로 나뉜 HTML 표는 로컬에서 고치고, 없는 제목/태그/시장 전망 섹션,
+    깨진 표, 모자란 분량은 그 부분만 작은 프롬프트로 다시 요청합니다.
+    재요청이 실패하면 제목과 태그는 create_analysis_prompt()의 기본 형식으로 채우고, 깨진 표는 칸 내용만 문단으로 남기며,
+    섹션과 분량은 그대로 둡니다.
+    limiter(RateLimiter)가 주어지면 재요청마다 호출 속도 제한을 적용합니다.
+    """
+    issues = validate_post(content, min_chars)
+    report = {'issues': issues, 'remaining': []}
+    if not issues:
+        return content, report
+
+    lines = _lines(content)
+    if FENCE in issues:
+        lines = [line for line in lines if not line.strip().startswith('```')]
+
+    if TITLE in issues:
+        while lines and not lines[0].strip():
+            del lines[0]
+        first = lines[0].strip() if lines else ''
+        if first.startswith('<h1') or first.startswith('#'):
+            # '<h1>제목</h1>', '#제목'처럼 제목은 있지만 형식만 어긋난 경우 로컬에서 고침
+            lines[0] = f"# {_TAG_RE.sub('', first).lstrip('#').strip()}"
+        else:
+            answer = _ask(model, TITLE, create_title_prompt(today_date, content), limiter) or ''
+            title = next((line.strip() for line in answer.split('\n') if line.strip().startswith('# ')), None)
+            lines.insert(0, title or f"# {today_date} 부동산 시장 분석 리포트")
+
+    if TABLE in issues:
+        # 뒤쪽 표부터 고쳐야 앞쪽 표의 줄 번호가 바뀌지 않음
+        for start, end in reversed(_table_blocks(lines)):
+            block = lines[start:end]
+            joined = ''.join(line.strip() for line in block)
+            if _is_table_line(joined):
+                # 태그는 맞지만 여러 줄로 나뉜 HTML 표는 한 줄로 합침 (렌더러가 줄마다 문단으로 감싸지 않도록)
+                lines[start:end] = [joined]
+                continue
+            answer = _ask(model, TABLE, create_table_prompt('\n'.join(block)), limiter) or ''
+            table = ''.join(line.strip() for line in answer.split('\n') if not line.strip().startswith('```'))
+            if _is_table_line(table):
+                lines[start:end] = [table]
+            else:
+                cells = (_SPACE_RE.sub(' ', _TAG_RE.sub(' ', line).replace('|', ' ')).strip() for line in block)
+                lines[start:end] = [text for text in cells if text.strip('-: ')]
+
+    tag_index = _tag_line_index(lines)
+    if TAGS in issues:
+        answer = _ask(model, TAGS, create_tags_prompt(content), limiter) or ''
+        tag_line = next((line.strip() for line in answer.split('\n')
+                         if '태그::' in line and _tag_count(line) >= MIN_TAGS), DEFAULT_TAG_LINE)
+        if tag_index is None:
+            lines.append(tag_line)
+            tag_index = len(lines) - 1
+        else:
+            lines[tag_index] = tag_line
+
+    if SECTION in issues:
+        answer = _ask(model, SECTION, create_outlook_prompt(today_date, content), limiter)
+        if answer:
+            section_lines = [line for line in answer.split('\n')
+                             if not line.strip().startswith('```') and '태그::' not in line]
+            insert_at = tag_index if tag_index is not None else len(lines)
+            lines[insert_at:insert_at] = [''] + section_lines + ['']
+            if tag_index is not None:
+                tag_index += len(section_lines) + 2
+
+    # 시장 전망 섹션을 채워 분량이 충분해졌으면 분량 섹션은 요청하지 않음
+    missing = min_chars - body_length('\n'.join(lines))
+    if LENGTH in issues and missing > 0:
+        section = _ask(model, LENGTH, create_section_prompt(today_date, content, max(missing + 200, 500)),
+                       limiter)
+        if section:
+            section_lines = [line for line in section.split('\n')
+                             if not line.strip().startswith('```') and '태그::' not in line]
+            insert_at = tag_index if tag_index is not None else len(lines)
+            lines[insert_at:insert_at] = [''] + section_lines + ['']
+
+    repaired = '\n'.join(lines)
+    report['remaining'] = validate_post(repaired, min_chars)
+    return repaired, report
@@ -0,0 +1,103 @@
+import re
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+# 관련도 점수 계산에 사용하는 부동산 키워드와 정책 용어
+REAL_ESTATE_KEYWORDS = (
+    '부동산', '아파트', '주택', '매매', '전세', '월세', '분양', '청약', '재건축', '재개발',
+    '집값', '시세', '거래량', '미분양', '오피스텔', '토지', '입주', '공급',
+)
+POLICY_TERMS = (
+    '금리', '대출', '규제', 'DSR', 'LTV', 'DTI', '세제', '양도세', '종부세', '취득세',
+    '국토교통부', '국토부', '기획재정부', '한국은행', '정책', '대책', '법안', '개정',
+)
+
+_HANGUL_RE = re.compile(r'[가-힣]')
+_NAVER_OFFICE_RE = re.compile(r'/article/(\d+)/')
+
+
+# --- 토큰 수 추정 함수 ---
+def estimate_tokens(text):
+    """한글은 약 1.5자, 그 외 문자는 약 4자를 토큰 하나로 보고 토큰 수를 추정합니다."""
+    hangul = len(_HANGUL_RE.findall(text))
+    return int(hangul / 1.5 + (len(text) - hangul) / 4) + 1
+
+
+def source_of(url):
+    """기사 출처(네이버 뉴스는 언론사 id, 그 외는 호스트)를 반환합니다."""
+    if not url:
+        return None
+    match = _NAVER_OFFICE_RE.search(url)
+    return match.group(1) if match else urlsplit(url).netloc
+
+
+def lead_paragraphs(text, count):
+    """기사 앞부분 count개 문단만 남깁니다."""
+    paragraphs = [p for p in text.split('\n') if p.strip()]
+    return '\n'.join(paragraphs[:count])
+
+
+# --- 관련도 점수 함수 ---
+def score_article(text, position, total):
+    """키워드/정책 용어 밀도와 피드 내 순서(최신순)로 기사 관련도 점수를 계산합니다."""
+    length = max(len(text), 1)
+    keyword_hits = sum(text.count(keyword) for keyword in REAL_ESTATE_KEYWORDS)
+    policy_hits = sum(text.count(term) for term in POLICY_TERMS)
+    density = (keyword_hits + 2 * policy_hits) * 1000 / length
+    recency = 1.0 - position / max(total, 1)
+    return density + 2.0 * recency
+
+
+# --- 프롬프트 패커 ---
+def pack_articles(articles, budget_tokens, lead_count=3, diversity_penalty=0.8):
+    """토큰 예산 안에 들어가도록 관련도가 높은 기사부터 채웁니다.
+
+    articles는 text와 url(선택) 키를 가진 dict 목록이며 피드 순서(최신순)를 따릅니다.
+    같은 출처의 기사는 선택될 때마다 점수에 diversity_penalty를 곱해 출처를 분산합니다.
+    전문이 예산을 넘으면 앞부분 lead_count개 문단만 넣고, 그래도 넘으면 제외합니다.
+    (원래 순서를 유지한 포함 기사 텍스트 목록, 보고 dict)를 반환합니다.
+    보고의 dropped에는 제외한 기사의 URL이, dropped_indices에는 articles 안의 인덱스가 들어갑니다.
+    """
+    total = len(articles)
+    scores = [score_article(article['text'], i, total) for i, article in enumerate(articles)]
+    remaining = set(range(total))
+    source_counts = Counter()
+    packed = {}
+    trimmed = []
+    dropped = []
+    dropped_indices = []
+    used = 0
+
+    while remaining:
+        # 같은 출처에서 이미 선택된 수만큼 감점한 점수로 다음 기사를 고름
+        best = max(remaining, key=lambda i: (
+            scores[i] * diversity_penalty ** source_counts[source_of(articles[i].get('url'))], -i
+        ))
+        remaining.remove(best)
+        article = articles[best]
+
+        text = article['text']
+        tokens = estimate_tokens(text)
+        if used + tokens > budget_tokens:
+            text = lead_paragraphs(text, lead_count)
+            tokens = estimate_tokens(text)
+            if used + tokens > budget_tokens:
+                dropped.append(article.get('url') or f"#{best}")
+                dropped_indices.append(best)
+                continue
+            trimmed.append(article.get('url') or f"#{best}")
+
+        packed[best] = text
+        used += tokens
+        source_counts[source_of(article.get('url'))] += 1
+
+    report = {
+        'budget_tokens': budget_tokens,
+        'used_tokens': used,
+        'packed': len(packed),
+        'trimmed': trimmed,
+        'dropped': dropped,
+        'dropped_indices': dropped_indices,
+    }
+    return [packed[i] for i in sorted(packed)], report
@@ -0,0 +1,366 @@
+import contextvars
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import count, span
+from rate_limit import RateLimiter
+
+
+# 게시 대기열 항목 상태
+PENDING = 'pending'       # 게시 대기 (재시도 대기 포함)
+SENDING = 'sending'       # 게시 중 (lease 시간이 지나면 게시되었는지 확인 후 다시 시도)
+PUBLISHED = 'published'
+FAILED = 'failed'         # 재시도해도 성공할 수 없는 오류 또는 최대 시도 횟수 초과
+FINISHED = (PUBLISHED, FAILED)
+
+# drain(keys)가 항목이 끝나기를 기다리는 동안 상태를 다시 확인하는 간격(초)
+_WAIT_POLL_SECONDS = 1.0
+
+
+class RetryablePublishError(Exception):
+    """요청 제한, 서버 오류, 세션 만료처럼 나중에 다시 시도하면 성공할 수 있는 게시 실패입니다."""
+
+
+class PublishRejected(Exception):
+    """다시 시도해도 성공할 수 없는 게시 실패입니다. (잘못된 요청 등)"""
+
+
+def idempotency_key(blog_name, slot, topic, article_urls=()):
+    """같은 블로그, 같은 게시 시점(slot, 보통 날짜), 같은 주제의 글을 하나로 식별하는 키를 만듭니다.
+
+    Gemini가 쓴 제목과 본문은 다시 생성하면 달라지므로 키에 넣지 않습니다. article_urls(증분 모드에서 글에 사용한
+    기사)가 주어지면 키에 더해, 하루 여러 번 새 기사로 쓰는 글을 서로 다른 글로 봅니다.
+    """
+    fields = [blog_name, slot, topic, *sorted(article_urls)]
+    return hashlib.sha256('\n'.join(fields).encode('utf-8')).hexdigest()[:32]
+
+
+def publish_marker(key):
+    """게시한 본문에 넣어 두는 표식입니다. 응답을 받지 못한 요청이 실제로 게시되었는지 확인할 때 찾습니다."""
+    return f"<!-- publish-key:{key} -->"
+
+
+# --- 게시 대기열 ---
+class PublishOutbox:
+    """변환이 끝난 게시 payload를 SQLite에 보관하는 게시 대기열입니다.
+
+    항목은 idempotency_key()로 식별되므로 같은 시점, 같은 주제의 글을 여러 번 넣어도(재개, 다시 생성한 글) 한 번만 게시됩니다.
+    게시 중(SENDING)인 항목은 lease초가 지나도록 끝나지 않으면(프로세스 중단 등) 다시 게시 대기로 돌아갑니다.
+    여러 프로세스가 같은 파일을 열어도 한 항목은 한 곳에서만 가져가도록 상태를 조건부로 바꿉니다.
+    """
+
+    def __init__(self, path, lease=300.0):
+        import sqlite3
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                " key TEXT PRIMARY KEY, blog TEXT NOT NULL, title TEXT NOT NULL, payload TEXT NOT NULL,"
+                " options TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+                " next_attempt_at REAL NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, message TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+            # 게시되면 기사 색인에 기록할 기사 목록 (이 열이 없던 대기열 파일에는 추가)
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+            if 'seen_articles' not in columns:
+                self._conn.execute("ALTER TABLE outbox ADD COLUMN seen_articles TEXT")
+
+    @staticmethod
+    def _item(row):
+        if row is None:
+            return None
+        item = dict(row)
+        item['post'] = json.loads(item.pop('payload'))
+        item['options'] = json.loads(item['options'])
+        item['seen_articles'] = json.loads(item['seen_articles'] or '[]')
+        return item
+
+    def enqueue(self, blog_name, post, slot, topic, options=None, seen_articles=None):
+        """게시 payload를 대기열에 넣고 (키, 새로 넣었는지 여부)를 반환합니다.
+
+        키는 blog_name, slot, topic과 seen_articles의 기사 URL로 만들며(idempotency_key), 같은 키의 항목이 이미 있으면
+        새 payload는 버리고 기존 항목을 그대로 둡니다. 실패(FAILED)로 끝난 항목은 새 payload로 다시 게시 대기로 돌립니다.
+        seen_articles(기사 색인 항목 {'url', 'fingerprint'} 목록)는 항목과 함께 저장되어, 언제 게시되든
+        게시된 뒤에 기사 색인에 기록됩니다.
+        """
+        key = idempotency_key(blog_name, slot, topic, [article['url'] for article in seen_articles or ()])
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (key, blog, title, payload, options, status, attempts, next_attempt_at,"
+                " created_at, updated_at, seen_articles) VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)",
+                (key, blog_name, post['title'], json.dumps(post, ensure_ascii=False),
+                 json.dumps(options or {}, ensure_ascii=False), PENDING, now, now, now,
+                 json.dumps(seen_articles, ensure_ascii=False) if seen_articles else None),
+            )
+            created = cursor.rowcount == 1
+            if not created:
+                self._conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ?, title = ?,"
+                    " payload = ? WHERE key = ? AND status = ?",
+                    (PENDING, now, now, post['title'], json.dumps(post, ensure_ascii=False), key, FAILED),
+                )
+        return key, created
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM outbox WHERE key = ?", (key,)).fetchone()
+        return self._item(row)
+
+    def items(self, status=None):
+        query = "SELECT * FROM outbox" + (" WHERE status = ?" if status else "") + " ORDER BY created_at"
+        with self._lock:
+            rows = self._conn.execute(query, (status,) if status else ()).fetchall()
+        return [self._item(row) for row in rows]
+
+    def _due_clause(self, now):
+        return ("((status = ? AND next_attempt_at <= ?) OR (status = ? AND updated_at <= ?))",
+                (PENDING, now, SENDING, now - self.lease))
+
+    def due_blogs(self, now=None):
+        """지금 게시할 항목이 있는 블로그 목록을 반환합니다."""
+        clause, params = self._due_clause(time.time() if now is None else now)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT DISTINCT blog FROM outbox WHERE {clause}", params).fetchall()
+        return [row['blog'] for row in rows]
+
+    def next_due_at(self, keys=None):
+        """게시 대기 중인 항목(keys가 주어지면 그중)의 가장 이른 다음 시도 시각을 반환합니다. 없으면 None."""
+        query = "SELECT MIN(CASE WHEN status = ? THEN next_attempt_at ELSE updated_at + ? END) FROM outbox " \
+                "WHERE status IN (?, ?)"
+        params = [PENDING, self.lease, PENDING, SENDING]
+        if keys:
+            query += f" AND key IN ({', '.join('?' * len(keys))})"
+            params += list(keys)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def claim(self, blog_name, now=None):
+        """블로그의 게시할 항목 중 가장 오래된 것을 게시 중으로 바꾸고 반환합니다. 없으면 None을 반환합니다.
+
+        반환된 항목의 attempts는 이번 시도를 포함한 횟수입니다.
+        """
+        now = time.time() if now is None else now
+        clause, params = self._due_clause(now)
+        with self._lock, self._conn:
+            while True:
+                row = self._conn.execute(
+                    f"SELECT * FROM outbox WHERE blog = ? AND {clause} ORDER BY created_at LIMIT 1",
+                    (blog_name, *params),
+                ).fetchone()
+                if row is None:
+                    return None
+                # 다른 프로세스가 먼저 가져갔으면 다음 항목을 찾음
+                cursor = self._conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE key = ? AND status = ? AND attempts = ?",
+                    (SENDING, now, row['key'], row['status'], row['attempts']),
+                )
+                if cursor.rowcount == 1:
+                    item = self._item(row)
+                    item.update(status=SENDING, attempts=row['attempts'] + 1, updated_at=now)
+                    return item
+
+    def _finish(self, key, status, message, next_attempt_at=None):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, message = ?, next_attempt_at = COALESCE(?, next_attempt_at), "
+                "updated_at = ? WHERE key = ?",
+                (status, message, next_attempt_at, now, key),
+            )
+
+    def mark_published(self, key, message):
+        self._finish(key, PUBLISHED, message)
+
+    def mark_failed(self, key, message):
+        self._finish(key, FAILED, message)
+
+    def mark_retry(self, key, delay, message):
+        self._finish(key, PENDING, message, next_attempt_at=time.time() + delay)
+
+    def prune(self, max_age):
+        """max_age(초)보다 오래전에 끝난(게시/실패) 항목을 삭제합니다."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"DELETE FROM outbox WHERE status IN ({', '.join('?' * len(FINISHED))}) AND updated_at < ?",
+                (*FINISHED, time.time() - max_age),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --- 게시 대기열 처리기 ---
+class OutboxPublisher:
+    """게시 대기열의 항목을 블로그별 호출 속도 제한과 지수 백오프 재시도를 지켜 게시합니다.
+
+    - send(item)은 게시에 성공하면 결과 메시지(글 주소 등)를 반환하고, 실패하면 RetryablePublishError 또는
+      PublishRejected를 발생시킵니다. 그 밖의 예외는 다시 시도할 수 있는 실패로 봅니다.
+    - find_existing(item)이 주어지면 이미 한 번 이상 보낸 항목은 다시 보내기 전에 같은 글이 이미 게시되었는지
+      확인합니다. 응답을 받지 못한 요청이 실제로는 게시되었을 수 있으므로 중복 게시를 막기 위한 것입니다.
+      확인에 실패하면 보내지 않고 나중에 다시 시도합니다.
+    - on_published(item)이 주어지면 항목이 게시된 것을 확인했을 때(보내서 성공했거나 이미 게시된 글을 찾았을 때)
+      호출합니다. 이 함수의 오류는 항목의 상태를 바꾸지 않습니다.
+    - 블로그마다 한 번에 한 항목씩, 분당 per_minute회(연속 burst회까지) 이하로 보내고, 서로 다른 블로그는
+      최대 max_workers개까지 동시에 처리합니다.
+    """
+
+    def __init__(self, outbox, send, find_existing=None, on_published=None, per_minute=6, burst=1, max_attempts=8,
+                 backoff_base=30.0, backoff_cap=1800.0, max_workers=4):
+        self.outbox = outbox
+        self.send = send
+        self.find_existing = find_existing
+        self.on_published = on_published
+        self.per_minute = per_minute
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_workers = max_workers
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _limiter(self, blog_name):
+        with self._lock:
+            if blog_name not in self._limiters:
+                self._limiters[blog_name] = RateLimiter(self.per_minute, burst=self.burst)
+            return self._limiters[blog_name]
+
+    def backoff(self, attempt):
+        """attempt번째 시도가 실패한 뒤 다음 시도까지의 대기 시간 (지터를 넣은 지수 백오프, 최대 backoff_cap초)."""
+        return random.uniform(self.backoff_base / 2, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _retry_or_fail(self, item, message):
+        if item['attempts'] >= self.max_attempts:
+            count('outbox_failed')
+            self.outbox.mark_failed(item['key'], f"{message} (시도 {item['attempts']}회)")
+            return FAILED
+        delay = self.backoff(item['attempts'])
+        count('outbox_retries')
+        self.outbox.mark_retry(item['key'], delay, message)
+        print(f"[{item['blog']}] 게시 재시도 예정 ({delay:.1f}초 후, 시도 {item['attempts']}회): {message}")
+        return PENDING
+
+    def _published(self, item, message):
+        self.outbox.mark_published(item['key'], message)
+        if self.on_published is not None:
+            try:
+                self.on_published(item)
+            except Exception as e:
+                print(f"[{item['blog']}] 게시 후 처리 중 오류 발생: {e}")
+
+    def publish_one(self, item):
+        """게시 중으로 가져온 항목 하나를 처리하고 처리 후 상태를 반환합니다."""
+        with span('outbox_publish', blog=item['blog'], attempt=item['attempts']) as span_attrs:
+            if self.find_existing is not None and item['attempts'] > 1:
+                try:
+                    existing = self.find_existing(item)
+                except Exception as e:
+                    span_attrs['status'] = self._retry_or_fail(item, f"게시 여부 확인 실패: {e}")
+                    return span_attrs['status']
+                if existing:
+                    count('outbox_deduplicated')
+                    print(f"[{item['blog']}] 이미 게시된 글입니다: {item['title']} ({existing})")
+                    self._published(item, existing)
+                    span_attrs['status'] = PUBLISHED
+                    return PUBLISHED
+
+            self._limiter(item['blog']).acquire()
+            try:
+                message = self.send(item)
+            except PublishRejected as e:
+                count('outbox_failed')
+                self.outbox.mark_failed(item['key'], str(e))
+                span_attrs['status'] = FAILED
+                return FAILED
+            except Exception as e:
+                span_attrs['status'] = self._retry_or_fail(item, str(e) or repr(e))
+                return span_attrs['status']
+
+            count('outbox_published')
+            self._published(item, message)
+            span_attrs['status'] = PUBLISHED
+            return PUBLISHED
+
+    def _drain_blog(self, blog_name):
+        while not self._stop.is_set():
+            item = self.outbox.claim(blog_name)
+            if item is None:
+                return
+            self.publish_one(item)
+
+    def drain(self, keys=None, timeout=None):
+        """지금 게시할 항목을 모두 처리합니다.
+
+        keys가 주어지면 그 항목이 게시되거나 실패로 끝날 때까지(최대 timeout초) 재시도 시각을 기다리며 반복하고,
+        {키: 항목} dict를 반환합니다. 시간이 다 되어도 끝나지 않은 항목은 대기열에 남아 다음 처리 때 게시됩니다.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="outbox") as pool:
+            while not self._stop.is_set():
+                blogs = self.outbox.due_blogs()
+                # 게시 구간(span)이 호출한 구간 아래에 기록되도록 블로그마다 컨텍스트를 복사해 실행
+                futures = [pool.submit(contextvars.copy_context().run, self._drain_blog, blog) for blog in blogs]
+                for future in futures:
+                    future.result()
+                if not keys:
+                    break
+                items = [self.outbox.get(key) for key in keys]
+                if all(item is None or item['status'] in FINISHED for item in items):
+                    break
+                next_due = self.outbox.next_due_at(keys)
+                if next_due is None:
+                    break
+                # 다른 곳에서 게시 중인 항목은 끝났는지 자주 확인
+                wait_for = min(max(next_due - time.time(), 0.0), _WAIT_POLL_SECONDS)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or next_due - time.time() > remaining:
+                        break
+                if wait_for:
+                    self._stop.wait(wait_for)
+        return {key: self.outbox.get(key) for key in keys or ()}
+
+    # --- 백그라운드 처리 (데몬 모드) ---
+    def start(self, poll=30.0):
+        """백그라운드 스레드에서 대기열을 계속 처리합니다. notify()로 새 항목이 들어왔음을 알릴 수 있습니다."""
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.drain()
+                except Exception as e:
+                    print(f"게시 대기열 처리 중 오류 발생: {e}")
+                next_due = self.outbox.next_due_at()
+                wait_for = poll if next_due is None else min(max(next_due - time.time(), 0.0), poll)
+                self._wake.wait(wait_for)
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=run, name="outbox-publisher", daemon=True)
+        self._thread.start()
+
+    def notify(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=60)
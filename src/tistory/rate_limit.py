@@ -0,0 +1,28 @@
+import threading
+import time
+
+
+# --- 호출 속도 제한기 ---
+class RateLimiter:
+    """분당 최대 호출 수를 넘지 않도록 호출 간격을 조절합니다. 여러 스레드에서 공유할 수 있습니다.
+
+    burst가 1보다 크면 그동안 쉬었던 만큼 최대 burst회까지는 간격 없이 연달아 호출할 수 있습니다. (GCRA)
+    """
+
+    def __init__(self, per_minute, burst=1):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self):
+        """다음 호출이 허용될 때까지 대기합니다."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            next_at = max(now, self._next_at)
+            wait_for = next_at - self.tolerance - now
+            self._next_at = next_at + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
@@ -1,109 +1,45 @@
+import argparse
 import json
 import os
-import re
-import smtplib
+import sys
+import threading
+import time
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from urllib.parse import urljoin, urlsplit
 from zoneinfo import ZoneInfo
 
-import google.generativeai as genai
-import requests
-from bs4 import BeautifulSoup
-
-
-# --- Helper function for BMP filtering ---
-def remove_non_bmp_chars(s):
-    return "".join(c for c in s if c <= '\uFFFF')
-
-
-# --- HTML 콘텐츠 변환 함수 ---
-def convert_to_tistory_html(content):
-    """Gemini가 생성한 콘텐츠를 Tistory 형식의 HTML로 변환합니다."""
-    styles = get_html_styles()
-    html_content = ""
-
-    lines = content.split('\n')
-    in_list = False
-
-    for line in lines:
-        line = line.strip()
-
-        if not line:
-            # 빈 줄 처리
-            html_content += '<p data-ke-size="size16"><br data-mce-bogus="1"></p>\n'
-
-        elif line.startswith('<h1'):
-            # H1 제목
-            html_content += f'{line}\n'
-
-        elif line.startswith('<h2'):
-            # H2 섹션 제목
-            if in_list:
-                html_content += '</ul>\n'
-                in_list = False
-            html_content += f'{line}\n'
-
-        elif line.startswith('<h3'):
-            # H3 소제목
-            if in_list:
-                html_content += '</ul>\n'
-                in_list = False
-            html_content += f'{line}\n'
-
-        elif line.startswith('<ul>'):
-            # 목록 시작
-            html_content += f'<ul style="{styles["ul"]}" data-ke-list-type="disc">\n'
-            in_list = True
-
-        elif line.startswith('<li>'):
-            # 목록 항목
-            html_content += f'<li style="{styles["li"]}" data-ke-list-type="disc">{line[4:-5]}</li>\n'
-
-        elif line.startswith('</ul>'):
-            # 목록 끝
-            html_content += '</ul>\n'
-            in_list = False
-
-        elif line.startswith('<p'):
-            # 기존 p 태그가 있는 경우
-            if in_list:
-                html_content += '</ul>\n'
-                in_list = False
-            html_content += f'{line}\n'
-
-        else:
-            # 일반 텍스트 줄
-            if in_list:
-                html_content += '</ul>\n'
-                in_list = False
-
-            # strong 태그 처리
-            if '<strong>' in line:
-                line = line.replace('<strong>', f'<strong style="{styles["strong"]}">')
-
-            html_content += f'<p style="{styles["p"]}" data-ke-size="size16">{line}</p>\n'
-
-    # 목록이 열려있으면 닫기
-    if in_list:
-        html_content += '</ul>\n'
-
-    return html_content.strip()
-
-
-# --- HTML 스타일링 함수 ---
-def get_html_styles():
-    """Tistory 블로그용 HTML 스타일을 반환합니다."""
-    return {
-        'h1': "font-family: 'Noto Sans KR', sans-serif; font-size: 26px; font-weight: bold; margin-bottom: 25px; color: #2c3e50; text-align: center;",
-        'h2': "font-family: 'Noto Sans KR', sans-serif; font-size: 22px; font-weight: bold; margin-top: 30px; margin-bottom: 18px; border-bottom: 3px solid #3498db; padding-bottom: 8px; color: #2c3e50;",
-        'h3': "font-family: 'Noto Sans KR', sans-serif; font-size: 18px; font-weight: bold; margin-top: 25px; margin-bottom: 15px; color: #34495e;",
-        'p': "font-family: 'Noto Sans KR', sans-serif; line-height: 1.8; margin: 12px 0; color: #2c3e50; font-size: 16px;",
-        'ul': "font-family: 'Noto Sans KR', sans-serif; line-height: 1.7; margin: 15px 0; padding-left: 20px;",
-        'li': "margin-bottom: 8px; color: #2c3e50;",
-        'strong': "color: #e74c3c; font-weight: bold;",
-        'highlight_box': "background-color: #f8f9fa; border-left: 4px solid #3498db; padding: 15px; margin: 20px 0; border-radius: 5px;"
-    }
+# google.generativeai, requests, bs4 등 무거운 의존성은 사용하는 함수 안에서 가져옵니다.
+# 저장된 초안 변환(render)이나 알림(notify)처럼 네트워크를 쓰지 않는 명령은 이 모듈들을 불러오지 않습니다.
+from article_cache import ArticleCache
+from article_dedup import deduplicate_articles, simhash
+from checkpoint_store import CheckpointStore, new_run_id
+from instrumentation import annotate, count, get_instrumentation, profile_section, span, traced
+from news_ingest import DEFAULT_MAX_PAGES, iter_news_items, iter_news_link_urls
+from post_renderer import StreamingPostBuilder, get_html_styles, prepare_post
+from post_validator import repair_post
+from prompt_packer import estimate_tokens, pack_articles
+from publish_outbox import (
+    FAILED,
+    PUBLISHED,
+    OutboxPublisher,
+    PublishOutbox,
+    PublishRejected,
+    RetryablePublishError,
+    publish_marker,
+)
+from rate_limit import RateLimiter
+from seen_index import NoNewArticles, SeenArticleIndex
+from session_vault import SessionVault, get_session_cookie, is_session_valid, tistory_base_url
+
+
+# 기본 포스팅 카테고리 ID
+DEFAULT_CATEGORY_ID = 1532685
+
+# 이 스크립트가 쓰는 글의 주제 (게시 대기열 키와 batch 설정의 기본 주제)
+DEFAULT_TOPIC = 'real_estate'
+
+# 글 생성에 사용하는 Gemini 모델
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
 
 
 # --- 프롬프트 템플릿 함수 ---
@@ -199,13 +135,18 @@ def create_analysis_prompt(today_date, fetched_articles_text):
 
 
 # --- 이메일 전송 함수 ---
+@traced('send_email')
 def send_email(subject, body, sender_email, sender_password, recipient_email):
     """지정된 주소로 이메일을 전송합니다."""
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     print("결과를 이메일로 전송합니다...")
     try:
-        # SMTP 서버 설정 (Gmail 기준)
-        smtp_server = "smtp.gmail.com"
-        smtp_port = 587
+        # SMTP 서버 설정 (기본값은 Gmail 기준)
+        smtp_server = os.environ.get("SMTP_SERVER", "smtp.gmail.com")
+        smtp_port = int(os.environ.get("SMTP_PORT", "587"))
 
         # 이메일 메시지 생성
         msg = MIMEMultipart()
@@ -216,7 +157,8 @@ def send_email(subject, body, sender_email, sender_password, recipient_email):
 
         # 서버 연결 및 로그인
         server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()
+        if os.environ.get("SMTP_STARTTLS", "1") != "0":
+            server.starttls()
         server.login(sender_email, sender_password)
 
         # 이메일 전송
@@ -229,67 +171,155 @@ def send_email(subject, body, sender_email, sender_password, recipient_email):
         return False
 
 
+# --- Gemini 설정 함수 ---
+def configure_gemini(api_key):
+    """Gemini API 키를 설정합니다. GEMINI_API_ENDPOINT가 있으면 REST 전송으로 해당 서버에 요청합니다."""
+    import google.generativeai as genai
+
+    endpoint = os.environ.get("GEMINI_API_ENDPOINT")
+    if endpoint:
+        genai.configure(api_key=api_key, transport='rest', client_options={'api_endpoint': endpoint})
+    else:
+        genai.configure(api_key=api_key)
+
+
+def create_gemini_model(api_key):
+    """API 키를 설정하고 글 생성에 사용할 Gemini 모델을 만듭니다."""
+    import google.generativeai as genai
+
+    configure_gemini(api_key)
+    return genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+
 # --- Gemini 블로그 글 생성 함수 ---
-def generate_post_with_gemini(api_key):
-    """Gemini를 통해 오늘자 부동산 뉴스를 검색하고, 이를 바탕으로 블로그 글을 생성합니다."""
+@traced('generate_post')
+def generate_post_with_gemini(api_key, builder=None, metrics=None, seen_index=None):
+    """Gemini를 통해 오늘자 부동산 뉴스를 검색하고, 이를 바탕으로 블로그 글을 생성합니다.
+
+    builder(StreamingPostBuilder)가 주어지면 응답을 스트리밍으로 받아 청크마다 builder에 전달합니다.
+    metrics dict가 주어지면 첫 응답까지의 시간(ttfb)과 전체 생성 시간(generation_time)을 기록합니다.
+    seen_index(SeenArticleIndex)가 주어지면 마지막 게시 이후의 새 기사만 사용하고, 새 기사가 부족하면
+    NoNewArticles를 발생시킵니다. 게시에 성공한 뒤 seen_index.commit()으로 사용한 기사를 기록하는 것은 호출자의 몫입니다.
+    """
     print("Gemini를 통해 뉴스 검색 및 블로그 글 생성을 시작합니다...")
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-1.5-flash')
+    model = create_gemini_model(api_key)
 
     kst = ZoneInfo("Asia/Seoul")
     today_date = datetime.now(kst).strftime('%Y-%m-%d')
-    
-    # 네이버 부동산 뉴스 API 호출
-    try:
-        print(f"{today_date}의 네이버 부동산 뉴스를 가져옵니다...")
-        news_api_url = f"https://m2.land.naver.com/news/airsList.naver?baseDate={today_date}&page=1&size=30"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(news_api_url, headers=headers)
-        response.raise_for_status()
-        news_data = response.json()
-        
-        # linkUrl만 추출하여 리스트로 만듦
-        link_urls = [item['linkUrl'] for item in news_data.get('list', [])]
-        
-        if not link_urls:
-            print("가져온 뉴스 기사가 없습니다.")
-            return None
 
-        # BeautifulSoup을 사용하여 모든 기사 내용 가져오기
-        print(f"{len(link_urls)}개의 뉴스 기사 내용을 가져옵니다...")
-        fetched_articles_texts = []
-        for url in link_urls:
-            try:
-                article_response = requests.get(url, headers=headers)
-                article_response.raise_for_status()
-                soup = BeautifulSoup(article_response.text, 'html.parser')
-                
-                # 네이버 뉴스 본문 선택자 (일반적인 경우)
-                article_body = soup.select_one('#articleBodyContents, #newsct_article')
-
-                if article_body:
-                    # 불필요한 요소(광고, 스크립트 등) 제거
-                    for el in article_body.select('script, style, .ad, .promotion, .link_news, .journalist_card'):
-                        el.decompose()
-                    
-                    text = article_body.get_text(separator='\n', strip=True)
-                    fetched_articles_texts.append(text)
-                else:
-                    print(f"기사 본문을 찾을 수 없습니다: {url}")
+    fetched_articles_text = fetch_news_articles_text(today_date, seen_index=seen_index,
+                                                     summarizer=default_summarizer(model))
+    if not fetched_articles_text:
+        return None
 
-            except requests.exceptions.RequestException as e:
-                print(f"기사 내용 로딩 중 오류 발생 (URL: {url}): {e}")
-                continue # 한 기사 실패 시 다음으로 넘어감
-        
-        if not fetched_articles_texts:
-            print("모든 뉴스 기사의 내용을 가져오는데 실패했습니다.")
-            return None
+    prompt = build_prompt(today_date, fetched_articles_text)
+    return generate_content_with_gemini(model, prompt, builder=builder, metrics=metrics)
+
+
+@traced('build_prompt')
+def build_prompt(today_date, fetched_articles_text):
+    """수집한 뉴스로 분석 프롬프트를 만들고 크기를 기록합니다."""
+    prompt = create_analysis_prompt(today_date, fetched_articles_text)
+    count('prompt_chars', len(prompt))
+    count('prompt_tokens_estimated', estimate_tokens(prompt))
+    return prompt
+
+
+# --- 뉴스 기사 수집 함수 ---
+@traced('fetch_news')
+def fetch_news_articles_text(today_date, days=None, checkpoint=None, seen_index=None, summarizer=None,
+                             http_session=None, fetch_policy=None):
+    """네이버 부동산 뉴스 목록과 기사 본문을 가져와 하나의 텍스트로 합칩니다. 실패하면 None을 반환합니다.
+
+    today_date부터 과거로 days일(기본값: NEWS_DAYS 환경변수, 1일) 동안의 모든 페이지를 순회합니다.
+    뉴스 목록 조회, 기사 수집, 본문 추출은 제너레이터로 연결되어 원문 HTML을 한꺼번에 메모리에 두지 않습니다.
+    checkpoint(RunCheckpoint)가 주어지면 추출한 기사 목록을 'articles' 단계로 저장하고,
+    이미 저장되어 있으면 수집을 건너뛰고 저장된 기사로 중복 제거와 프롬프트 구성만 다시 합니다.
+    토큰 예산 초과로 프롬프트에서 빠진 기사(와 그 중복 기사)는 저장한 목록에 dropped로 표시합니다.
+    seen_index(SeenArticleIndex)가 주어지면 이미 게시에 사용한 URL은 가져오지 않고, 본문이 최근 게시한 기사와
+    거의 같은 기사도 제외합니다. 프롬프트에서 빠진 기사는 다음 실행에서 다시 쓸 수 있도록 색인에 기록하지 않습니다. 남은 새 기사가 INCREMENTAL_MIN_NEW_ARTICLES개(기본값: 3)보다 적으면
+    NoNewArticles를 발생시켜 글 생성을 건너뛰게 합니다.
+    summarizer(MapReduceSummarizer)가 주어지면 중복 제거 후 기사마다 요약본을 만들어 원문 대신 프롬프트에 넣습니다.
+    http_session과 fetch_policy(FetchPolicy)가 주어지면 새로 만들지 않고 재사용하며, 닫는 것은 호출자의 몫입니다.
+    """
+    import requests
+
+    if days is None:
+        days = int(os.environ.get("NEWS_DAYS", "1"))
+
+    try:
+        saved_articles = checkpoint.load('articles') if checkpoint else None
+        if saved_articles:
+            print(f"체크포인트에서 기사 {len(saved_articles)}개를 복원합니다.")
+            fetched_articles_texts = [article['text'] for article in saved_articles]
+            fetched_urls = [article['url'] for article in saved_articles]
+        else:
+            print(f"{today_date}부터 {days}일간의 네이버 부동산 뉴스를 가져옵니다...")
+            fetched = _fetch_article_texts(today_date, days, seen_index, http_session=http_session,
+                                           fetch_policy=fetch_policy)
+            if fetched is None:
+                return None
+            fetched_articles_texts, fetched_urls = fetched
+            if checkpoint:
+                checkpoint.save('articles', _checkpoint_articles(fetched_urls, fetched_articles_texts))
+        all_urls, all_texts = fetched_urls, fetched_articles_texts
+
+        # 기사마다 SimHash 지문을 한 번만 계산해 재게재 기사 판별과 중복 제거에 함께 사용
+        with span('fingerprint'), profile_section('dedup'):
+            fingerprints = [simhash(text) for text in fetched_articles_texts]
+        if seen_index is not None:
+            fetched_articles_texts, fetched_urls, fingerprints = _filter_new_articles(
+                seen_index, fetched_articles_texts, fetched_urls, fingerprints
+            )
+
+        # 여러 매체가 같은 기사를 실은 경우 하나만 남겨 프롬프트 크기 축소
+        with span('dedup'), profile_section('dedup'):
+            fetched_articles_texts, dedup_stats = deduplicate_articles(
+                fetched_articles_texts, threshold=int(os.environ.get("ARTICLE_DEDUP_THRESHOLD", "10")),
+                fingerprints=fingerprints,
+            )
+        print(f"중복 기사 제거: {dedup_stats['articles']}개 → {dedup_stats['clusters']}개, "
+              f"{dedup_stats['chars_saved']}자 절약")
+
+        # 관련도 순으로 토큰 예산 안에 들어가는 기사만 프롬프트에 포함
+        articles = [
+            {'text': text, 'url': fetched_urls[index]}
+            for text, index in zip(fetched_articles_texts, dedup_stats['kept_indices'])
+        ]
+        if summarizer is not None:
+            # 기사 묶음을 동시에 요약(map)해, 최종 분석 프롬프트(reduce)에는 요약만 넣음
+            with span('map_summaries') as span_attrs:
+                summaries, map_stats = summarizer.summarize([article['text'] for article in articles])
+                span_attrs.update(map_stats)
+            print(f"기사 요약: {map_stats['articles']}개 (캐시 {map_stats['cache_hits']}개, 요약 호출 "
+                  f"{map_stats['groups']}회, 실패 {map_stats['failed']}개), "
+                  f"{map_stats['chars_before']}자 → {map_stats['chars_after']}자")
+            articles = [{'text': summary, 'url': article['url']} for summary, article in zip(summaries, articles)]
+        with span('pack_prompt'), profile_section('pack_prompt'):
+            fetched_articles_texts, pack_report = pack_articles(
+                articles, budget_tokens=int(os.environ.get("PROMPT_TOKEN_BUDGET", "20000"))
+            )
+        print(f"프롬프트 기사 구성: {pack_report['packed']}개, 약 {pack_report['used_tokens']}/"
+              f"{pack_report['budget_tokens']} 토큰 (요약 포함 {len(pack_report['trimmed'])}개)")
+        for url in pack_report['dropped']:
+            print(f"토큰 예산 초과로 제외된 기사: {url}")
+
+        # 프롬프트에서 빠진 기사와 같은 군집의 중복 기사는 게시 후에도 색인에 기록하지 않음
+        dropped_urls = {
+            fetched_urls[member]
+            for index in pack_report['dropped_indices']
+            for member in dedup_stats['clusters_of_kept'][index]
+        }
+        if dropped_urls and seen_index is not None:
+            seen_index.stage(article for article in seen_index.pending if article['url'] not in dropped_urls)
+        if checkpoint and (dropped_urls or any(article.get('dropped') for article in saved_articles or [])):
+            checkpoint.save('articles', _checkpoint_articles(all_urls, all_texts, dropped_urls))
 
         fetched_articles_text = "\n\n---\n\n".join(fetched_articles_texts)
         print("뉴스 기사 내용 가져오기 완료!")
 
+    except NoNewArticles:
+        raise
     except requests.exceptions.RequestException as e:
         print(f"네이버 부동산 뉴스 API 호출 중 오류 발생: {e}")
         return None
@@ -300,145 +330,417 @@ def generate_post_with_gemini(api_key):
         print(f"웹 콘텐츠를 가져오는 중 오류 발생: {e}")
         return None
 
+    return fetched_articles_text
+
+
+def _checkpoint_articles(urls, texts, dropped_urls=()):
+    """'articles' 단계에 저장할 기사 목록을 만듭니다. 프롬프트에서 빠진 기사는 dropped로 표시합니다."""
+    articles = []
+    for url, text in zip(urls, texts):
+        article = {'url': url, 'text': text}
+        if url in dropped_urls:
+            article['dropped'] = True
+        articles.append(article)
+    return articles
+
+
+def _filter_new_articles(seen_index, texts, urls, fingerprints):
+    """최근 게시한 기사와 내용이 거의 같은 기사를 빼고 (본문 목록, URL 목록, 지문 목록)을 반환합니다.
+
+    게시에 성공하면 제외한 기사까지 모두 기록하도록 seen_index에 올려 둡니다. (프롬프트에서 빠진 기사는 나중에 뺍니다.)
+    """
+    seen_index.stage(
+        {'url': url, 'text': text, 'fingerprint': fingerprint}
+        for url, text, fingerprint in zip(urls, texts, fingerprints)
+    )
+    with span('seen_filter') as span_attrs:
+        novel = seen_index.novel_indices(
+            texts,
+            threshold=int(os.environ.get("SEEN_CONTENT_THRESHOLD", "3")),
+            since_seconds=float(os.environ.get("SEEN_CONTENT_WINDOW", str(3 * 24 * 3600))),
+            fingerprints=fingerprints,
+        )
+        span_attrs.update(new_urls=len(urls), novel=len(novel))
+    print(f"증분 모드: 새 URL {len(urls)}개 중 새로운 내용 {len(novel)}개")
+
+    min_new = int(os.environ.get("INCREMENTAL_MIN_NEW_ARTICLES", "3"))
+    if len(novel) < min_new:
+        count('incremental_skips')
+        raise NoNewArticles(f"마지막 게시 이후 새 기사가 {len(novel)}개로 기준({min_new}개)보다 적습니다.")
+    return [texts[index] for index in novel], [urls[index] for index in novel], [fingerprints[index] for index in novel]
+
+
+def _fetch_article_texts(today_date, days, seen_index=None, http_session=None, fetch_policy=None):
+    """뉴스 목록을 순회하며 기사 본문을 수집합니다. (본문 목록, URL 목록)을 반환하고, 수집한 본문이 없으면 None을 반환합니다.
+
+    seen_index가 주어지면 이미 게시에 사용한 URL은 건너뛰고, 그런 URL이 한 페이지 분량 연속되면 목록 순회를 멈춥니다.
+    """
+    from article_fetcher import DEFAULT_TIMEOUT, create_http_session, iter_fetch_articles
+
+    # 네이버 부동산 뉴스 API 호출 (세션과 수집 정책이 주어지지 않았을 때만 이번 실행용으로 만들고 닫음)
+    session = http_session if http_session is not None else create_http_session()
+    policy = fetch_policy
+    try:
+        news_items = iter_news_items(
+            session, today_date, days=days, timeout=DEFAULT_TIMEOUT,
+            max_pages=int(os.environ.get("NEWS_MAX_PAGES", str(DEFAULT_MAX_PAGES))) or None,
+            api_url=os.environ.get("NAVER_NEWS_API_URL"),
+        )
+
+        # linkUrl만 추출하여 순서대로 전달
+        link_urls = iter_news_link_urls(
+            news_items,
+            max_articles=int(os.environ.get("NEWS_MAX_ARTICLES", "0")),
+            skip=seen_index.has_url if seen_index is not None else None,
+            stop_after_skipped=30,
+        )
+
+        # 공유 세션과 스레드 풀로 기사 내용을 동시에 가져오기 (디스크 캐시 사용)
+        article_cache = ArticleCache(
+            os.environ.get("ARTICLE_CACHE_DIR", os.path.join(".cache", "articles")),
+            max_age=float(os.environ.get("ARTICLE_CACHE_MAX_AGE", str(7 * 24 * 3600))),
+            max_bytes=int(os.environ.get("ARTICLE_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+        )
+        if policy is None:
+            policy = default_fetch_policy()
+        fetch_results = iter_fetch_articles(
+            link_urls,
+            session=session,
+            max_workers=int(os.environ.get("ARTICLE_FETCH_WORKERS", "8")),
+            per_host=int(os.environ.get("ARTICLE_FETCH_PER_HOST", "4")),
+            deadline=float(os.environ.get("ARTICLE_FETCH_DEADLINE", "60")),
+            extract=_extract_response_text,
+            cache=article_cache,
+            policy=policy,
+        )
+
+        fetched_articles_texts = []
+        fetched_urls = []
+        fetched_count = 0
+        with span('fetch_articles') as span_attrs:
+            for result in fetch_results:
+                if result['error']:
+                    print(f"기사 내용 로딩 중 오류 발생 (URL: {result['url']}, {result['elapsed']:.2f}초): {result['error']}")
+                elif result['text']:
+                    print(f"기사 가져오기 완료 ({result['elapsed']:.2f}초): {result['url']}")
+                    fetched_articles_texts.append(result['text'])
+                    fetched_urls.append(result['url'])
+                else:
+                    print(f"기사 본문을 찾을 수 없습니다: {result['url']}")
+                fetched_count += 1
+            span_attrs.update(articles=fetched_count, extracted=len(fetched_articles_texts),
+                              cache=dict(article_cache.stats))
+
+        if not fetched_count:
+            if seen_index is not None:
+                raise NoNewArticles("마지막 게시 이후 새 기사가 없습니다.")
+            print("가져온 뉴스 기사가 없습니다.")
+            return None
+
+        print(f"{fetched_count}개의 뉴스 기사 내용을 가져왔습니다.")
+        print(article_cache.summary())
+        article_cache.prune()
+
+        if not fetched_articles_texts:
+            print("모든 뉴스 기사의 내용을 가져오는데 실패했습니다.")
+            return None
+
+        return fetched_articles_texts, fetched_urls
+    finally:
+        if fetch_policy is None and policy is not None:
+            policy.close()
+        if http_session is None:
+            session.close()
 
-    # 개선된 프롬프트 생성
-    prompt = create_analysis_prompt(today_date, fetched_articles_text)
 
+def default_fetch_policy():
+    """호스트별 적응형 타임아웃, 재시도, 회로 차단기, (선택) 헤지 요청으로 느린 호스트의 영향을 제한하는 수집 정책을 만듭니다."""
+    from article_fetcher import DEFAULT_TIMEOUT
+    from fetch_policy import FetchPolicy
 
+    return FetchPolicy(
+        DEFAULT_TIMEOUT,
+        retries=int(os.environ.get("ARTICLE_FETCH_RETRIES", "2")),
+        failure_threshold=int(os.environ.get("ARTICLE_FETCH_BREAKER_FAILURES", "5")),
+        hedge=os.environ.get("ARTICLE_FETCH_HEDGE", "0") == "1",
+        hedge_after=float(os.environ.get("ARTICLE_FETCH_HEDGE_AFTER", "1.0")),
+    )
+
+
+def _extract_response_text(article_response):
+    """기사 응답에서 본문을 추출합니다. 기사 수집 스레드에서 호출됩니다."""
+    from article_extractor import charset_from_content_type, extract_article_text
+
+    with profile_section('extract'):
+        text = extract_article_text(
+            article_response.content,
+            encoding=charset_from_content_type(article_response.headers.get('Content-Type')),
+        )
+    count('articles_parsed')
+    return text
+
+
+# --- Gemini 콘텐츠 생성 함수 ---
+def _chunk_text(chunk):
+    """스트리밍 청크의 텍스트를 반환합니다. 후보나 내용 없이 종료 사유·사용량만 담긴 청크는 빈 문자열로 봅니다."""
     try:
-        response = model.generate_content(prompt)
-        print("Gemini 블로그 글 생성 완료!")
-        print("\n--- 생성된 블로그 글 내용 ---\n")
-        print(response.text)
-        print("\n-------------------------------\n")
-        return response.text
+        if not chunk.parts:
+            return ''
+        return chunk.text or ''
+    except (AttributeError, ValueError):
+        # chunk.parts/chunk.text는 후보가 비어 있거나 여러 개이면 ValueError를 발생시킴
+        return ''
+
+
+@traced('gemini')
+def generate_content_with_gemini(model, prompt, builder=None, metrics=None, echo=True):
+    """프롬프트로 Gemini 응답을 생성합니다. 실패하면 None을 반환합니다.
+
+    builder와 metrics는 generate_post_with_gemini()와 같고, echo가 False이면 생성된 글을 출력하지 않습니다.
+    """
+    if metrics is None:
+        metrics = {}
+
+    try:
+        started = time.perf_counter()
+        if builder is None:
+            response = model.generate_content(prompt)
+            text = response.text
+            metrics['ttfb'] = metrics['generation_time'] = time.perf_counter() - started
+            print("Gemini 블로그 글 생성 완료!")
+            if echo:
+                print("\n--- 생성된 블로그 글 내용 ---\n")
+                print(text)
+        else:
+            # 스트리밍 모드: 청크가 도착하는 즉시 HTML로 변환
+            if echo:
+                print("\n--- 생성된 블로그 글 내용 (스트리밍) ---\n")
+            chunks = []
+            for chunk in model.generate_content(prompt, stream=True):
+                if not chunks:
+                    metrics['ttfb'] = time.perf_counter() - started
+                chunk_text = _chunk_text(chunk)
+                chunks.append(chunk_text)
+                builder.feed(chunk_text)
+                if echo:
+                    print(chunk_text, end='', flush=True)
+            text = ''.join(chunks)
+            metrics['generation_time'] = time.perf_counter() - started
+            print("\nGemini 블로그 글 생성 완료!")
+        if echo:
+            print("\n-------------------------------\n")
+        print(f"Gemini 응답 시간: 첫 응답 {metrics['ttfb']:.2f}초, 전체 {metrics['generation_time']:.2f}초")
+        annotate(ttfb=round(metrics['ttfb'], 6), response_chars=len(text))
+        return text
     except Exception as e:
         print(f"Gemini API 요청 중 오류 발생: {e}")
         return None
 
 
-def post_to_tistory_requests(blog_name, tistory_id, tistory_pw, content):
-    """Requests 라이브러리를 사용하여 Tistory 블로그에 글을 포스팅합니다."""
-    print("Requests를 통해 Tistory 블로그 포스팅을 시작합니다...")
-
-    # Gemini 결과에서 ```html 코드 블록 제거
-    if content.strip().startswith("```html"):
-        content = content.strip()[7:].strip()
-    if content.strip().endswith("```"):
-        content = content.strip()[:-3].strip()
-
-    # <body> 와 </body> 태그 제거
-    content = content.replace("<body>", "").replace("</body>", "").strip()
-
-    # Selenium을 사용하여 로그인하고 쿠키를 가져오는 함수
-    def get_tistory_cookies_with_selenium(tistory_id, tistory_pw):
-        from selenium import webdriver
-        from selenium.webdriver.chrome.service import Service
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        import os
-
-        print("Selenium을 사용하여 로그인 쿠키를 획득합니다...")
-
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
+# --- 응답 형식 검사 함수 ---
+@traced('validate')
+def validate_response(model, content, today_date, limiter=None):
+    """Gemini 응답이 create_analysis_prompt()의 형식 요구사항을 지키는지 검사하고, 어긋난 부분만 고칩니다.
+
+    전체를 다시 생성하지 않고 제목, 태그, 빠진 시장 전망 섹션, 깨진 표, 모자란 분량의 섹션만 작은 프롬프트로 다시 요청합니다.
+    (검사/보정된 응답, 보정 여부)를 반환합니다. OUTPUT_VALIDATE=0이면 검사하지 않습니다.
+    """
+    if os.environ.get("OUTPUT_VALIDATE", "1") == "0":
+        return content, False
+
+    content, report = repair_post(model, content, today_date,
+                                  min_chars=int(os.environ.get("OUTPUT_MIN_CHARS", "2800")), limiter=limiter)
+    annotate(issues=report['issues'], remaining=report['remaining'])
+    if not report['issues']:
+        print("응답 형식 검사 통과")
+        return content, False
+
+    print(f"응답 형식 검사 실패 항목: {', '.join(report['issues'])} "
+          f"(보정 후 남은 항목: {', '.join(report['remaining']) or '없음'})")
+    return content, True
+
+
+# --- Selenium 로그인 함수 ---
+@traced('selenium_login')
+def get_tistory_cookies_with_selenium(tistory_id, tistory_pw):
+    """Selenium을 사용하여 로그인하고 쿠키를 가져옵니다."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    print("Selenium을 사용하여 로그인 쿠키를 획득합니다...")
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    
+    if os.environ.get('CI'): # Check if running in CI environment (e.g., GitHub Actions)
+        service = Service() # Let Selenium find chromedriver in PATH
+    else:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        chromedriver_path = os.path.join(script_dir, "../../chromedriver")
+        service = Service(executable_path=chromedriver_path)
         
-        if os.environ.get('CI'): # Check if running in CI environment (e.g., GitHub Actions)
-            service = Service() # Let Selenium find chromedriver in PATH
-        else:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            chromedriver_path = os.path.join(script_dir, "../../chromedriver")
-            service = Service(executable_path=chromedriver_path)
-            
-        driver = webdriver.Chrome(service=service, options=options)
+    driver = webdriver.Chrome(service=service, options=options)
 
-        try:
-            driver.get("https://accounts.kakao.com/login/?continue=https%3A%2F%2Fkauth.kakao.com%2Foauth%2Fauthorize%3Fclient_id%3D3e6ddd834b023f24221217e370daed18%26state%3DaHR0cHM6Ly9ra2Vuc3UudGlzdG9yeS5jb20vbWFuYWdlL25ld3Bvc3Qv%26prompt%3Dselect_account%26redirect_uri%3Dhttps%253A%252F%252Fwww.tistory.com%252Fauth%252Fkakao%252Fredirect%26response_type%3Dcode%26auth_tran_id%3Ddvy6kpj4uxg3e6ddd834b023f24221217e370daed18meh80vuu%26ka%3Dsdk%252F1.43.6%2520os%252Fjavascript%2520sdk_type%252Fjavascript%2520lang%252Fko-KR%2520device%252FMacIntel%2520origin%252Fhttps%25253A%25252F%25252Fwww.tistory.com%26is_popup%3Dfalse%26through_account%3Dtrue#login")
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='loginId']"))
-            )
+    try:
+        driver.get("https://accounts.kakao.com/login/?continue=https%3A%2F%2Fkauth.kakao.com%2Foauth%2Fauthorize%3Fclient_id%3D3e6ddd834b023f24221217e370daed18%26state%3DaHR0cHM6Ly9ra2Vuc3UudGlzdG9yeS5jb20vbWFuYWdlL25ld3Bvc3Qv%26prompt%3Dselect_account%26redirect_uri%3Dhttps%253A%252F%252Fwww.tistory.com%252Fauth%252Fkakao%252Fredirect%26response_type%3Dcode%26auth_tran_id%3Ddvy6kpj4uxg3e6ddd834b023f24221217e370daed18meh80vuu%26ka%3Dsdk%252F1.43.6%2520os%252Fjavascript%2520sdk_type%252Fjavascript%2520lang%252Fko-KR%2520device%252FMacIntel%2520origin%252Fhttps%25253A%25252F%25252Fwww.tistory.com%26is_popup%3Dfalse%26through_account%3Dtrue#login")
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='loginId']"))
+        )
 
-            username_field = driver.find_element(By.CSS_SELECTOR, "input[name='loginId']")
-            password_field = driver.find_element(By.CSS_SELECTOR, "input[name='password']")
-            username_field.send_keys(tistory_id)
-            password_field.send_keys(tistory_pw)
+        username_field = driver.find_element(By.CSS_SELECTOR, "input[name='loginId']")
+        password_field = driver.find_element(By.CSS_SELECTOR, "input[name='password']")
+        username_field.send_keys(tistory_id)
+        password_field.send_keys(tistory_pw)
 
-            login_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            login_button.click()
+        login_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
+        login_button.click()
 
-            WebDriverWait(driver, 10).until(
-                EC.url_contains("tistory.com/manage")
-            )
-            print("Selenium 로그인 성공!")
+        WebDriverWait(driver, 10).until(
+            EC.url_contains("tistory.com/manage")
+        )
+        print("Selenium 로그인 성공!")
 
-            cookies = driver.get_cookies()
-            tistory_cookie_str = ""
-            for cookie in cookies:
-                tistory_cookie_str += f"{cookie['name']}={cookie['value']}; "
-            tistory_cookie_str = tistory_cookie_str.strip()
+        cookies = driver.get_cookies()
+        tistory_cookie_str = ""
+        for cookie in cookies:
+            tistory_cookie_str += f"{cookie['name']}={cookie['value']}; "
+        tistory_cookie_str = tistory_cookie_str.strip()
 
-            return tistory_cookie_str
+        return tistory_cookie_str
 
-        except Exception as e:
-            screenshot_path = "selenium_error.png"
-            driver.save_screenshot(screenshot_path)
-            print(f"Selenium 로그인 중 오류 발생: {e}")
-            print(f"오류 발생 시 스크린샷 저장됨: {screenshot_path}")
-            return None
-        finally:
-            driver.quit()
+    except Exception as e:
+        screenshot_path = "selenium_error.png"
+        driver.save_screenshot(screenshot_path)
+        print(f"Selenium 로그인 중 오류 발생: {e}")
+        print(f"오류 발생 시 스크린샷 저장됨: {screenshot_path}")
+        return None
+    finally:
+        driver.quit()
+
+
+def default_summarizer(model):
+    """GEMINI_MAP_REDUCE=1이면 기사 묶음 요약기를 만들고, 아니면 None을 반환합니다.
+
+    요약은 SUMMARY_STORE_PATH 경로(기본값: .cache/summaries.sqlite3)의 요약 저장소에
+    기사 지문, 모델 이름, 요약 프롬프트 버전별로 저장됩니다.
+    """
+    if os.environ.get("GEMINI_MAP_REDUCE", "0") != "1":
+        return None
+    from news_summarizer import MapReduceSummarizer
+    from summary_store import SummaryStore
+
+    store = SummaryStore(
+        os.environ.get("SUMMARY_STORE_PATH", os.path.join(".cache", "summaries.sqlite3")),
+        max_age=float(os.environ.get("SUMMARY_STORE_MAX_AGE", str(7 * 24 * 3600))),
+    )
+    max_workers = int(os.environ.get("GEMINI_MAP_WORKERS", "8"))
+    return MapReduceSummarizer(
+        model,
+        store=store,
+        # 동시 요약 수만큼은 간격 없이 보내고, 그 이후 호출은 분당 GEMINI_MAP_RPM회로 제한
+        limiter=RateLimiter(int(os.environ.get("GEMINI_MAP_RPM", "60")), burst=max_workers),
+        max_workers=max_workers,
+        group_tokens=int(os.environ.get("GEMINI_MAP_GROUP_TOKENS", "8000")),
+        model_name=GEMINI_MODEL_NAME,
+    )
+
+
+def open_seen_index():
+    """SEEN_INDEX_PATH 경로(기본값: .cache/seen_articles.sqlite3)의 기사 색인을 엽니다."""
+    return SeenArticleIndex(os.environ.get("SEEN_INDEX_PATH", os.path.join(".cache", "seen_articles.sqlite3")))
+
+
+def default_seen_index():
+    """NEWS_INCREMENTAL=1이면 SEEN_INDEX_PATH 경로(기본값: .cache/seen_articles.sqlite3)의 기사 색인을 열고, 아니면 None을 반환합니다."""
+    if os.environ.get("NEWS_INCREMENTAL", "0") != "1":
+        return None
+    seen_index = open_seen_index()
+    seen_index.prune(float(os.environ.get("SEEN_INDEX_MAX_AGE", str(180 * 24 * 3600))))
+    return seen_index
+
+
+def default_session_vault():
+    """TISTORY_SESSION_FILE 경로(기본값: .cache/tistory_session)의 세션 저장소를 만듭니다."""
+    return SessionVault(
+        os.environ.get("TISTORY_SESSION_FILE", os.path.join(".cache", "tistory_session")),
+        key=os.environ.get("TISTORY_SESSION_KEY"),
+    )
+
+
+@traced('publish')
+def post_to_tistory_requests(blog_name, tistory_id, tistory_pw, content, category=DEFAULT_CATEGORY_ID,
+                             tistory_cookie_str=None, vault=None, http_session=None):
+    """Requests 라이브러리를 사용하여 Tistory 블로그에 글을 포스팅합니다.
 
-    tistory_cookie_str = get_tistory_cookies_with_selenium(tistory_id, tistory_pw)
+    content는 Gemini가 생성한 원문 문자열이거나, prepare_post()/StreamingPostBuilder가 조립한 dict입니다.
+    tistory_cookie_str가 주어지면 저장된 세션 확인과 Selenium 로그인을 건너뛰고 그 쿠키를 사용합니다.
+    vault를 지정하지 않으면 TISTORY_SESSION_FILE 경로의 기본 세션 저장소를 사용합니다.
+    http_session이 주어지면 그 세션의 연결 풀로 요청합니다. 쿠키는 요청 헤더로만 보내므로 세션에 남지 않습니다.
+    """
+    import requests
+
+    print("Requests를 통해 Tistory 블로그 포스팅을 시작합니다...")
+
+    # 제목, 태그, 본문 HTML 분리 (스트리밍 중 이미 조립된 경우 그대로 사용)
+    with span('prepare_post'), profile_section('render'):
+        post = content if isinstance(content, dict) else prepare_post(content)
+    title = post['title']
+
+    # 저장된 세션이 유효하면 Selenium 로그인을 건너뜀
+    if vault is None:
+        vault = default_session_vault()
+    if not tistory_cookie_str:
+        with span('auth'):
+            tistory_cookie_str = get_session_cookie(
+                vault, blog_name, lambda: get_tistory_cookies_with_selenium(tistory_id, tistory_pw),
+                http_session=http_session,
+            )
     if not tistory_cookie_str:
         print("쿠키 획득 실패. 포스팅을 중단합니다.")
         return False, "Selenium 쿠키 획득 실패"
 
-    session = requests.Session()
-    for cookie_pair in tistory_cookie_str.split(';'):
-        if '=' in cookie_pair:
-            name, value = cookie_pair.split('=', 1)
-            session.cookies.set(name.strip(), value.strip())
-
-    post_api_url = f"https://{blog_name}.tistory.com/manage/post.json"
-
-    lines = content.split('\n')
-    title = lines[0].replace('# ', '').strip()
-    title = re.sub(r'<[^>]+>', '', title).strip()
-
-    extracted_tags = []
-    post_body_lines = []
-    tag_line_found = False
-
-    for i in range(len(lines) - 1, 0, -1):
-        line = lines[i].strip()
-        if not tag_line_found and '태그::' in line:
-            cleaned_line = re.sub(r'<[^>]+>', '', line)
-            tag_string = cleaned_line.split('::', 1)[-1]
-            tags = [tag.strip() for tag in tag_string.split(',') if tag.strip()]
-            extracted_tags.extend(tags)
-            tag_line_found = True
-        else:
-            post_body_lines.insert(0, lines[i])
+    session = http_session
+    if session is None:
+        session = requests.Session()
+        for cookie_pair in tistory_cookie_str.split(';'):
+            if '=' in cookie_pair:
+                name, value = cookie_pair.split('=', 1)
+                session.cookies.set(name.strip(), value.strip())
 
-    post_content = '\n'.join(post_body_lines).strip()
-    tistory_tags = ','.join(extracted_tags)
+    print("블로그 포스팅 API를 호출합니다.")
+    response = _post_json(session, blog_name, tistory_cookie_str, post, category)
+
+    if response.status_code == 200:
+        print("블로그 포스팅 성공!")
+        print(f"응답: {response.json()}")
+        return True, title
+    else:
+        if response.status_code in (401, 403):
+            # 세션이 거부된 경우 다음 실행에서 다시 로그인하도록 저장된 세션 삭제
+            vault.clear()
+        print(f"블로그 포스팅 실패! 상태 코드: {response.status_code}")
+        print(f"응답: {response.text}")
+        return False, f"포스팅 실패 (상태 코드: {response.status_code})"
 
-    title = remove_non_bmp_chars(title)
 
-    # HTML 콘텐츠를 개선된 스타일로 변환
-    html_content = convert_to_tistory_html(post_content)
+def _post_json(session, blog_name, cookie_str, post, category=DEFAULT_CATEGORY_ID):
+    """게시 payload로 Tistory 관리 API(/manage/post.json)를 한 번 호출하고 응답을 반환합니다."""
+    base_url = tistory_base_url(blog_name)
+    post_api_url = f"{base_url}/manage/post.json"
 
     payload = {
         "id": "0",
-        "title": title,
-        "content": html_content,
+        "title": post['title'],
+        "content": post['html'],
         "slogan": "",
         "visibility": 20,
-        "category": 1532685,
-        "tag": tistory_tags,
+        "category": category,
+        "tag": ','.join(post['tags']),
         "published": 1,
         "password": "",
         "uselessMarginForEntry": 1,
@@ -453,8 +755,8 @@ def post_to_tistory_requests(blog_name, tistory_id, tistory_pw, content):
     }
 
     headers = {
-        "Host": f"{blog_name}.tistory.com",
-        "Cookie": tistory_cookie_str,
+        "Host": urlsplit(base_url).netloc,
+        "Cookie": cookie_str,
         "Sec-Ch-Ua": "\"Chromium\";v=\"127\", \"Not)A;Brand\";v=\"99\"",
         "Accept": "application/json, text/plain, */*",
         "Sec-Ch-Ua-Platform": "\"Windows\"",
@@ -462,81 +764,918 @@ def post_to_tistory_requests(blog_name, tistory_id, tistory_pw, content):
         "Sec-Ch-Ua-Mobile": "?0",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.6533.100 Safari/537.36",
         "Content-Type": "application/json;charset=UTF-8",
-        "Origin": f"https://{blog_name}.tistory.com",
+        "Origin": base_url,
         "Sec-Fetch-Site": "same-origin",
         "Sec-Fetch-Mode": "cors",
         "Sec-Fetch-Dest": "empty",
-        "Referer": f"https://{blog_name}.tistory.com/manage/newpost/?type=post&returnURL=%2Fmanage%2Fposts%2F",
+        "Referer": f"{base_url}/manage/newpost/?type=post&returnURL=%2Fmanage%2Fposts%2F",
         "Accept-Encoding": "gzip, deflate, br",
         "Priority": "u=1, i"
     }
 
-    print("블로그 포스팅 API를 호출합니다.")
-    response = session.post(post_api_url, headers=headers, data=json.dumps(payload))
+    with span('post_json') as span_attrs:
+        response = session.post(post_api_url, headers=headers, data=json.dumps(payload), timeout=(3.05, 30))
+        span_attrs['status_code'] = response.status_code
+    return response
 
-    if response.status_code == 200:
-        print("블로그 포스팅 성공!")
-        print(f"응답: {response.json()}")
-        return True, title
+
+# --- 게시 대기열(outbox) 함수 ---
+def _entry_published_at(entry):
+    """글 목록 항목의 게시 시각('published', 예: '2025-01-01 08:00:00', KST)을 timestamp로 바꿉니다. 없으면 None."""
+    try:
+        published = datetime.fromisoformat(str(entry['published']).replace('.', '-'))
+    except (KeyError, ValueError):
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=ZoneInfo("Asia/Seoul"))
+    return published.timestamp()
+
+
+def find_published_post(blog_name, title, key, cookie_str, http_session=None, max_candidates=10, sent_after=None):
+    """게시 대기열 키 key의 글이 이미 게시되었는지 찾아 주소를 반환합니다.
+
+    관리 화면의 글 목록(/manage/posts.json)에서 제목으로 후보를 좁힌 뒤 최근 글부터 max_candidates개까지
+    글 페이지를 받아 표식(publish_marker)을 확인합니다. 편집기나 필터가 표식을 지워 어느 글에서도 찾지 못하면,
+    같은 제목으로 sent_after(timestamp, 항목을 대기열에 넣은 시각) 이후에 게시된 가장 최근 글을 게시된 글로 봅니다.
+    찾지 못하면 None을 반환하고, 목록이나 글 페이지를 확인할 수 없으면 RetryablePublishError를 발생시킵니다.
+    """
+    import requests
+
+    client = http_session if http_session is not None else requests
+    base_url = tistory_base_url(blog_name)
+    response = client.get(
+        f"{base_url}/manage/posts.json",
+        params={'category': '-3', 'page': 1, 'searchKeyword': title, 'searchType': 'title', 'visibility': 'all'},
+        headers={"Cookie": cookie_str, "Accept": "application/json, text/plain, */*",
+                 "Referer": f"{base_url}/manage/posts/"},
+        allow_redirects=False,
+        timeout=(3.05, 10),
+    )
+    if response.status_code != 200:
+        raise RetryablePublishError(f"글 목록 조회 실패 (상태 코드: {response.status_code})")
+    normalized = ' '.join(title.split())
+    marker = publish_marker(key)
+    candidates = [entry for entry in response.json().get('items') or []
+                  if ' '.join(str(entry.get('title', '')).split()) == normalized and entry.get('permalink')]
+    for entry in candidates[:max_candidates]:
+        page = client.get(urljoin(base_url + '/', entry['permalink']), headers={"Cookie": cookie_str},
+                          timeout=(3.05, 10))
+        if page.status_code != 200:
+            raise RetryablePublishError(f"글 페이지 확인 실패 (상태 코드: {page.status_code})")
+        if marker in page.text:
+            return entry['permalink']
+    if sent_after is not None:
+        for entry in candidates:
+            published_at = _entry_published_at(entry)
+            if published_at is not None and published_at >= sent_after:
+                count('outbox_title_matches')
+                return entry['permalink']
+    return None
+
+
+class TistoryOutboxSender:
+    """게시 대기열 항목을 Tistory에 보내는 send()와, 이미 게시되었는지 확인하는 find_existing()을 제공합니다.
+
+    블로그별 쿠키를 메모리에 두고 재사용합니다. auth(blog_name)가 주어지면 쿠키를 그 함수에서 받고,
+    세션이 거부되면(401/403) on_auth_failure(blog_name)를 호출합니다. 주어지지 않으면 저장된 세션 확인과
+    Selenium 로그인으로 쿠키를 받고, 세션이 거부되면 저장된 세션을 지웁니다.
+    게시가 확인된 항목의 기사는 record_published()로 seen_index(주어지지 않으면 SEEN_INDEX_PATH의 색인)에 기록합니다.
+    """
+
+    def __init__(self, tistory_id, tistory_pw, vault=None, http_session=None, auth=None, on_auth_failure=None,
+                 seen_index=None):
+        self.tistory_id = tistory_id
+        self.tistory_pw = tistory_pw
+        self.vault = vault if vault is not None else default_session_vault()
+        self.http_session = http_session
+        self.auth = auth
+        self.on_auth_failure = on_auth_failure
+        self.seen_index = seen_index
+        self._lock = threading.Lock()
+        self._cookies = {}
+
+    def set_cookie(self, blog_name, cookie_str):
+        with self._lock:
+            self._cookies[blog_name] = cookie_str
+
+    def cookie(self, blog_name):
+        if self.auth is not None:
+            return self.auth(blog_name)
+        with self._lock:
+            if not self._cookies.get(blog_name):
+                self._cookies[blog_name] = get_session_cookie(
+                    self.vault, blog_name, lambda: get_tistory_cookies_with_selenium(self.tistory_id, self.tistory_pw),
+                    http_session=self.http_session,
+                )
+            return self._cookies[blog_name]
+
+    def invalidate(self, blog_name):
+        with self._lock:
+            self._cookies.pop(blog_name, None)
+        if self.on_auth_failure is not None:
+            self.on_auth_failure(blog_name)
+        else:
+            # 다음 시도에서 다시 로그인하도록 저장된 세션 삭제
+            self.vault.clear()
+
+    def send(self, item):
+        import requests
+
+        cookie_str = self.cookie(item['blog'])
+        if not cookie_str:
+            raise RetryablePublishError("쿠키 획득 실패")
+        session = self.http_session if self.http_session is not None else requests
+        # 응답을 받지 못해도 게시 여부를 확인할 수 있도록 본문에 대기열 키 표식을 넣음
+        post = dict(item['post'], html=f"{item['post']['html']}\n{publish_marker(item['key'])}")
+        response = _post_json(session, item['blog'], cookie_str, post,
+                              item['options'].get('category', DEFAULT_CATEGORY_ID))
+        status_code = response.status_code
+        if status_code == 200:
+            print(f"[{item['blog']}] 블로그 포스팅 성공! {item['title']}")
+            try:
+                return response.json().get('entryUrl') or item['title']
+            except ValueError:
+                return item['title']
+        if status_code in (401, 403):
+            self.invalidate(item['blog'])
+            raise RetryablePublishError(f"세션이 거부되었습니다 (상태 코드: {status_code})")
+        if status_code == 429 or status_code >= 500:
+            raise RetryablePublishError(f"포스팅 실패 (상태 코드: {status_code})")
+        raise PublishRejected(f"포스팅 실패 (상태 코드: {status_code}): {response.text[:200]}")
+
+    def find_existing(self, item):
+        cookie_str = self.cookie(item['blog'])
+        if not cookie_str:
+            raise RetryablePublishError("쿠키 획득 실패")
+        # 게시 시각은 분 단위로만 보이는 경우가 있으므로 대기열에 넣은 시각보다 1분 앞까지 허용
+        return find_published_post(item['blog'], item['title'], item['key'], cookie_str,
+                                   http_session=self.http_session, sent_after=item['created_at'] - 60)
+
+    def record_published(self, item):
+        """게시된 항목에 저장해 둔 기사를 기사 색인에 기록합니다. 다음 증분 실행이 같은 기사로 다시 글을 쓰지 않게 합니다."""
+        if not item['seen_articles']:
+            return
+        seen_index = self.seen_index if self.seen_index is not None else open_seen_index()
+        try:
+            recorded = seen_index.record(item['seen_articles'])
+        finally:
+            if seen_index is not self.seen_index:
+                seen_index.close()
+        print(f"[{item['blog']}] 게시한 기사 {recorded}개를 색인에 기록했습니다.")
+
+
+def default_outbox():
+    """PUBLISH_OUTBOX=0이 아니면 PUBLISH_OUTBOX_PATH 경로(기본값: .cache/publish_outbox.sqlite3)의 게시 대기열을 열고,
+    아니면 None을 반환합니다."""
+    if os.environ.get("PUBLISH_OUTBOX", "1") == "0":
+        return None
+    outbox = PublishOutbox(os.environ.get("PUBLISH_OUTBOX_PATH", os.path.join(".cache", "publish_outbox.sqlite3")))
+    outbox.prune(float(os.environ.get("PUBLISH_OUTBOX_MAX_AGE", str(30 * 24 * 3600))))
+    return outbox
+
+
+def default_outbox_publisher(outbox, sender):
+    """블로그별 분당 PUBLISH_RPM회(기본값: 6), 최대 PUBLISH_MAX_ATTEMPTS회(기본값: 8) 시도하는 게시 대기열 처리기를 만듭니다."""
+    return OutboxPublisher(
+        outbox,
+        sender.send,
+        find_existing=sender.find_existing,
+        on_published=sender.record_published,
+        per_minute=float(os.environ.get("PUBLISH_RPM", "6")),
+        burst=int(os.environ.get("PUBLISH_BURST", "1")),
+        max_attempts=int(os.environ.get("PUBLISH_MAX_ATTEMPTS", "8")),
+        backoff_base=float(os.environ.get("PUBLISH_BACKOFF_BASE", "30")),
+        backoff_cap=float(os.environ.get("PUBLISH_BACKOFF_CAP", "1800")),
+    )
+
+
+@traced('publish')
+def publish_via_outbox(publisher, blog_name, post, category=DEFAULT_CATEGORY_ID, drain=True, seen_articles=None,
+                       slot=None, topic=DEFAULT_TOPIC):
+    """게시 payload를 게시 대기열에 넣고 PUBLISH_OUTBOX_WAIT초(기본값: 120초) 동안 게시를 시도합니다.
+
+    같은 slot(기본값: 오늘 날짜)과 topic의 글은 재개나 게시 재실행으로 글을 다시 생성해도 한 번만 게시되며,
+    증분 모드에서는 글에 사용한 기사가 다르면 다른 글로 봅니다. (성공 여부, 제목 또는 오류 메시지)를 반환하며,
+    시간 안에 게시되지 않은 글은 대기열에 남아 다음 실행이나 데몬의 대기열 처리에서 게시됩니다.
+    seen_articles(글에 사용한 기사 목록)는 항목과 함께 저장되어, 나중에 게시되더라도 그때 기사 색인에 기록됩니다.
+    drain이 False이면 대기열에 넣기만 합니다.
+    """
+    outbox = publisher.outbox
+    key, created = outbox.enqueue(blog_name, post, slot or today_kst(), topic, {'category': category},
+                                  seen_articles=seen_articles)
+    if not created:
+        existing = outbox.get(key)
+        if existing['status'] == PUBLISHED:
+            print(f"같은 글이 이미 게시되어 다시 게시하지 않습니다: {existing['title']}")
+        else:
+            print(f"게시 대기열에 이미 있는 글입니다 ({existing['status']}): {existing['title']}")
+    if not drain:
+        return False, "게시 대기열에 보관했습니다. 다음 실행에서 게시합니다."
+
+    item = publisher.drain(keys=[key], timeout=float(os.environ.get("PUBLISH_OUTBOX_WAIT", "120")))[key]
+    annotate(key=key, status=item['status'], attempts=item['attempts'])
+    if item['status'] == PUBLISHED:
+        return True, item['title']
+    if item['status'] == FAILED:
+        return False, item['message']
+    count('outbox_pending')
+    return False, f"게시 대기 중 (시도 {item['attempts']}회, 마지막 오류: {item['message']}). 다음 실행에서 게시합니다."
+
+
+def publish_post(blog_name, tistory_id, tistory_pw, post, cookie_str=None, vault=None, http_session=None,
+                 publisher=None, seen_index=None, seen_articles=None, slot=None):
+    """게시 대기열(기본값)이나 post.json 직접 호출(PUBLISH_OUTBOX=0)로 글을 게시합니다.
+
+    publisher(OutboxPublisher)가 주어지면 그 대기열을 사용합니다. (성공 여부, 제목 또는 오류 메시지)를 반환합니다.
+    slot은 게시 대기열에서 같은 글을 식별하는 게시 시점입니다. (publish_via_outbox() 참고)
+    seen_articles(글에 사용한 기사 목록)는 글이 게시된 것이 확인되면 seen_index에 기록됩니다. 대기열을 거치면
+    이번 실행이 기다리는 동안 게시되지 않아도 나중에 대기열에서 게시될 때 기록됩니다.
+    """
+    if publisher is not None:
+        return publish_via_outbox(publisher, blog_name, post, drain=bool(cookie_str), seen_articles=seen_articles,
+                                  slot=slot)
+    outbox = default_outbox()
+    if outbox is None:
+        if not cookie_str:
+            print("쿠키 획득 실패. 포스팅을 중단합니다.")
+            return False, "Selenium 쿠키 획득 실패"
+        result = post_to_tistory_requests(blog_name, tistory_id, tistory_pw, post,
+                                          tistory_cookie_str=cookie_str, vault=vault, http_session=http_session)
+        if result[0] and seen_index is not None and seen_articles:
+            print(f"게시한 기사 {seen_index.record(seen_articles)}개를 색인에 기록했습니다.")
+        return result
+
+    sender = TistoryOutboxSender(tistory_id, tistory_pw, vault=vault, http_session=http_session,
+                                 seen_index=seen_index)
+    try:
+        if not cookie_str:
+            # 로그인에 실패해도 글을 잃지 않도록 대기열에 넣어 두고 다음 실행에서 게시
+            print("쿠키 획득 실패. 글을 게시 대기열에 보관합니다.")
+            return publish_via_outbox(default_outbox_publisher(outbox, sender), blog_name, post, drain=False,
+                                      seen_articles=seen_articles, slot=slot)
+        sender.set_cookie(blog_name, cookie_str)
+        return publish_via_outbox(default_outbox_publisher(outbox, sender), blog_name, post,
+                                  seen_articles=seen_articles, slot=slot)
+    finally:
+        outbox.close()
+
+
+# --- 단계 그래프 실행 함수 ---
+@traced('pipeline')
+def run_posting_pipeline(api_key, blog_name, tistory_id, tistory_pw, builder=None, checkpoint=None, seen_index=None,
+                         dry_run=False, model=None, auth=None, summarizer=None, http_session=None, fetch_policy=None,
+                         publisher=None, slot=None):
+    """로그인, 뉴스 수집, 프롬프트 작성, 글 생성, 형식 검사, 게시를 단계 그래프로 실행합니다.
+
+    Tistory 로그인(auth)은 뉴스 수집 및 Gemini 글 생성과 동시에 진행되고 게시 단계에서만 합류합니다.
+    checkpoint(RunCheckpoint)가 주어지면 기사 목록, 프롬프트, Gemini 원문 응답(draft), 형식 검사를 마친 응답(response),
+    게시 payload, 게시 결과를 단계마다 저장하고, 이미 저장된 단계는 다시 실행하지 않고 복원합니다. 게시에 성공한 실행은 다시 게시하지 않습니다.
+    seen_index(SeenArticleIndex)가 주어지면 새 기사만으로 글을 쓰고(부족하면 NoNewArticles 발생), 글이 게시된 것이
+    확인되면 이번 실행의 기사를 색인에 기록합니다. 게시 대기열에서 나중에 게시되면 그때 기록됩니다.
+    dry_run이면 로그인과 게시를 하지 않고 게시할 글의 요약만 출력하며, 게시 결과와 기사 색인도 기록하지 않습니다.
+    게시는 publish_post()와 같이 게시 대기열을 거치며, 같은 slot(기본값: 오늘 날짜, 데몬은 예약 시각)의 글은 한 번만
+    게시됩니다. slot은 체크포인트에 저장되어, 다른 날 재개해도 처음 실행한 slot을 사용합니다.
+    model, auth(쿠키 문자열을 반환하는 함수), summarizer, http_session, fetch_policy, publisher(OutboxPublisher)가
+    주어지면 실행마다 새로 만들지 않고 재사용합니다. (데몬 모드의 WarmState.pipeline_options() 참고)
+    글 생성에 실패하면 None을, 그렇지 않으면 게시 결과 (성공 여부, 제목 또는 오류 메시지)를 반환합니다.
+    단계에서 예외가 발생하면 그 예외를 다시 발생시킵니다.
+    """
+    today_date = datetime.now(ZoneInfo("Asia/Seoul")).strftime('%Y-%m-%d')
+    slot = (checkpoint.load('slot') if checkpoint else None) or slot or today_date
+    if checkpoint:
+        checkpoint.save('slot', slot)
+    vault = default_session_vault()
+    if model is None:
+        model = create_gemini_model(api_key)
+    if summarizer is None:
+        summarizer = default_summarizer(model)
+
+    published = checkpoint.load('publish') if checkpoint else None
+    if published and published['success']:
+        print(f"이미 게시된 실행입니다: {published['message']}")
+        return True, published['message']
+    streamed = []
+
+    def checkpointed(stage, compute):
+        """저장된 출력이 있으면 복원하고, 없으면 compute 결과를 저장하는 단계 함수를 만듭니다."""
+        def run(*args):
+            saved = checkpoint.load(stage) if checkpoint else None
+            if saved is not None:
+                print(f"체크포인트에서 '{stage}' 단계를 복원합니다.")
+                return saved
+            value = compute(*args)
+            if checkpoint and value is not None:
+                checkpoint.save(stage, value)
+            return value
+        return run
+
+    def authenticate():
+        if dry_run:
+            return None
+        with span('auth'):
+            if auth is not None:
+                return auth()
+            return get_session_cookie(vault, blog_name, lambda: get_tistory_cookies_with_selenium(tistory_id, tistory_pw),
+                                      http_session=http_session)
+
+    def fetch_news():
+        # 프롬프트가 이미 저장되어 있으면 기사 수집과 정리를 건너뜀
+        if checkpoint and checkpoint.load('prompt') is not None:
+            return None
+        return fetch_news_articles_text(today_date, checkpoint=checkpoint, seen_index=seen_index,
+                                        summarizer=summarizer, http_session=http_session, fetch_policy=fetch_policy)
+
+    def generate(prompt):
+        # 형식 검사를 마친 응답이 이미 저장되어 있으면 글 생성을 건너뜀
+        if not prompt or (checkpoint and checkpoint.load('response') is not None):
+            return None
+        streamed.append(builder is not None)
+        return generate_content_with_gemini(model, prompt, builder=builder)
+
+    def validate(content):
+        if not content:
+            return None
+        content, repaired = validate_response(model, content, today_date)
+        if repaired:
+            # 스트리밍으로 조립한 글은 보정 전 내용이므로, 보정된 응답을 새로 변환
+            streamed.clear()
+        return content
+
+    def render(content):
+        if not content:
+            return None
+        # 스트리밍으로 이미 조립된 경우 그대로 사용하고, 체크포인트에서 복원한 응답은 새로 변환
+        with span('prepare_post'), profile_section('render'):
+            return builder.close() if streamed and streamed[0] else prepare_post(content)
+
+    def publish(cookie_str, post):
+        if post is None:
+            return None
+        if dry_run:
+            print(f"[dry-run] 게시하지 않습니다: {describe_post(post)}")
+            return True, post['title']
+        # 글에 사용한 기사는 게시가 확인될 때(게시 대기열에서 나중에 게시되는 경우 포함) 색인에 기록됨
+        result = publish_post(blog_name, tistory_id, tistory_pw, post, cookie_str=cookie_str,
+                              vault=vault, http_session=http_session, publisher=publisher, seen_index=seen_index,
+                              seen_articles=published_articles(seen_index, checkpoint) if seen_index is not None else None,
+                              slot=slot)
+        if checkpoint:
+            checkpoint.save('publish', {'success': result[0], 'message': result[1]})
+        return result
+
+    from stage_graph import StageGraph
+
+    graph = StageGraph()
+    graph.add('auth', authenticate)
+    graph.add('fetch_news', fetch_news)
+    graph.add('build_prompt', checkpointed('prompt', lambda text: build_prompt(today_date, text) if text else None),
+              deps=('fetch_news',))
+    graph.add('generate', checkpointed('draft', generate), deps=('build_prompt',))
+    graph.add('validate', checkpointed('response', validate), deps=('generate',))
+    graph.add('render', checkpointed('post', render), deps=('validate',))
+    graph.add('publish', publish, deps=('auth', 'render'))
+    results = graph.run()
+
+    report = graph.report()
+    annotate(stages=report['stages'], critical_path=report['critical_path'])
+    print(f"임계 경로: {graph.format_critical_path()}")
+
+    if graph.errors:
+        raise next(iter(graph.errors.values()))
+    return results.get('publish')
+
+
+def published_articles(seen_index, checkpoint=None):
+    """게시가 확인되면 색인에 기록할 이번 글의 기사({'url', 'fingerprint'}) 목록을 꺼냅니다.
+
+    기사 수집을 건너뛰고 재개한 경우 체크포인트의 기사 목록 중 프롬프트에서 빠지지(dropped) 않은 기사를 사용합니다.
+    """
+    if not seen_index.pending and checkpoint:
+        seen_index.stage(article for article in checkpoint.load('articles') or [] if not article.get('dropped'))
+    return seen_index.take_pending()
+
+
+def describe_post(post):
+    """게시 payload의 제목, 태그 수, 본문 길이를 한 줄로 요약합니다."""
+    return f"{post['title']} (태그 {len(post['tags'])}개: {', '.join(post['tags'])}, 본문 HTML {len(post['html'])}자)"
+
+
+# --- 게시 단계 재실행 함수 ---
+@traced('replay_publish')
+def replay_publish(checkpoint, blog_name, tistory_id, tistory_pw, seen_index=None):
+    """저장된 게시 payload('post' 단계)로 게시 단계만 다시 실행하고 결과를 체크포인트에 기록합니다."""
+    post = checkpoint.load('post')
+    if post is None:
+        raise ValueError(f"실행 {checkpoint.run_id}에 저장된 게시 payload가 없습니다.")
+
+    print(f"실행 {checkpoint.run_id}의 게시 payload로 게시를 다시 시도합니다: {post['title']}")
+    seen_articles = published_articles(seen_index, checkpoint) if seen_index is not None else None
+    if os.environ.get("PUBLISH_OUTBOX", "1") == "0":
+        result = post_to_tistory_requests(blog_name, tistory_id, tistory_pw, post)
+        if result[0] and seen_articles:
+            print(f"게시한 기사 {seen_index.record(seen_articles)}개를 색인에 기록했습니다.")
     else:
-        print(f"블로그 포스팅 실패! 상태 코드: {response.status_code}")
-        print(f"응답: {response.text}")
-        return False, f"포스팅 실패 (상태 코드: {response.status_code})"
+        # 게시 대기열을 거치므로 이미 게시된 글은 다시 게시하지 않음
+        vault = default_session_vault()
+        cookie_str = get_session_cookie(vault, blog_name,
+                                        lambda: get_tistory_cookies_with_selenium(tistory_id, tistory_pw))
+        result = publish_post(blog_name, tistory_id, tistory_pw, post, cookie_str=cookie_str,
+                              vault=vault, seen_index=seen_index, seen_articles=seen_articles,
+                              slot=checkpoint.load('slot'))
+    checkpoint.save('publish', {'success': result[0], 'message': result[1]})
+    return result
 
 
-# --- 메인 실행 로직 ---
-if __name__ == "__main__":
-    # GitHub Actions의 Secrets에서 정보 가져오기
-    gemini_api_key = os.environ.get("GEMINI_API_KEY")
-    tistory_id = os.environ.get("TISTORY_ID")
-    tistory_pw = os.environ.get("TISTORY_PW")
-    tistory_blog_name = os.environ.get("TISTORY_BLOG_NAME")
-    sender_email = os.environ.get("SENDER_EMAIL")
-    sender_password = os.environ.get("SENDER_PASSWORD")
-    recipient_email = os.environ.get("RECIPIENT_EMAIL")
-
-    # 필수 환경변수 확인
-    required_vars = {
-        "GEMINI_API_KEY": gemini_api_key,
-        "TISTORY_ID": tistory_id,
-        "TISTORY_PW": tistory_pw,
-        "TISTORY_BLOG_NAME": tistory_blog_name,
-        "SENDER_EMAIL": sender_email,
-        "SENDER_PASSWORD": sender_password,
-        "RECIPIENT_EMAIL": recipient_email
-    }
+# --- 명령행 인터페이스 ---
+# 실행에 필요한 환경변수 (GitHub Actions의 Secrets)
+REQUIRED_ENV_VARS = (
+    "GEMINI_API_KEY", "TISTORY_ID", "TISTORY_PW", "TISTORY_BLOG_NAME",
+    "SENDER_EMAIL", "SENDER_PASSWORD", "RECIPIENT_EMAIL",
+)
+EMAIL_ENV_VARS = ("SENDER_EMAIL", "SENDER_PASSWORD", "RECIPIENT_EMAIL")
+
+
+def default_checkpoint_store():
+    """CHECKPOINT_DIR 경로(기본값: .cache/checkpoints)의 체크포인트 저장소를 만듭니다."""
+    return CheckpointStore(os.environ.get("CHECKPOINT_DIR", os.path.join(".cache", "checkpoints")))
+
+
+def prune_checkpoints(store):
+    """CHECKPOINT_MAX_AGE(초, 기본값: 7일)보다 오래된 실행과, CHECKPOINT_MAX_RUNS(기본값: 0, 제한 없음)개를 넘는
+    오래된 실행의 체크포인트를 정리합니다."""
+    store.prune(float(os.environ.get("CHECKPOINT_MAX_AGE", str(7 * 24 * 3600))),
+                keep=int(os.environ.get("CHECKPOINT_MAX_RUNS", "0")) or None)
 
-    missing_vars = [key for key, value in required_vars.items() if not value]
 
+def today_kst():
+    return datetime.now(ZoneInfo("Asia/Seoul")).strftime('%Y-%m-%d')
+
+
+def require_env(*names):
+    """환경변수 값을 이름별 dict로 반환합니다. 빠진 항목이 있으면 오류 메시지와 함께 종료합니다."""
+    values = {name: os.environ.get(name) for name in names}
+    missing = [name for name, value in values.items() if not value]
+    if missing:
+        raise SystemExit(f"오류: 다음 필수 환경변수가 설정되지 않았습니다: {', '.join(missing)}")
+    return values
+
+
+def result_email(publish_result):
+    """게시 결과 (성공 여부, 제목 또는 오류 메시지)로 알림 메일의 (제목, 본문)을 만듭니다. None은 글 생성 실패입니다."""
+    if not publish_result:
+        return "블로그 포스팅 실패: 글 생성 오류", "Gemini를 이용한 블로그 글 생성에 실패했습니다."
+    success, message = publish_result
+    if success:
+        return f"블로그 포스팅 성공: {message}", f"성공적으로 블로그에 글을 게시했습니다.\n\n제목: {message}"
+    return "블로그 포스팅 실패", f"블로그 글 게시에 실패했습니다.\n\n오류 메시지: {message}"
+
+
+def notify(subject, body, dry_run=False):
+    """알림 메일을 보냅니다. dry_run이면 보내지 않고 내용만 출력합니다."""
+    if dry_run:
+        print(f"[dry-run] 메일을 보내지 않습니다: {subject}\n{body}")
+        return True
+    env = {name: os.environ.get(name) for name in EMAIL_ENV_VARS}
+    if not all(env.values()):
+        print("메일 설정(SENDER_EMAIL, SENDER_PASSWORD, RECIPIENT_EMAIL)이 없어 알림을 보내지 않습니다.")
+        return False
+    return send_email(subject, body, env["SENDER_EMAIL"], env["SENDER_PASSWORD"], env["RECIPIENT_EMAIL"])
+
+
+def resolve_run_id(store, args, create=False):
+    """--run-id가 없으면 새 실행 ID(create=True) 또는 가장 최근 실행 ID를 사용합니다."""
+    run_id = getattr(args, 'run_id', None)
+    if run_id:
+        return run_id
+    if create:
+        return new_run_id()
+    run_id = store.latest_run_id(unfinished_only=False)
+    if run_id is None:
+        raise SystemExit("저장된 실행이 없습니다. 먼저 fetch 또는 run 명령을 실행하세요.")
+    return run_id
+
+
+def command_fetch(args, store):
+    """뉴스를 수집해 기사 목록과 프롬프트를 체크포인트에 저장합니다."""
+    run_id = resolve_run_id(store, args, create=True)
+    checkpoint = store.bind(run_id)
+    print(f"실행 ID: {run_id}")
+
+    # 요약 모드에서만 기사 요약에 Gemini가 필요함
+    model = None
+    if os.environ.get("GEMINI_MAP_REDUCE", "0") == "1":
+        model = create_gemini_model(require_env("GEMINI_API_KEY")["GEMINI_API_KEY"])
+    today_date = today_kst()
+    text = fetch_news_articles_text(today_date, checkpoint=checkpoint, seen_index=default_seen_index(),
+                                    summarizer=default_summarizer(model))
+    if not text:
+        return 1
+    checkpoint.save('prompt', build_prompt(today_date, text))
+    return 0
+
+
+def command_generate(args, store):
+    """저장된 프롬프트로 글을 생성해 'draft' 단계로, 형식을 검사한 응답을 'response' 단계로 저장합니다."""
+    checkpoint = store.bind(resolve_run_id(store, args))
+    prompt = checkpoint.load('prompt')
+    if prompt is None:
+        print(f"실행 {checkpoint.run_id}에 저장된 프롬프트가 없습니다. 먼저 fetch 명령을 실행하세요.")
+        return 1
+
+    model = create_gemini_model(require_env("GEMINI_API_KEY")["GEMINI_API_KEY"])
+    content = generate_content_with_gemini(model, prompt)
+    if not content:
+        return 1
+    checkpoint.save('draft', content)
+    content, _ = validate_response(model, content, today_kst())
+    checkpoint.save('response', content)
+    return 0
+
+
+def command_render(args, store):
+    """저장된 응답을 Tistory HTML로 변환해 'post' 단계로 저장합니다. 네트워크를 사용하지 않습니다."""
+    checkpoint = store.bind(resolve_run_id(store, args))
+    content = checkpoint.load('response')
+    if content is None:
+        print(f"실행 {checkpoint.run_id}에 저장된 응답이 없습니다. 먼저 generate 명령을 실행하세요.")
+        return 1
+
+    with span('prepare_post'), profile_section('render'):
+        post = prepare_post(content)
+    checkpoint.save('post', post)
+    print(f"실행 {checkpoint.run_id} 변환 완료: {describe_post(post)}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(post['html'])
+        print(f"본문 HTML 저장: {args.output}")
+    return 0
+
+
+def command_publish(args, store):
+    """저장된 게시 payload로 Tistory에 게시합니다. --dry-run이면 저장된 세션만 확인합니다."""
+    checkpoint = store.bind(resolve_run_id(store, args))
+    post = checkpoint.load('post')
+    if post is None:
+        print(f"실행 {checkpoint.run_id}에 저장된 게시 payload가 없습니다. 먼저 render 명령을 실행하세요.")
+        return 1
+
+    if getattr(args, 'dry_run', False):
+        blog_name = require_env("TISTORY_BLOG_NAME")["TISTORY_BLOG_NAME"]
+        cookie_str = default_session_vault().load()
+        valid = bool(cookie_str) and is_session_valid(blog_name, cookie_str)
+        print(f"[dry-run] 게시하지 않습니다: {tistory_base_url(blog_name)} ← {describe_post(post)}")
+        print(f"[dry-run] 저장된 세션: {'유효' if valid else '없음 또는 만료 (게시할 때 Selenium으로 로그인)'}")
+        return 0
+
+    env = require_env("TISTORY_BLOG_NAME", "TISTORY_ID", "TISTORY_PW")
+    success, message = replay_publish(checkpoint, env["TISTORY_BLOG_NAME"], env["TISTORY_ID"], env["TISTORY_PW"],
+                                      seen_index=default_seen_index())
+    print(f"게시 결과: {'성공' if success else '실패'} ({message})")
+    return 0 if success else 1
+
+
+def command_notify(args, store):
+    """저장된 게시 결과를 메일로 알립니다."""
+    checkpoint = store.bind(resolve_run_id(store, args))
+    published = checkpoint.load('publish')
+    if published is None:
+        print(f"실행 {checkpoint.run_id}에 저장된 게시 결과가 없습니다.")
+        return 1
+    subject, body = result_email((published['success'], published['message']))
+    return 0 if notify(subject, body, getattr(args, 'dry_run', False)) else 1
+
+
+def command_run(args, store):
+    """수집부터 알림까지 전체 과정을 실행합니다. 실패는 종료 코드 대신 알림 메일로 알립니다."""
+    dry_run = getattr(args, 'dry_run', False)
+    resume = getattr(args, 'resume', None)
+    replay_run_id = getattr(args, 'replay_publish', None)
+
+    # 필수 환경변수 확인 (dry-run은 게시와 메일 전송을 하지 않으므로 Gemini API 키만 필요)
+    required = ("GEMINI_API_KEY",) if dry_run else REQUIRED_ENV_VARS
+    missing_vars = [name for name in required if not os.environ.get(name)]
     if missing_vars:
         error_message = f"오류: 다음 필수 환경변수가 설정되지 않았습니다: {', '.join(missing_vars)}"
         print(error_message)
         # 이메일 알림 시도 (비밀번호가 없으면 실패할 수 있음)
-        if sender_email and sender_password and recipient_email:
-            send_email("블로그 포스팅 실패: 환경변수 누락", error_message, sender_email, sender_password, recipient_email)
-    else:
-        try:
-            # 1. 블로그 글 생성
-            blog_post_content = generate_post_with_gemini(gemini_api_key)
-
-            if blog_post_content:
-                # 2. 블로그 포스팅
-                success, message = post_to_tistory_requests(tistory_blog_name, tistory_id, tistory_pw, blog_post_content)
+        if not dry_run and all(os.environ.get(name) for name in EMAIL_ENV_VARS):
+            notify("블로그 포스팅 실패: 환경변수 누락", error_message)
+        return 0
 
-                if success:
-                    email_subject = f"블로그 포스팅 성공: {message}"
-                    email_body = f"성공적으로 블로그에 글을 게시했습니다.\n\n제목: {message}"
-                    send_email(email_subject, email_body, sender_email, sender_password, recipient_email)
+    gemini_api_key = os.environ.get("GEMINI_API_KEY")
+    tistory_id = os.environ.get("TISTORY_ID")
+    tistory_pw = os.environ.get("TISTORY_PW")
+    tistory_blog_name = os.environ.get("TISTORY_BLOG_NAME")
+    try:
+        # 단계별 출력은 실행 ID별 체크포인트로 저장되어 실패 후 재개에 사용됨
+        prune_checkpoints(store)
+        # 증분 모드(NEWS_INCREMENTAL=1)에서는 마지막 게시 이후의 새 기사만 사용
+        seen_index = default_seen_index()
+
+        if replay_run_id:
+            publish_result = replay_publish(store.bind(replay_run_id), tistory_blog_name, tistory_id, tistory_pw,
+                                            seen_index=seen_index)
+        else:
+            run_id = getattr(args, 'run_id', None) or new_run_id()
+            if resume:
+                run_id = store.latest_run_id() if resume == 'latest' else resume
+                if run_id is None:
+                    print("재개할 실행이 없어 새로 실행합니다.")
+                    run_id = new_run_id()
                 else:
-                    email_subject = "블로그 포스팅 실패"
-                    email_body = f"블로그 글 게시에 실패했습니다.\n\n오류 메시지: {message}"
-                    send_email(email_subject, email_body, sender_email, sender_password, recipient_email)
-            else:
-                error_message = "Gemini를 이용한 블로그 글 생성에 실패했습니다."
-                print(error_message)
-                send_email("블로그 포스팅 실패: 글 생성 오류", error_message, sender_email, sender_password, recipient_email)
-
-        except Exception as e:
-            error_message = f"스크립트 실행 중 예외 발생: {e}"
-            print(error_message)
-            send_email("블로그 포스팅 실패: 스크립트 오류", error_message, sender_email, sender_password, recipient_email)
\ No newline at end of file
+                    print(f"실행 {run_id}을(를) 재개합니다. 마지막 완료 단계: {store.last_stage(run_id)}")
+            print(f"실행 ID: {run_id}")
+
+            # 블로그 글 생성(기본: 스트리밍으로 받으면서 HTML 변환)과 Tistory 로그인을 동시에 진행한 뒤 게시
+            builder = StreamingPostBuilder() if os.environ.get("GEMINI_STREAM", "1") != "0" else None
+            publish_result = run_posting_pipeline(gemini_api_key, tistory_blog_name, tistory_id, tistory_pw,
+                                                  builder=builder, checkpoint=store.bind(run_id),
+                                                  seen_index=seen_index, dry_run=dry_run)
+
+        if not publish_result:
+            print("Gemini를 이용한 블로그 글 생성에 실패했습니다.")
+        notify(*result_email(publish_result), dry_run=dry_run)
+
+    except NoNewArticles as e:
+        # 다룰 새 소식이 없는 것은 실패가 아니므로 알림 메일을 보내지 않음
+        print(f"글 생성을 건너뜁니다: {e}")
+    except Exception as e:
+        error_message = f"스크립트 실행 중 예외 발생: {e}"
+        print(error_message)
+        notify("블로그 포스팅 실패: 스크립트 오류", error_message, dry_run=dry_run)
+    return 0
+
+
+
+# --- 데몬 모드 ---
+class WarmState:
+    """데몬 모드에서 예약 실행 사이에 유지하는 자원입니다.
+
+    Gemini 모델, HTTP 연결 풀, 호스트별 수집 정책(적응형 타임아웃, 회로 차단기), 기사 요약기, 기사 색인을 한 번만 만들고,
+    Tistory 세션은 SESSION_RECHECK_INTERVAL초(기본값: 900초)가 지나기 전까지 다시 확인하지 않고 메모리에서 재사용합니다.
+    게시 대기열이 켜져 있으면 start_publisher()로 실행 사이에도 재시도 대기 중인 글을 백그라운드에서 게시합니다.
+    """
+
+    def __init__(self, api_key, blog_name, tistory_id, tistory_pw):
+        from article_fetcher import create_http_session
+
+        self.blog_name = blog_name
+        self.tistory_id = tistory_id
+        self.tistory_pw = tistory_pw
+        self.model = create_gemini_model(api_key)
+        self.http_session = create_http_session()
+        self.fetch_policy = default_fetch_policy()
+        self.summarizer = default_summarizer(self.model)
+        self.seen_index = default_seen_index()
+        self.vault = default_session_vault()
+        self.session_recheck = float(os.environ.get("SESSION_RECHECK_INTERVAL", "900"))
+        self._lock = threading.Lock()
+        self._cookie = None
+        self._checked_at = 0.0
+        self.outbox = default_outbox()
+        self.publisher = None
+        if self.outbox is not None:
+            sender = TistoryOutboxSender(tistory_id, tistory_pw, vault=self.vault, http_session=self.http_session,
+                                         auth=lambda blog_name: self.authenticate(),
+                                         on_auth_failure=lambda blog_name: self.reject_session(),
+                                         seen_index=self.seen_index)
+            self.publisher = default_outbox_publisher(self.outbox, sender)
+
+    def authenticate(self):
+        """최근에 확인한 세션이 있으면 그대로 반환하고, 아니면 저장된 세션을 확인하거나 다시 로그인합니다."""
+        with self._lock:
+            if self._cookie and time.monotonic() - self._checked_at < self.session_recheck:
+                count('warm_session_reuses')
+                return self._cookie
+            self._cookie = get_session_cookie(
+                self.vault, self.blog_name,
+                lambda: get_tistory_cookies_with_selenium(self.tistory_id, self.tistory_pw),
+                http_session=self.http_session,
+            )
+            self._checked_at = time.monotonic()
+            return self._cookie
+
+    def invalidate_session(self):
+        with self._lock:
+            self._cookie = None
+
+    def reject_session(self):
+        """Tistory가 세션을 거부했을 때: 메모리와 저장된 세션을 모두 지워 다음 인증에서 다시 로그인하게 합니다."""
+        self.invalidate_session()
+        self.vault.clear()
+
+    def start_publisher(self):
+        if self.publisher is not None:
+            self.publisher.start()
+
+    def pipeline_options(self):
+        """run_posting_pipeline()에 넘길 재사용 자원 인자를 반환합니다."""
+        return {
+            'model': self.model,
+            'auth': self.authenticate,
+            'summarizer': self.summarizer,
+            'http_session': self.http_session,
+            'fetch_policy': self.fetch_policy,
+            'seen_index': self.seen_index,
+            'publisher': self.publisher,
+        }
+
+    def close(self):
+        if self.publisher is not None:
+            self.publisher.stop()
+            self.outbox.close()
+        self.fetch_policy.close()
+        self.http_session.close()
+        if self.seen_index is not None:
+            self.seen_index.close()
+
+
+def run_scheduled_post(warm, store, dry_run=False, scheduled_at=None):
+    """데몬의 예약 실행 한 번: 새 실행 ID로 전체 과정을 실행하고 결과를 알린 뒤 결과 이름을 반환합니다.
+
+    예약 시각 scheduled_at(기본값: 현재 시각)을 분 단위로 게시 slot으로 사용해, 하루 여러 번 예약된 글을 서로 구분합니다.
+    """
+    from scheduler_daemon import ERROR, FAILURE, SKIPPED, SUCCESS
+
+    prune_checkpoints(store)
+    if warm.seen_index is not None:
+        warm.seen_index.prune(float(os.environ.get("SEEN_INDEX_MAX_AGE", str(180 * 24 * 3600))))
+    run_id = new_run_id()
+    print(f"실행 ID: {run_id}")
+    builder = StreamingPostBuilder() if os.environ.get("GEMINI_STREAM", "1") != "0" else None
+    try:
+        publish_result = run_posting_pipeline(None, warm.blog_name, warm.tistory_id, warm.tistory_pw,
+                                              builder=builder, checkpoint=store.bind(run_id), dry_run=dry_run,
+                                              slot=(scheduled_at or datetime.now(ZoneInfo("Asia/Seoul"))).strftime(
+                                                  '%Y-%m-%d %H:%M'),
+                                              **warm.pipeline_options())
+    except NoNewArticles as e:
+        print(f"글 생성을 건너뜁니다: {e}")
+        return SKIPPED
+    except Exception as e:
+        error_message = f"스크립트 실행 중 예외 발생: {e}"
+        print(error_message)
+        notify("블로그 포스팅 실패: 스크립트 오류", error_message, dry_run=dry_run)
+        return ERROR
+
+    if publish_result and not publish_result[0]:
+        # 게시 실패가 세션 만료 때문일 수 있으므로 다음 실행에서 세션을 다시 확인
+        warm.invalidate_session()
+    notify(*result_email(publish_result), dry_run=dry_run)
+    return SUCCESS if publish_result and publish_result[0] else FAILURE
+
+
+def command_daemon(args, store):
+    """프로세스를 유지한 채 cron 일정마다 전체 과정을 실행하고, 상태 확인/지표 엔드포인트를 제공합니다."""
+    import signal
+
+    from scheduler_daemon import CronSchedule, SchedulerDaemon, start_health_server
+
+    dry_run = getattr(args, 'dry_run', False)
+    env = require_env(*(("GEMINI_API_KEY",) if dry_run else REQUIRED_ENV_VARS))
+    schedule = CronSchedule(args.schedule or os.environ.get("DAEMON_SCHEDULE", "0 8 * * *"),
+                            ZoneInfo(os.environ.get("DAEMON_TIMEZONE", "Asia/Seoul")))
+
+    # 시작할 때 한 번만 무거운 의존성을 불러오고 자원을 만듦
+    warm = WarmState(env["GEMINI_API_KEY"], os.environ.get("TISTORY_BLOG_NAME"),
+                     os.environ.get("TISTORY_ID"), os.environ.get("TISTORY_PW"))
+    if not dry_run:
+        warm.start_publisher()
+    # 예약 시각에 실행하면 daemon.next_run이 그 예약 시각 (--run-now로 바로 실행할 때는 None)
+    daemon = SchedulerDaemon(schedule, lambda: run_scheduled_post(warm, store, dry_run=dry_run,
+                                                                  scheduled_at=daemon.next_run),
+                             report_path=os.environ.get("PIPELINE_REPORT", "pipeline_report.json"))
+    port = int(os.environ.get("DAEMON_HTTP_PORT", "8787"))
+    server = start_health_server(daemon, os.environ.get("DAEMON_HTTP_HOST", "127.0.0.1"), port) if port else None
+
+    def handle_signal(signum, frame):
+        print(f"종료 신호({signum})를 받았습니다. 진행 중인 실행이 끝나면 종료합니다.")
+        daemon.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    print(f"데몬 모드 시작: 일정 '{schedule.expression}' ({schedule.tz})")
+    try:
+        daemon.run_forever(run_now=args.run_now)
+    finally:
+        if server is not None:
+            server.shutdown()
+        warm.close()
+    return 0
+
+
+def command_outbox(args, store):
+    """게시 대기열의 항목을 보여 줍니다. --drain이면 지금 게시할 항목을 먼저 게시합니다."""
+    outbox = default_outbox()
+    if outbox is None:
+        print("게시 대기열이 꺼져 있습니다 (PUBLISH_OUTBOX=0).")
+        return 1
+    try:
+        if args.drain and not getattr(args, 'dry_run', False):
+            env = require_env("TISTORY_ID", "TISTORY_PW")
+            default_outbox_publisher(outbox, TistoryOutboxSender(env["TISTORY_ID"], env["TISTORY_PW"])).drain()
+        items = outbox.items(args.status)
+        kst = ZoneInfo("Asia/Seoul")
+        for item in items:
+            created = datetime.fromtimestamp(item['created_at'], kst).strftime('%Y-%m-%d %H:%M')
+            print(f"{item['status']:<9} {created} [{item['blog']}] {item['title']} "
+                  f"(시도 {item['attempts']}회{', ' + item['message'] if item['message'] else ''})")
+        pending = sum(1 for item in items if item['status'] not in (PUBLISHED, FAILED))
+        print(f"항목 {len(items)}개, 게시 대기 {pending}개")
+        return 0
+    finally:
+        outbox.close()
+
+
+def command_batch(args, store):
+    """배치 설정 파일의 여러 블로그/주제 작업을 동시에 실행하고 결과를 메일로 알립니다."""
+    from batch_runner import BatchRunner, format_batch_summary, load_batch_config
+
+    if getattr(args, 'dry_run', False):
+        raise SystemExit("오류: batch 명령은 --dry-run을 지원하지 않습니다.")
+    config_path = args.config or os.environ.get("BATCH_CONFIG")
+    if not config_path:
+        raise SystemExit("오류: 배치 설정 파일 경로(CONFIG 또는 BATCH_CONFIG 환경변수)가 필요합니다.")
+    env = require_env("GEMINI_API_KEY")
+    try:
+        config = load_batch_config(config_path)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"오류: 배치 설정을 읽을 수 없습니다 ({config_path}): {e}")
+
+    started = time.perf_counter()
+    results = BatchRunner(config, env["GEMINI_API_KEY"]).run()
+    summary = format_batch_summary(results, time.perf_counter() - started)
+    print(summary)
+    failed = sum(1 for result in results if not result['success'])
+    notify("배치 포스팅 성공" if not failed else f"배치 포스팅 일부 실패 ({failed}건)", summary)
+    return 0
+
+
+COMMANDS = {
+    'fetch': (command_fetch, "뉴스를 수집해 기사 목록과 프롬프트를 저장"),
+    'generate': (command_generate, "저장된 프롬프트로 Gemini 글 생성 및 형식 검사"),
+    'render': (command_render, "저장된 응답을 Tistory HTML로 변환 (네트워크 사용 안 함)"),
+    'publish': (command_publish, "저장된 게시 payload로 Tistory에 게시"),
+    'notify': (command_notify, "저장된 게시 결과를 메일로 알림"),
+    'run': (command_run, "수집부터 알림까지 전체 실행 (명령을 생략하면 실행됨)"),
+    'daemon': (command_daemon, "프로세스를 유지한 채 cron 일정마다 전체 실행 (상태 확인/지표 엔드포인트 제공)"),
+    'outbox': (command_outbox, "게시 대기열 확인 및 재시도 대기 중인 글 게시"),
+    'batch': (command_batch, "배치 설정 파일의 여러 블로그/주제 작업을 동시에 실행"),
+}
+
+
+def build_parser():
+    # 공통 옵션은 명령 앞뒤 어디에 써도 되도록 기본값을 두지 않음 (SUPPRESS)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--run-id', default=argparse.SUPPRESS,
+                        help='체크포인트 실행 ID (run/fetch 기본값: 현재 KST 시각, 그 외: 가장 최근 실행)')
+    common.add_argument('--dry-run', action='store_true', default=argparse.SUPPRESS,
+                        help='게시, 메일 전송, 기사 색인 기록 없이 실행')
+
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument('--resume', nargs='?', const='latest', metavar='RUN_ID', default=argparse.SUPPRESS,
+                             help='실행을 마지막으로 완료된 단계부터 재개 (RUN_ID 생략 시 게시되지 않은 최근 실행)')
+    run_options.add_argument('--replay-publish', metavar='RUN_ID', default=argparse.SUPPRESS,
+                             help='저장된 게시 payload로 게시 단계만 다시 실행')
+
+    parser = argparse.ArgumentParser(description="부동산 뉴스로 블로그 글을 생성해 Tistory에 게시합니다.",
+                                     parents=[common, run_options])
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    for name, (_, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, parents=[common, run_options] if name == 'run' else [common],
+                                          help=help_text, description=help_text)
+        if name == 'render':
+            subparser.add_argument('--output', metavar='FILE', help='변환한 본문 HTML을 저장할 파일')
+        elif name == 'daemon':
+            subparser.add_argument('--schedule', metavar='CRON',
+                                   help="실행 일정 ('분 시 일 월 요일', 기본값: DAEMON_SCHEDULE 또는 '0 8 * * *')")
+            subparser.add_argument('--run-now', action='store_true', help='시작하자마자 한 번 실행')
+        elif name == 'outbox':
+            subparser.add_argument('--drain', action='store_true', help='지금 게시할 항목을 게시한 뒤 목록 표시')
+            subparser.add_argument('--status', choices=('pending', 'sending', 'published', 'failed'),
+                                   help='이 상태의 항목만 표시')
+        elif name == 'batch':
+            subparser.add_argument('config', nargs='?', metavar='CONFIG',
+                                   help='배치 설정 JSON 경로 (기본값: BATCH_CONFIG 환경변수)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    command, _ = COMMANDS[args.command or 'run']
+    try:
+        return command(args, default_checkpoint_store())
+    except NoNewArticles as e:
+        print(f"글 생성을 건너뜁니다: {e}")
+        return 0
+    finally:
+        # 단계별 실행 시간 보고서 저장 (GitHub Actions 아티팩트로 업로드)
+        instrumentation = get_instrumentation()
+        print("\n--- 단계별 실행 시간 ---")
+        print(instrumentation.format_summary())
+        instrumentation.write_report(os.environ.get("PIPELINE_REPORT", "pipeline_report.json"))
+
+
+# --- 메인 실행 로직 ---
+if __name__ == "__main__":
+    sys.exit(main())
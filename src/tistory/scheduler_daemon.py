@@ -0,0 +1,256 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from instrumentation import reset_instrumentation, span
+
+
+# 예약 실행 결과 (작업 함수의 반환값)
+SUCCESS = 'success'
+FAILURE = 'failure'
+SKIPPED = 'skipped'
+ERROR = 'error'   # 작업 함수에서 예외 발생
+
+# 대기 중에도 이 간격(초)마다 깨어나 시계 변경과 종료 요청을 확인함
+_POLL_SECONDS = 30
+
+
+# --- cron 표현식 ---
+def _parse_field(field, low, high):
+    """cron 필드 하나('*', '*/5', '1-5', '1,15', '0-30/10')를 허용 값 집합으로 바꿉니다."""
+    values = set()
+    for part in field.split(','):
+        value_range, _, step = part.partition('/')
+        if value_range == '*':
+            start, end = low, high
+        elif '-' in value_range:
+            start, end = (int(value) for value in value_range.split('-', 1))
+        else:
+            start = end = int(value_range)
+            if step:
+                end = high
+        step = int(step) if step else 1
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"cron 필드 값이 범위({low}-{high})를 벗어났습니다: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """'분 시 일 월 요일' 다섯 필드의 cron 표현식입니다. 요일은 0(일요일)~6이며 7도 일요일로 봅니다.
+
+    일과 요일이 모두 '*'가 아니면 cron과 같이 둘 중 하나만 맞아도 실행합니다.
+    """
+
+    def __init__(self, expression, tz=None):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 '분 시 일 월 요일' 다섯 필드여야 합니다: {expression}")
+        self.expression = expression
+        self.tz = tz
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12)
+        self.weekdays = {value % 7 for value in _parse_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment=None):
+        """moment(기본값: 현재 시각) 이후 처음으로 일치하는 시각을 반환합니다."""
+        if moment is None:
+            moment = datetime.now(self.tz)
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"일치하는 시각이 없는 cron 표현식입니다: {self.expression}")
+
+
+# --- 예약 실행 데몬 ---
+class SchedulerDaemon:
+    """cron 일정에 따라 같은 프로세스 안에서 작업 함수를 반복 실행합니다.
+
+    - 작업은 한 번에 하나씩만 실행되고, 실행이 길어져 지나친 예약 시각은 한 번으로 합쳐 건너뜁니다.
+    - 실행마다 계측 상태를 초기화하고, report_path가 주어지면 실행 보고서를 그 경로에 씁니다.
+    - 실행 결과, 누적 카운터, 마지막 실행의 구간별 소요 시간을 health()와 metrics_text()로 제공합니다.
+    """
+
+    def __init__(self, schedule, job, report_path=None):
+        self.schedule = schedule
+        self.job = job
+        self.report_path = report_path
+        self.started_at = time.time()
+        self.next_run = None
+        self.last_run = None
+        self.running = False
+        self.results = {SUCCESS: 0, FAILURE: 0, SKIPPED: 0, ERROR: 0}
+        self.counters = {}
+        self.stage_seconds = {}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+
+    def run_once(self):
+        """작업을 한 번 실행하고 결과(SUCCESS, FAILURE, SKIPPED, ERROR)를 반환합니다."""
+        instrumentation = reset_instrumentation()
+        started_at = datetime.now(self.schedule.tz)
+        started = time.perf_counter()
+        with self._lock:
+            self.running = True
+        error = None
+        try:
+            with span('scheduled_run'):
+                result = self.job()
+        except Exception as e:
+            print(f"예약 실행 중 예외 발생: {e}")
+            result, error = ERROR, repr(e)
+        duration = time.perf_counter() - started
+
+        report = instrumentation.report()
+        if self.report_path:
+            instrumentation.write_report(self.report_path)
+        stage_seconds = {}
+
+        def walk(node):
+            stage_seconds[node['name']] = stage_seconds.get(node['name'], 0.0) + (node['duration'] or 0.0)
+            for child in node['children']:
+                walk(child)
+
+        for root in report['spans']:
+            walk(root)
+
+        with self._lock:
+            self.running = False
+            self._heartbeat = time.monotonic()
+            self.results[result] = self.results.get(result, 0) + 1
+            for name, value in report['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            self.stage_seconds = stage_seconds
+            self.last_run = {
+                'started_at': started_at.isoformat(),
+                'duration': round(duration, 3),
+                'result': result,
+                'error': error,
+            }
+        print(f"예약 실행 완료: {result} ({duration:.1f}초)")
+        return result
+
+    def run_forever(self, run_now=False):
+        """stop()이 호출될 때까지 예약 시각마다 작업을 실행합니다. run_now이면 시작하자마자 한 번 실행합니다."""
+        if run_now:
+            self.run_once()
+        while not self._stop.is_set():
+            next_run = self.schedule.next_after()
+            with self._lock:
+                self.next_run = next_run
+            print(f"다음 실행 예정: {next_run.isoformat()}")
+            while not self._stop.is_set():
+                remaining = (next_run - datetime.now(self.schedule.tz)).total_seconds()
+                if remaining <= 0:
+                    break
+                with self._lock:
+                    self._heartbeat = time.monotonic()
+                self._stop.wait(min(remaining, _POLL_SECONDS))
+            if not self._stop.is_set():
+                self.run_once()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_healthy(self):
+        """일정 확인 루프가 멈추지 않았으면 True입니다. 실행 중에는 실행이 끝날 때까지 정상으로 봅니다."""
+        with self._lock:
+            return not self._stop.is_set() and (
+                self.running or time.monotonic() - self._heartbeat < _POLL_SECONDS * 4
+            )
+
+    def health(self):
+        healthy = self.is_healthy()
+        with self._lock:
+            return {
+                'status': 'ok' if healthy else 'unavailable',
+                'schedule': self.schedule.expression,
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'running': self.running,
+                'next_run': self.next_run.isoformat() if self.next_run else None,
+                'last_run': self.last_run,
+                'results': dict(self.results),
+            }
+
+    def metrics_text(self):
+        """Prometheus 텍스트 형식의 지표를 반환합니다."""
+        with self._lock:
+            lines = [
+                '# TYPE tistory_daemon_uptime_seconds gauge',
+                f"tistory_daemon_uptime_seconds {time.time() - self.started_at:.3f}",
+                '# TYPE tistory_daemon_running gauge',
+                f"tistory_daemon_running {int(self.running)}",
+                '# TYPE tistory_daemon_runs_total counter',
+            ]
+            lines += [f'tistory_daemon_runs_total{{result="{name}"}} {value}' for name, value in self.results.items()]
+            if self.next_run:
+                lines += ['# TYPE tistory_daemon_next_run_timestamp_seconds gauge',
+                          f"tistory_daemon_next_run_timestamp_seconds {self.next_run.timestamp():.0f}"]
+            if self.last_run:
+                lines += ['# TYPE tistory_daemon_last_run_duration_seconds gauge',
+                          f"tistory_daemon_last_run_duration_seconds {self.last_run['duration']}"]
+            lines.append('# TYPE tistory_pipeline_counter_total counter')
+            lines += [f'tistory_pipeline_counter_total{{name="{_label(name)}"}} {value}'
+                      for name, value in sorted(self.counters.items())]
+            lines.append('# TYPE tistory_pipeline_last_stage_seconds gauge')
+            lines += [f'tistory_pipeline_last_stage_seconds{{stage="{_label(name)}"}} {seconds:.6f}'
+                      for name, seconds in sorted(self.stage_seconds.items())]
+        return '\n'.join(lines) + '\n'
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+# --- 상태/지표 HTTP 엔드포인트 ---
+def start_health_server(daemon, host='127.0.0.1', port=8787):
+    """/healthz(JSON)와 /metrics(Prometheus)를 제공하는 HTTP 서버를 백그라운드 스레드에서 시작하고 반환합니다."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path == '/healthz':
+                body = json.dumps(daemon.health(), ensure_ascii=False).encode('utf-8')
+                self._send(200 if daemon.is_healthy() else 503, body, 'application/json; charset=utf-8')
+            elif path == '/metrics':
+                self._send(200, daemon.metrics_text().encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8')
+            else:
+                self._send(404, b'not found', 'text/plain; charset=utf-8')
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="health-server", daemon=True).start()
+    print(f"상태 확인 엔드포인트: http://{host}:{server.server_port}/healthz, /metrics")
+    return server
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import threading
+import time
+
+from article_dedup import hamming_distance, simhash
+
+
+class NoNewArticles(Exception):
+    """마지막 게시 이후 새로 다룰 만한 기사가 충분하지 않을 때 발생합니다."""
+
+
+def _to_signed(value):
+    # SQLite INTEGER는 부호 있는 64비트이므로 64비트 해시를 부호 있는 정수로 저장
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def url_key(url):
+    return _to_signed(int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big'))
+
+
+# --- 이미 다룬 기사 색인 ---
+class SeenArticleIndex:
+    """게시에 사용한 기사의 URL 해시와 본문 SimHash 지문을 SQLite에 보관합니다.
+
+    URL은 8바이트 해시 하나로만 저장하므로 수개월 분량도 수 MB 안에 들어갑니다.
+    stage()로 이번 실행에서 수집한 기사를 모아 두었다가 게시에 성공했을 때 commit()으로 기록합니다.
+    여러 단계 스레드에서 사용할 수 있도록 연결 하나를 잠금으로 보호합니다.
+    """
+
+    def __init__(self, path):
+        import sqlite3
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS seen_urls (url_hash INTEGER PRIMARY KEY, seen_at REAL NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS seen_content (fingerprint INTEGER NOT NULL, seen_at REAL NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS seen_content_at ON seen_content (seen_at)")
+        self.pending = []
+
+    def has_url(self, url):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM seen_urls WHERE url_hash = ?", (url_key(url),)).fetchone()
+        return row is not None
+
+    def recent_fingerprints(self, since_seconds):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fingerprint FROM seen_content WHERE seen_at >= ?", (time.time() - since_seconds,)
+            ).fetchall()
+        return [fingerprint & ((1 << 64) - 1) for fingerprint, in rows]
+
+    def novel_indices(self, texts, threshold=3, since_seconds=3 * 24 * 3600, fingerprints=None):
+        """최근 since_seconds 동안 다룬 기사와 SimHash 거리가 threshold보다 먼 기사의 인덱스를 반환합니다.
+
+        URL이 달라도 이미 다룬 기사를 다시 실은 경우를 걸러 냅니다. threshold가 음수이면 모든 기사를 새 기사로 봅니다.
+        fingerprints(texts와 같은 순서의 SimHash 지문)가 주어지면 다시 계산하지 않습니다.
+        """
+        if threshold < 0:
+            return list(range(len(texts)))
+        if fingerprints is None:
+            fingerprints = [simhash(text) for text in texts]
+        seen = self.recent_fingerprints(since_seconds)
+        return [
+            index for index, fingerprint in enumerate(fingerprints)
+            if all(hamming_distance(fingerprint, seen_fingerprint) > threshold for seen_fingerprint in seen)
+        ]
+
+    def stage(self, articles):
+        """게시에 성공하면 기록할 기사({'url', 'text'}, 계산해 둔 지문이 있으면 'fingerprint'도) 목록을 설정합니다."""
+        self.pending = list(articles)
+
+    def take_pending(self):
+        """stage()한 기사를 [{'url', 'fingerprint'}] 목록으로 꺼내고 비웁니다. (게시 대기열 항목에 저장하는 형태)"""
+        articles = [
+            {'url': article['url'], 'fingerprint': article.get('fingerprint') or simhash(article['text'])}
+            for article in self.pending
+        ]
+        self.pending = []
+        return articles
+
+    def record(self, articles):
+        """기사({'url', 'fingerprint'} 또는 {'url', 'text'}) 목록을 기록하고 기록한 수를 반환합니다."""
+        now = time.time()
+        rows = [
+            (url_key(article['url']), _to_signed(article.get('fingerprint') or simhash(article['text'])))
+            for article in articles
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO seen_urls (url_hash, seen_at) VALUES (?, ?)",
+                                   [(key, now) for key, _ in rows])
+            self._conn.executemany("INSERT INTO seen_content (fingerprint, seen_at) VALUES (?, ?)",
+                                   [(fingerprint, now) for _, fingerprint in rows])
+        return len(rows)
+
+    def commit(self):
+        """stage()한 기사를 기록하고 기록한 수를 반환합니다."""
+        return self.record(self.take_pending())
+
+    def prune(self, max_age):
+        """max_age(초)보다 오래된 기록을 삭제합니다."""
+        cutoff = time.time() - max_age
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM seen_urls WHERE seen_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM seen_content WHERE seen_at < ?", (cutoff,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
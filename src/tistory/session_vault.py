@@ -0,0 +1,121 @@
+import os
+
+from instrumentation import traced
+
+
+# 블로그 주소 형식 ({blog} 자리에 블로그 이름이 들어감)
+TISTORY_BASE_URL = "https://{blog}.tistory.com"
+
+
+def tistory_base_url(blog_name):
+    """블로그 주소를 반환합니다. TISTORY_BASE_URL 환경 변수로 다른 서버(로컬 대역 등)를 가리킬 수 있습니다."""
+    return os.environ.get("TISTORY_BASE_URL", TISTORY_BASE_URL).format(blog=blog_name).rstrip('/')
+
+
+def plaintext_allowed():
+    """암호화 키 없이 세션 쿠키를 평문 파일로 보관해도 되는지 반환합니다.
+
+    CI(CI 환경 변수가 설정된 경우)에서는 캐시나 아티팩트로 파일이 새어 나갈 수 있으므로
+    TISTORY_SESSION_PLAINTEXT=1일 때만 허용합니다.
+    """
+    default = "0" if os.environ.get("CI") else "1"
+    return os.environ.get("TISTORY_SESSION_PLAINTEXT", default) == "1"
+
+
+# --- Tistory 세션 저장소 ---
+class SessionVault:
+    """Tistory 로그인 쿠키 문자열을 실행 간에 보관합니다.
+
+    파일은 소유자만 읽을 수 있는 권한(0600)으로 저장되며,
+    key(Fernet 키)가 주어지면 cryptography로 암호화하여 저장합니다.
+    key가 없고 평문 보관이 허용되지 않으면(plaintext_allowed() 참고) 세션을 저장하지도 읽지도 않습니다.
+    """
+
+    def __init__(self, path, key=None):
+        self.path = path
+        self.key = key
+
+    def _cipher(self):
+        from cryptography.fernet import Fernet
+        return Fernet(self.key.encode() if isinstance(self.key, str) else self.key)
+
+    def load(self):
+        """저장된 쿠키 문자열을 반환합니다. 없거나 복호화할 수 없으면 None을 반환합니다."""
+        if not self.key and not plaintext_allowed():
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if self.key:
+            try:
+                data = self._cipher().decrypt(data)
+            except Exception as e:
+                print(f"저장된 세션을 복호화할 수 없습니다: {e}")
+                return None
+        return data.decode('utf-8').strip() or None
+
+    def save(self, cookie_str):
+        if not self.key and not plaintext_allowed():
+            print("암호화 키(TISTORY_SESSION_KEY)가 없어 CI에서는 세션을 저장하지 않습니다.")
+            return
+        data = cookie_str.encode('utf-8')
+        if self.key:
+            data = self._cipher().encrypt(data)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+# --- 세션 유효성 확인 함수 ---
+@traced('session_check')
+def is_session_valid(blog_name, cookie_str, timeout=(3.05, 5), http_session=None):
+    """인증이 필요한 관리 페이지를 한 번 요청하여 쿠키가 아직 유효한지 확인합니다.
+
+    http_session이 주어지면 그 세션의 연결 풀로 요청합니다.
+    """
+    import requests
+
+    try:
+        response = (http_session if http_session is not None else requests).get(
+            f"{tistory_base_url(blog_name)}/manage/",
+            headers={"Cookie": cookie_str},
+            allow_redirects=False,
+            timeout=timeout,
+        )
+    except requests.exceptions.RequestException as e:
+        print(f"세션 확인 요청 중 오류 발생: {e}")
+        return False
+
+    # 로그인되지 않은 경우 로그인 페이지로 리다이렉트됨
+    return response.status_code == 200
+
+
+# --- 쿠키 획득 함수 ---
+def get_session_cookie(vault, blog_name, login, http_session=None):
+    """저장된 세션이 유효하면 재사용하고, 만료된 경우에만 login()으로 새 쿠키를 발급받습니다."""
+    cookie_str = vault.load()
+    if cookie_str and is_session_valid(blog_name, cookie_str, http_session=http_session):
+        print("저장된 Tistory 세션을 재사용합니다.")
+        return cookie_str
+
+    if cookie_str:
+        print("저장된 Tistory 세션이 만료되었습니다. 다시 로그인합니다.")
+        vault.clear()
+
+    cookie_str = login()
+    if cookie_str:
+        vault.save(cookie_str)
+    return cookie_str
@@ -0,0 +1,109 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# --- 파이프라인 단계 그래프 ---
+class StageGraph:
+    """의존 관계가 있는 파이프라인 단계를 스레드 풀에서 실행합니다.
+
+    의존하는 단계가 모두 끝난 단계는 바로 시작하므로, 서로 독립적인 단계(로그인과 뉴스 수집 등)는 동시에 진행됩니다.
+    각 단계 함수는 deps 순서대로 의존 단계의 결과를 인자로 받습니다.
+    단계가 예외로 실패하면 그 단계에 의존하는 단계는 모두 건너뜁니다.
+    단계는 호출한 스레드의 컨텍스트를 복사해 실행되므로, 단계 안의 구간(span)은 run()을 감싼 구간 아래에 기록됩니다.
+    """
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._stages = {}
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+
+    def add(self, name, func, deps=()):
+        """단계를 추가합니다. 의존 단계는 먼저 추가되어 있어야 하므로 순환이 생기지 않습니다."""
+        if name in self._stages:
+            raise ValueError(f"이미 추가된 단계입니다: {name}")
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"{name} 단계의 의존 단계가 없습니다: {dep}")
+        self._stages[name] = (func, tuple(deps))
+        return self
+
+    def _run_stage(self, name, func, args):
+        self.timings[name]['start'] = time.perf_counter() - self._origin
+        try:
+            return func(*args)
+        finally:
+            self.timings[name]['end'] = time.perf_counter() - self._origin
+
+    def run(self):
+        """모든 단계를 실행하고 단계 이름별 결과 dict를 반환합니다. 실패한 단계의 예외는 errors에 남습니다."""
+        self._origin = time.perf_counter()
+        self.timings = {name: {'start': None, 'end': None, 'status': 'pending'} for name in self._stages}
+        pending = dict(self._stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                for name, (func, deps) in list(pending.items()):
+                    statuses = [self.timings[dep]['status'] for dep in deps]
+                    if any(status in ('failed', 'skipped') for status in statuses):
+                        self.timings[name]['status'] = 'skipped'
+                        del pending[name]
+                    elif all(status == 'done' for status in statuses):
+                        args = [self.results[dep] for dep in deps]
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, self._run_stage, name, func, args)] = name
+                        self.timings[name]['status'] = 'running'
+                        del pending[name]
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                        self.timings[name]['status'] = 'done'
+                    except Exception as e:
+                        self.errors[name] = e
+                        self.timings[name]['status'] = 'failed'
+        return self.results
+
+    def critical_path(self):
+        """가장 늦게 끝난 단계에서 시작해, 가장 늦게 끝난 의존 단계를 거슬러 올라간 경로를 반환합니다."""
+        finished = {name: t for name, t in self.timings.items() if t['end'] is not None}
+        if not finished:
+            return []
+
+        path = [max(finished, key=lambda name: finished[name]['end'])]
+        while True:
+            deps = [dep for dep in self._stages[path[-1]][1] if dep in finished]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda dep: finished[dep]['end']))
+        return path[::-1]
+
+    def format_critical_path(self):
+        parts = []
+        for name in self.critical_path():
+            timing = self.timings[name]
+            parts.append(f"{name}({timing['end'] - timing['start']:.2f}초)")
+        return ' → '.join(parts)
+
+    def report(self):
+        """단계별 시작/종료 시각(실행 시작 기준 초)과 상태, 임계 경로를 dict로 반환합니다."""
+        return {
+            'stages': {
+                name: {
+                    'status': timing['status'],
+                    'start': None if timing['start'] is None else round(timing['start'], 6),
+                    'end': None if timing['end'] is None else round(timing['end'], 6),
+                    'deps': list(self._stages[name][1]),
+                    'error': repr(self.errors[name]) if name in self.errors else None,
+                }
+                for name, timing in self.timings.items()
+            },
+            'critical_path': self.critical_path(),
+        }
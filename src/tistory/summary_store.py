@@ -0,0 +1,66 @@
+import hashlib
+import os
+import threading
+import time
+
+
+def article_fingerprint(text):
+    """요약 저장소의 키로 쓰는 기사 본문의 SHA-256 해시입니다. (SimHash와 달리 비슷한 기사끼리 요약을 공유하지 않음)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# --- 기사 요약 저장소 ---
+class SummaryStore:
+    """기사 지문, 모델 이름, 요약 프롬프트 버전을 키로 기사별 요약을 SQLite에 보관합니다.
+
+    HTTP 응답을 저장하는 ArticleCache와 따로 두어, 모델이나 요약 형식이 바뀌면 키가 달라져 이전 요약을 쓰지 않습니다.
+    max_age(초)보다 오래된 요약은 get()에서 없는 것으로 보고 prune()에서 삭제합니다.
+    """
+
+    def __init__(self, path, max_age=7 * 24 * 3600):
+        import sqlite3
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "fingerprint TEXT NOT NULL, model TEXT NOT NULL, prompt_version INTEGER NOT NULL, "
+                "summary TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "PRIMARY KEY (fingerprint, model, prompt_version))"
+            )
+
+    def get(self, fingerprint, model, prompt_version):
+        """저장된 요약을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM summaries WHERE fingerprint = ? AND model = ? AND prompt_version = ? "
+                "AND stored_at >= ?",
+                (fingerprint, model, prompt_version, time.time() - self.max_age),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, model, prompt_version, summaries):
+        """{지문: 요약} dict를 한 트랜잭션으로 저장합니다."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (fingerprint, model, prompt_version, summary, stored_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(fingerprint, model, prompt_version, summary, now) for fingerprint, summary in summaries.items()],
+            )
+
+    def prune(self):
+        """max_age보다 오래된 요약을 삭제하고 삭제한 개수를 반환합니다."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM summaries WHERE stored_at < ?", (time.time() - self.max_age,))
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
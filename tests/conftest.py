@@ -0,0 +1,5 @@
+import os
+import sys
+
+# src/tistory의 모듈은 스크립트처럼 이름만으로 불러오므로 같은 방식으로 경로를 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'tistory'))
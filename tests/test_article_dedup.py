@@ -0,0 +1,47 @@
+import hashlib
+import re
+from collections import Counter
+
+from article_dedup import deduplicate_articles, simhash
+
+
+def reference_simhash(text, ngram=3, bits=64):
+    """비트마다 가중치를 더하는 원래 방식. 색인에 저장된 지문과 호환되는지 비교하는 기준입니다."""
+    normalized = re.sub(r'\s+', ' ', text).strip()
+    if len(normalized) < ngram:
+        shingles = Counter([normalized])
+    else:
+        shingles = Counter(normalized[i:i + ngram] for i in range(len(normalized) - ngram + 1))
+    weights = [0] * bits
+    for shingle, count in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=bits // 8).digest(), 'big')
+        for bit in range(bits):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+TEXTS = [
+    '',
+    '가',
+    '  서울   아파트 ',
+    '서울 아파트 매매가격은 0.12% 상승했습니다. ' * 40,
+    '기준금리 동결로 전세 수요가 늘었습니다.\n\n수도권 청약 경쟁률은 높아졌습니다.',
+    ''.join(chr(0xAC00 + i * 7 % 11172) for i in range(3000)),
+]
+
+
+def test_simhash_matches_reference():
+    for text in TEXTS:
+        assert simhash(text) == reference_simhash(text)
+        assert simhash(text, ngram=2, bits=128) == reference_simhash(text, ngram=2, bits=128)
+
+
+def test_deduplicate_keeps_longest_of_near_duplicates():
+    original = '서울 아파트 매매가격은 0.12% 상승했습니다. 전세가율은 보합세입니다. ' * 20
+    texts = [original, original + ' 추가 문단.', '지방 미분양 물량이 크게 늘었습니다. ' * 20]
+
+    kept, stats = deduplicate_articles(texts)
+
+    assert stats['clusters'] == 2
+    assert stats['kept_indices'] == [1, 2]
+    assert kept[0].startswith('[2개 매체 보도]')
@@ -0,0 +1,27 @@
+import pytest
+
+from article_extractor import EXTRACTORS, extract_article_text
+
+PAGE = '<html><head>{meta}<title>기사</title></head><body>' \
+       '<div id="newsct_article">한글 본문<script>광고()</script><p>둘째 문단</p></div></body></html>'
+
+
+@pytest.mark.parametrize('backend', sorted(EXTRACTORS))
+def test_utf8_page_without_declared_charset(backend):
+    html = PAGE.format(meta='').encode('utf-8')
+
+    assert extract_article_text(html, encoding=None, backend=backend) == '한글 본문\n둘째 문단'
+
+
+@pytest.mark.parametrize('backend', sorted(EXTRACTORS))
+def test_cp949_page_without_declared_charset(backend):
+    html = PAGE.format(meta='').encode('cp949')
+
+    assert extract_article_text(html, encoding=None, backend=backend) == '한글 본문\n둘째 문단'
+
+
+@pytest.mark.parametrize('backend', sorted(EXTRACTORS))
+def test_charset_declared_in_meta(backend):
+    html = PAGE.format(meta='<meta charset="euc-kr">').encode('euc-kr')
+
+    assert extract_article_text(html, encoding=None, backend=backend) == '한글 본문\n둘째 문단'
@@ -0,0 +1,35 @@
+import threading
+
+from article_fetcher import iter_fetch_articles
+
+
+class BlockedSession:
+    """release가 설정될 때까지 응답하지 않는 세션."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.requested = []
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        self.requested.append(url)
+        self.release.wait(5)
+        raise AssertionError("deadline 이후의 응답은 사용하지 않아야 합니다")
+
+
+def test_urls_are_not_read_after_deadline():
+    session = BlockedSession()
+    consumed = []
+
+    def urls():
+        for i in range(10):
+            consumed.append(i)
+            yield f"https://news.example/{i}"
+
+    try:
+        results = list(iter_fetch_articles(urls(), session=session, max_workers=2, max_in_flight=2, deadline=0.2))
+    finally:
+        session.release.set()
+
+    assert consumed == [0, 1]
+    assert [result['url'] for result in results] == ['https://news.example/0', 'https://news.example/1']
+    assert all(result['error'] == "전체 수집 시간 초과" for result in results)
@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+
+import pytest
+
+import batch_runner
+from batch_runner import BatchRunner, load_batch_config
+
+
+def make_runner(monkeypatch, tmp_path, logins, **config):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(batch_runner, 'create_gemini_model', lambda api_key: None)
+    monkeypatch.setattr(batch_runner, 'default_outbox', lambda: None)
+
+    def get_session_cookie(vault, blog_name, login):
+        return logins.pop(0)
+
+    monkeypatch.setattr(batch_runner, 'get_session_cookie', get_session_cookie)
+    jobs = [{'blog': 'blog', 'account': 'main', 'topic': 'real_estate', 'category': '0'}]
+    return BatchRunner(dict(config, jobs=jobs), api_key='key')
+
+
+def test_failed_login_is_retried_after_backoff(monkeypatch, tmp_path):
+    runner = make_runner(monkeypatch, tmp_path, [None, 'TSSESSION=ok'], login_retry_after=0)
+
+    assert runner._account_session('main', 'blog')[2] is None
+    assert runner._account_session('main', 'blog')[2] == 'TSSESSION=ok'
+    # 성공한 세션은 다시 로그인하지 않고 재사용
+    assert runner._account_session('main', 'blog')[2] == 'TSSESSION=ok'
+
+
+def test_failed_login_is_not_repeated_within_backoff(monkeypatch, tmp_path):
+    logins = [None, 'TSSESSION=ok']
+    runner = make_runner(monkeypatch, tmp_path, logins, login_retry_after=3600)
+
+    assert runner._account_session('main', 'blog')[2] is None
+    assert runner._account_session('main', 'blog')[2] is None
+    assert logins == ['TSSESSION=ok']
+
+
+def write_config(tmp_path, jobs):
+    path = tmp_path / 'batch.json'
+    path.write_text(json.dumps({'jobs': jobs}), encoding='utf-8')
+    return str(path)
+
+
+def test_same_blog_with_different_accounts_is_rejected(tmp_path):
+    path = write_config(tmp_path, [
+        {'blog': 'blog', 'account': 'main'},
+        {'blog': 'other', 'account': 'second'},
+        {'blog': 'blog', 'account': 'second'},
+    ])
+
+    with pytest.raises(ValueError, match='jobs\\[2\\]'):
+        load_batch_config(path)
+
+
+def test_same_blog_and_topic_is_rejected(tmp_path):
+    path = write_config(tmp_path, [{'blog': 'blog', 'category': 1}, {'blog': 'blog', 'category': 2}])
+
+    with pytest.raises(ValueError, match='jobs\\[1\\]'):
+        load_batch_config(path)
+
+
+def run_topic_batch(monkeypatch, tmp_path, jobs, fetch_seconds=0.3, generate_seconds=0.2):
+    """주제 두 개가 한 수집 함수를 공유하고 한 주제는 다른 수집 함수를 쓰는 배치를 실행합니다."""
+    fetches = []
+    lock = threading.Lock()
+
+    def fetcher(name):
+        def fetch(today_date):
+            with lock:
+                fetches.append(name)
+            time.sleep(fetch_seconds)
+            return f"{name} 기사"
+        return fetch
+
+    def generate(model, prompt, builder=None, echo=True):
+        time.sleep(generate_seconds)
+        return prompt
+
+    news, market = fetcher('news'), fetcher('market')
+    monkeypatch.setattr(batch_runner, 'TOPICS', {
+        'real_estate': {'fetch': news, 'prompt': lambda date, text: f"부동산 {text}"},
+        'policy': {'fetch': news, 'prompt': lambda date, text: f"정책 {text}"},
+        'market': {'fetch': market, 'prompt': lambda date, text: f"시장 {text}"},
+    })
+    monkeypatch.setattr(batch_runner, 'generate_content_with_gemini', generate)
+    monkeypatch.setattr(batch_runner, 'validate_response', lambda model, content, date, limiter=None: (content, True))
+    monkeypatch.setattr(batch_runner, 'prepare_post', lambda content: {'title': content, 'html': '', 'tags': []})
+    monkeypatch.setattr(batch_runner, 'post_to_tistory_requests', lambda blog, *args, **kwargs: (True, blog))
+    runner = make_runner(monkeypatch, tmp_path, [], job_workers=8, gemini_concurrency=8, gemini_rpm=0)
+    monkeypatch.setattr(batch_runner, 'get_session_cookie', lambda vault, blog_name, login: 'TSSESSION=ok')
+    runner.jobs = [dict(job, category='0') for job in jobs]
+
+    started = time.perf_counter()
+    results = runner.run()
+    return results, fetches, time.perf_counter() - started
+
+
+def test_jobs_share_fetches_and_scale_sublinearly(monkeypatch, tmp_path):
+    one_job = [{'blog': 'blog-0', 'account': 'main', 'topic': 'real_estate'}]
+    six_jobs = [{'blog': f"blog-{i}", 'account': f"account-{i % 2}", 'topic': topic}
+                for i, topic in enumerate(['real_estate', 'policy', 'market'] * 2)]
+
+    _, _, single = run_topic_batch(monkeypatch, tmp_path, one_job)
+    results, fetches, elapsed = run_topic_batch(monkeypatch, tmp_path, six_jobs)
+
+    assert all(result['success'] for result in results)
+    # 수집 함수마다 한 번만 수집 (real_estate와 policy는 같은 기사를 공유)
+    assert sorted(fetches) == ['market', 'news']
+    # 작업 6개를 순서대로 실행하면 6배가 걸림
+    assert elapsed < single * 2
@@ -0,0 +1,70 @@
+import json
+import os
+import time
+
+from checkpoint_store import CheckpointStore
+
+
+def save_run(store, run_id, created_at, **stages):
+    for stage, value in stages.items():
+        store.save(run_id, stage, value)
+    # 실행 시각을 정해 두어 최근 실행 순서가 테스트 실행 속도에 좌우되지 않게 함
+    path = store._manifest_path(run_id)
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['created_at'] = manifest['updated_at'] = created_at
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+
+def object_count(store):
+    objects_dir = os.path.join(store.root, 'objects')
+    return sum(len(os.listdir(os.path.join(objects_dir, prefix))) for prefix in os.listdir(objects_dir))
+
+
+def test_resume_picks_latest_unfinished_run(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    save_run(store, 'run-1', 1000.0, articles=['a'], prompt='p1')
+    save_run(store, 'run-2', 2000.0, articles=['b'], prompt='p2', draft='d2', response='r2', post={'title': 't'})
+    save_run(store, 'run-3', 3000.0, articles=['c'], post={'title': 't'}, publish={'success': True, 'message': 't'})
+
+    assert store.latest_run_id() == 'run-2'
+    assert store.latest_run_id(unfinished_only=False) == 'run-3'
+    assert store.last_stage('run-2') == 'post'
+    assert store.bind('run-2').load('response') == 'r2'
+
+    # 게시에 실패한 실행도 다시 시도할 대상
+    store.save('run-2', 'publish', {'success': False, 'message': '503'})
+    assert store.latest_run_id() == 'run-2'
+    store.save('run-2', 'publish', {'success': True, 'message': 't'})
+    assert store.latest_run_id() == 'run-1'
+
+
+def test_prune_keeps_newest_runs_and_shared_outputs(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    now = time.time()
+    # 같은 기사 목록은 세 실행이 공유하는 한 객체로 저장됨
+    save_run(store, 'run-1', now - 30, articles=['shared'], prompt='p1')
+    save_run(store, 'run-2', now - 20, articles=['shared'], prompt='p2')
+    save_run(store, 'run-3', now - 10, articles=['shared'], prompt='p3')
+    assert object_count(store) == 4
+
+    removed = store.prune(max_age=3600, keep=2)
+
+    assert removed == 1
+    assert store.manifest('run-1') is None
+    assert store.latest_run_id() == 'run-3'
+    for run_id in ('run-2', 'run-3'):
+        assert store.load(run_id, 'articles') == ['shared']
+        assert store.load(run_id, 'prompt') == f"p{run_id[-1]}"
+
+
+def test_prune_removes_runs_older_than_max_age(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    now = time.time()
+    save_run(store, 'old', now - 7200, articles=['shared'], prompt='old')
+    save_run(store, 'new', now - 10, articles=['shared'], prompt='new')
+
+    assert store.prune(max_age=3600) == 1
+    assert store.manifest('old') is None
+    assert store.load('new', 'articles') == ['shared']
@@ -0,0 +1,119 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+import requests
+
+from fetch_policy import CircuitOpenError, FetchPolicy, _discard
+
+
+class RaisingSession:
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def get(self, url, timeout=None, headers=None):
+        self.calls += 1
+        raise self.error
+
+
+def open_circuit(policy, host):
+    for _ in range(policy.breaker.failure_threshold):
+        policy.breaker.record_failure(host)
+    # cooldown이 이미 지난 것처럼 만듦
+    policy.breaker._hosts[host]['opened_at'] -= policy.breaker.cooldown
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.TooManyRedirects("redirects"),
+    requests.exceptions.ContentDecodingError("decode"),
+])
+def test_probe_ending_in_unexpected_error_does_not_block_host(error):
+    policy = FetchPolicy((1, 1), retries=0, cooldown=60.0)
+    open_circuit(policy, 'news.example')
+    session = RaisingSession(error)
+
+    with pytest.raises(type(error)):
+        policy.get(session, 'https://news.example/a')
+    # 시험 요청이 끝났으므로 다음 요청도 다시 시험할 수 있어야 함
+    with pytest.raises(type(error)):
+        policy.get(session, 'https://news.example/b')
+
+    assert session.calls == 2
+
+
+def test_probe_past_deadline_does_not_block_host():
+    policy = FetchPolicy((1, 1), retries=0, cooldown=60.0)
+    open_circuit(policy, 'news.example')
+    session = RaisingSession(AssertionError("요청하지 않아야 합니다"))
+
+    with pytest.raises(requests.exceptions.Timeout):
+        policy.get(session, 'https://news.example/a', deadline_at=0)
+    with pytest.raises(requests.exceptions.Timeout):
+        policy.get(session, 'https://news.example/b', deadline_at=0)
+
+
+def test_concurrent_request_is_rejected_while_probing():
+    policy = FetchPolicy((1, 1), retries=0, cooldown=60.0)
+    open_circuit(policy, 'news.example')
+
+    assert policy.breaker.allow('news.example')
+    with pytest.raises(CircuitOpenError):
+        policy.get(RaisingSession(AssertionError()), 'https://news.example/b')
+
+
+class ClosableResponse:
+    status_code = 200
+
+    def __init__(self, name):
+        self.name = name
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+class StragglingSession:
+    """첫 요청은 release가 설정될 때까지 응답하지 않고, 다음 요청은 바로 응답하는 세션."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.responses = []
+
+    def get(self, url, timeout=None, headers=None):
+        response = ClosableResponse(f"response-{len(self.responses)}")
+        first = not self.responses
+        self.responses.append(response)
+        if first:
+            self.release.wait(5)
+        return response
+
+
+def test_losing_hedged_response_is_closed():
+    policy = FetchPolicy((1, 1), retries=0, hedge=True, hedge_after=0.05)
+    session = StragglingSession()
+    try:
+        response = policy.get(session, 'https://news.example/a')
+        session.release.set()
+        primary = session.responses[0]
+
+        assert response.name == 'response-1'
+        assert primary.closed.wait(5)
+        assert not response.closed.is_set()
+    finally:
+        session.release.set()
+        policy.close()
+
+
+def test_unused_hedged_request_is_cancelled_or_closed():
+    waiting = Future()
+    running = Future()
+    response = ClosableResponse('late')
+
+    running.set_running_or_notify_cancel()
+    _discard(waiting)
+    _discard(running)
+    running.set_result(response)
+
+    assert waiting.cancelled()
+    assert response.closed.is_set()
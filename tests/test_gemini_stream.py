@@ -0,0 +1,63 @@
+from post_renderer import StreamingPostBuilder
+from real_estate_posting import generate_content_with_gemini
+
+
+class TextChunk:
+    def __init__(self, text):
+        self.text = text
+        self.parts = [text]
+
+
+class FinishChunk:
+    """내용 없이 종료 사유만 담긴 청크 (SDK는 .text 접근 시 ValueError 발생)."""
+
+    parts = []
+
+    @property
+    def text(self):
+        raise ValueError("response.text requires the response to contain a valid Part")
+
+
+class EmptyCandidatesChunk:
+    """후보 없이 사용량 정보만 담긴 청크 (SDK는 .parts 접근 시 ValueError 발생)."""
+
+    @property
+    def parts(self):
+        raise ValueError("response.candidates is empty")
+
+    @property
+    def text(self):
+        raise ValueError("response.candidates is empty")
+
+
+class StreamingModel:
+    def __init__(self, *chunks):
+        self.chunks = chunks
+
+    def generate_content(self, prompt, stream=False):
+        assert stream
+        return iter(self.chunks)
+
+
+def test_finish_only_and_empty_chunks_are_skipped():
+    model = StreamingModel(TextChunk('# 제목\n<p>본'), FinishChunk(), TextChunk('문</p>\n태그::a,b'),
+                           EmptyCandidatesChunk(), FinishChunk())
+    builder = StreamingPostBuilder()
+    metrics = {}
+
+    text = generate_content_with_gemini(model, 'prompt', builder=builder, metrics=metrics, echo=False)
+
+    assert text == '# 제목\n<p>본문</p>\n태그::a,b'
+    post = builder.close()
+    assert post['title'] == '제목' and post['tags'] == ['a', 'b']
+    assert '<p>본문</p>' in post['html']
+    assert metrics['ttfb'] <= metrics['generation_time']
+
+
+def test_stream_starting_with_finish_chunk_still_records_ttfb():
+    model = StreamingModel(FinishChunk(), TextChunk('본문'))
+    metrics = {}
+
+    assert generate_content_with_gemini(model, 'prompt', builder=StreamingPostBuilder(), metrics=metrics,
+                                        echo=False) == '본문'
+    assert 'ttfb' in metrics
@@ -0,0 +1,64 @@
+from news_ingest import iter_news_items
+
+
+class FakeResponse:
+    def __init__(self, items):
+        self.items = items
+        self.content = b''
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'list': self.items}
+
+
+class PageIgnoringSession:
+    """page 값을 무시하고 항상 같은 목록을 돌려주는 API."""
+
+    def __init__(self, page_size):
+        self.items = [{'linkUrl': f"https://news.example/{i}"} for i in range(page_size)]
+        self.pages = []
+
+    def get(self, url, params=None, timeout=None):
+        self.pages.append(params['page'])
+        return FakeResponse(self.items)
+
+
+class PagedSession:
+    def __init__(self, total, page_size):
+        self.items = [{'linkUrl': f"https://news.example/{i}"} for i in range(total)]
+        self.page_size = page_size
+        self.pages = []
+
+    def get(self, url, params=None, timeout=None):
+        page = params['page']
+        self.pages.append(page)
+        return FakeResponse(self.items[(page - 1) * self.page_size:page * self.page_size])
+
+
+def test_stops_when_page_adds_no_new_links():
+    session = PageIgnoringSession(page_size=3)
+
+    items = list(iter_news_items(session, '2026-10-17', page_size=3, max_pages=None))
+
+    assert session.pages == [1, 2]
+    assert len(items) == 6
+
+
+def test_stops_at_max_pages():
+    session = PagedSession(total=100, page_size=3)
+
+    items = list(iter_news_items(session, '2026-10-17', page_size=3, max_pages=4))
+
+    assert session.pages == [1, 2, 3, 4]
+    assert len(items) == 12
+
+
+def test_reads_every_page_of_each_day():
+    session = PagedSession(total=7, page_size=3)
+
+    items = list(iter_news_items(session, '2026-10-17', days=2, page_size=3))
+
+    assert session.pages == [1, 2, 3, 1, 2, 3]
+    assert len(items) == 14
@@ -0,0 +1,71 @@
+import re
+import time
+
+from news_summarizer import SUMMARY_PROMPT_VERSION, MapReduceSummarizer
+from summary_store import SummaryStore, article_fingerprint
+
+
+class SummaryModel:
+    """추출 프롬프트의 기사마다 '- 요약 <본문 앞부분>'을 돌려주는 모델."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        articles = re.findall(r'^\[기사 (\d+)\]\n(.*)$', prompt, re.MULTILINE)
+        return Response('\n'.join(f"[기사 {n}]\n- 요약 {text[:10]}" for n, text in articles))
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+
+
+TEXTS = ['서울 아파트 매매가격 0.12% 상승', '경기 전세가격 0.05% 하락']
+
+
+def test_summaries_are_reused_for_same_model_and_prompt_version(tmp_path):
+    store = SummaryStore(str(tmp_path / 'summaries.sqlite3'))
+    model = SummaryModel()
+
+    first, stats = MapReduceSummarizer(model, store=store, model_name='gemini-a').summarize(TEXTS)
+    assert model.calls == 1 and stats['cache_hits'] == 0
+
+    again, stats = MapReduceSummarizer(model, store=store, model_name='gemini-a').summarize(TEXTS + ['부산 청약 경쟁률'])
+    assert model.calls == 2 and stats['cache_hits'] == 2
+    assert again[:2] == first
+    assert store.get(article_fingerprint(TEXTS[0]), 'gemini-a', SUMMARY_PROMPT_VERSION) == first[0]
+
+
+def test_other_model_or_prompt_version_does_not_reuse_summaries(tmp_path, monkeypatch):
+    store = SummaryStore(str(tmp_path / 'summaries.sqlite3'))
+    model = SummaryModel()
+    MapReduceSummarizer(model, store=store, model_name='gemini-a').summarize(TEXTS)
+
+    _, stats = MapReduceSummarizer(model, store=store, model_name='gemini-b').summarize(TEXTS)
+    assert stats['cache_hits'] == 0
+
+    monkeypatch.setattr('news_summarizer.SUMMARY_PROMPT_VERSION', SUMMARY_PROMPT_VERSION + 1)
+    _, stats = MapReduceSummarizer(model, store=store, model_name='gemini-a').summarize(TEXTS)
+    assert stats['cache_hits'] == 0
+    assert model.calls == 3
+
+
+def test_failed_groups_are_not_stored_and_old_summaries_expire(tmp_path):
+    store = SummaryStore(str(tmp_path / 'summaries.sqlite3'), max_age=3600)
+
+    class BrokenModel:
+        def generate_content(self, prompt):
+            return Response('형식에 맞지 않는 응답')
+
+    summaries, stats = MapReduceSummarizer(BrokenModel(), store=store, model_name='m').summarize(TEXTS)
+    assert stats['failed'] == 2 and summaries == TEXTS
+    assert store.get(article_fingerprint(TEXTS[0]), 'm', SUMMARY_PROMPT_VERSION) is None
+
+    fingerprint = article_fingerprint(TEXTS[0])
+    store.put_many('m', SUMMARY_PROMPT_VERSION, {fingerprint: '- 요약'})
+    with store._conn:
+        store._conn.execute("UPDATE summaries SET stored_at = ?", (time.time() - 7200,))
+    assert store.get(fingerprint, 'm', SUMMARY_PROMPT_VERSION) is None
+    assert store.prune() == 1
@@ -0,0 +1,102 @@
+from post_renderer import prepare_post
+from post_validator import LENGTH, OUTLOOK_HEADING, SECTION, TABLE, repair_post, validate_post
+from real_estate_posting import validate_response
+
+TODAY = '2026-10-17'
+TAG_LINE = '태그::부동산분석,시장동향,투자전략,정책변화,지역별분석'
+PARAGRAPH = '<p>서울 아파트 매매가격은 기준금리 동결 이후 0.12% 올랐고, 거래량은 전월보다 8% 늘었습니다. ' * 18 + '</p>'
+OUTLOOK = [f'<h2>{OUTLOOK_HEADING}</h2>', PARAGRAPH]
+TABLE_LINE = '<table><tr><th>지역</th><th>변동률</th></tr><tr><td>서울</td><td>0.12%</td></tr></table>'
+
+
+class FakeModel:
+    """재요청 프롬프트를 기록하고 준비된 응답을 순서대로 돌려주는 모델."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return FakeResponse(self.answers.pop(0))
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+def make_lines(outlook=True):
+    lines = [f'# {TODAY} 부동산 시장 분석 리포트', '']
+    for section in ('정책 및 제도 변화', '지역별 시장 동향', '수급 균형'):
+        lines += [f'<h2>{section}</h2>', PARAGRAPH, '']
+    if outlook:
+        lines += OUTLOOK + ['']
+    return lines + [TAG_LINE]
+
+
+def test_complete_post_passes():
+    assert validate_post('\n'.join(make_lines())) == []
+
+
+def test_missing_outlook_section_is_regenerated_alone():
+    lines = make_lines(outlook=False)
+    model = FakeModel('\n'.join(OUTLOOK))
+
+    content, repaired = validate_response(model, '\n'.join(lines), TODAY)
+
+    assert repaired
+    assert len(model.prompts) == 1 and '시장 전망 섹션' in model.prompts[0]
+    # 섹션만 태그 줄 앞에 들어가고 나머지 줄은 그대로
+    assert content.split('\n') == lines[:-1] + [''] + OUTLOOK + [''] + lines[-1:]
+    assert validate_post(content) == []
+
+
+def test_missing_section_that_also_makes_post_short_costs_one_call():
+    lines = make_lines(outlook=False)
+    model = FakeModel('\n'.join(OUTLOOK))
+    # 섹션 세 개로는 모자라고 시장 전망 섹션을 더하면 충분한 분량
+    min_chars = len(PARAGRAPH) * 3 + 500
+
+    content, report = repair_post(model, '\n'.join(lines), TODAY, min_chars=min_chars)
+
+    assert report['issues'] == [SECTION, LENGTH]
+    assert report['remaining'] == []
+    assert len(model.prompts) == 1
+
+
+def test_malformed_table_is_regenerated_alone():
+    lines = make_lines()
+    broken = ['<table><tr><th>지역</th><th>변동률</th></tr>', '<tr><td>서울<td>0.12%</tr>']
+    lines[4:4] = broken
+    model = FakeModel('```html\n' + TABLE_LINE + '\n```')
+
+    content, report = repair_post(model, '\n'.join(lines), TODAY)
+
+    assert report['issues'] == [TABLE] and report['remaining'] == []
+    assert len(model.prompts) == 1 and '\n'.join(broken) in model.prompts[0]
+    assert content.split('\n') == lines[:4] + [TABLE_LINE] + lines[6:]
+    assert TABLE_LINE in prepare_post(content)['html']
+
+
+def test_markdown_table_falls_back_to_text_when_request_fails():
+    lines = make_lines()
+    lines[4:4] = ['| 지역 | 변동률 |', '|---|---|', '| 서울 | 0.12% |']
+    model = FakeModel('표를 만들 수 없습니다.')
+
+    content, report = repair_post(model, '\n'.join(lines), TODAY)
+
+    assert report['remaining'] == []
+    assert content.split('\n')[4:6] == ['지역 변동률', '서울 0.12%']
+
+
+def test_table_split_over_lines_is_joined_without_request():
+    lines = make_lines()
+    lines[4:4] = ['<table>', '<tr><th>지역</th><th>변동률</th></tr>', '<tr><td>서울</td><td>0.12%</td></tr>', '</table>']
+    model = FakeModel()
+
+    content, report = repair_post(model, '\n'.join(lines), TODAY)
+
+    assert report['issues'] == [TABLE] and report['remaining'] == []
+    assert model.prompts == []
+    assert content.split('\n')[4] == TABLE_LINE
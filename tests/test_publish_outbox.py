@@ -0,0 +1,146 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from publish_outbox import (
+    FAILED,
+    PUBLISHED,
+    OutboxPublisher,
+    PublishOutbox,
+    PublishRejected,
+    RetryablePublishError,
+    publish_marker,
+)
+from real_estate_posting import find_published_post
+
+TITLE = '2025-01-01 부동산 시장 분석 리포트'
+SLOT = '2025-01-01'
+
+
+def make_post(body):
+    return {'title': TITLE, 'html': f'<p>{body}</p>', 'tags': '부동산,시장동향'}
+
+
+def make_publisher(tmp_path, send, find_existing=None):
+    outbox = PublishOutbox(str(tmp_path / 'outbox.sqlite3'))
+    return OutboxPublisher(outbox, send, find_existing=find_existing, per_minute=6000, burst=100,
+                           backoff_base=0.01, backoff_cap=0.02)
+
+
+def test_same_day_posts_in_different_slots_are_both_published(tmp_path):
+    sent = []
+    publisher = make_publisher(tmp_path, lambda item: sent.append(item['post']) or item['key'])
+
+    first, _ = publisher.outbox.enqueue('blog', make_post('오전 기사'), '2025-01-01 08:00', 'real_estate')
+    second, created = publisher.outbox.enqueue('blog', make_post('오후 기사'), '2025-01-01 18:00', 'real_estate')
+    items = publisher.drain(keys=[first, second], timeout=5)
+
+    assert created and first != second
+    assert [item['status'] for item in items.values()] == [PUBLISHED, PUBLISHED]
+    assert [post['html'] for post in sent] == ['<p>오전 기사</p>', '<p>오후 기사</p>']
+
+
+def test_regenerated_post_for_same_slot_is_published_once(tmp_path):
+    sent = []
+    publisher = make_publisher(tmp_path, lambda item: sent.append(item['post']) or item['key'])
+
+    key, _ = publisher.outbox.enqueue('blog', make_post('기사'), SLOT, 'real_estate')
+    publisher.drain(keys=[key], timeout=5)
+    # 재개한 실행이 Gemini로 글을 다시 생성해 본문이 달라진 경우
+    again, created = publisher.outbox.enqueue('blog', make_post('다시 생성한 기사'), SLOT, 'real_estate')
+    items = publisher.drain(keys=[again], timeout=5)
+
+    assert again == key and not created
+    assert items[key]['status'] == PUBLISHED
+    assert [post['html'] for post in sent] == ['<p>기사</p>']
+
+
+def test_incremental_posts_with_different_articles_get_different_keys(tmp_path):
+    outbox = PublishOutbox(str(tmp_path / 'outbox.sqlite3'))
+    morning = [{'url': 'https://news.example/1', 'fingerprint': 1}]
+    afternoon = [{'url': 'https://news.example/2', 'fingerprint': 2}]
+
+    first, _ = outbox.enqueue('blog', make_post('오전 기사'), SLOT, 'real_estate', seen_articles=morning)
+    second, created = outbox.enqueue('blog', make_post('오후 기사'), SLOT, 'real_estate', seen_articles=afternoon)
+    again, _ = outbox.enqueue('blog', make_post('오전 기사'), SLOT, 'real_estate', seen_articles=list(morning))
+
+    assert created and first != second
+    assert again == first
+    assert outbox.get(second)['seen_articles'] == afternoon
+
+
+def test_retry_finds_post_published_without_response(tmp_path):
+    published = {}
+
+    def send(item):
+        # 게시는 되었지만 응답을 받지 못한 경우
+        published[item['key']] = item['post']['html'] + publish_marker(item['key'])
+        raise RetryablePublishError('연결 끊김')
+
+    def find_existing(item):
+        return next((f"/blog/{key}" for key, html in published.items() if publish_marker(item['key']) in html), None)
+
+    publisher = make_publisher(tmp_path, send, find_existing)
+    key, _ = publisher.outbox.enqueue('blog', make_post('기사'), SLOT, 'real_estate')
+    other, _ = publisher.outbox.enqueue('blog', make_post('다른 기사'), SLOT, 'economy')
+    items = publisher.drain(keys=[key, other], timeout=5)
+
+    assert items[key]['status'] == PUBLISHED
+    assert items[other]['status'] == PUBLISHED
+    assert len(published) == 2
+
+
+def test_rejected_post_fails_without_retry(tmp_path):
+    calls = []
+
+    def send(item):
+        calls.append(item['key'])
+        raise PublishRejected('포스팅 실패 (상태 코드: 400)')
+
+    publisher = make_publisher(tmp_path, send)
+    key, _ = publisher.outbox.enqueue('blog', make_post('기사'), SLOT, 'real_estate')
+    items = publisher.drain(keys=[key], timeout=5)
+
+    assert items[key]['status'] == FAILED
+    assert calls == [key]
+
+
+class FakeResponse:
+    def __init__(self, data=None, text=''):
+        self.status_code = 200
+        self.data = data
+        self.text = text
+
+    def json(self):
+        return self.data
+
+
+class StrippingBlog:
+    """표식(HTML 주석)을 지우고 본문을 보여 주는 블로그의 글 목록과 글 페이지."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.pages = []
+
+    def get(self, url, params=None, headers=None, allow_redirects=True, timeout=None):
+        if url.endswith('/manage/posts.json'):
+            return FakeResponse({'items': self.entries})
+        self.pages.append(url)
+        return FakeResponse(text='<p>기사</p>')
+
+
+def test_published_post_without_marker_is_found_by_title_and_time():
+    sent_at = datetime(2025, 1, 1, 8, 0, tzinfo=ZoneInfo('Asia/Seoul')).timestamp()
+    blog = StrippingBlog([
+        {'title': TITLE, 'permalink': '/2', 'published': '2025-01-01 08:00:05'},
+        {'title': TITLE, 'permalink': '/1', 'published': '2025-01-01 07:00:00'},
+        {'title': '다른 글', 'permalink': '/3', 'published': '2025-01-01 08:01:00'},
+    ])
+
+    found = find_published_post('blog', TITLE, 'key', 'TSSESSION=ok', http_session=blog, sent_after=sent_at)
+    earlier = find_published_post('blog', TITLE, 'key', 'TSSESSION=ok', http_session=blog,
+                                  sent_after=sent_at + 3600)
+
+    assert found == '/2'
+    assert earlier is None
+    # 표식을 먼저 확인한 뒤에만 제목과 시각으로 찾음
+    assert len(blog.pages) == 4
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+import pytest
+
+import scheduler_daemon
+from scheduler_daemon import SKIPPED, SUCCESS, CronSchedule, SchedulerDaemon, _parse_field, start_health_server
+
+
+def test_parse_field_steps_and_ranges():
+    assert _parse_field('*/15', 0, 59) == {0, 15, 30, 45}
+    assert _parse_field('0-30/10', 0, 59) == {0, 10, 20, 30}
+    assert _parse_field('5/20', 0, 59) == {5, 25, 45}
+    assert _parse_field('1-3,10', 1, 31) == {1, 2, 3, 10}
+    for field in ('0-60', '5-1', '*/0', '32'):
+        with pytest.raises(ValueError):
+            _parse_field(field, 1, 31 if field == '32' else 59)
+
+
+def test_weekday_seven_is_sunday():
+    saturday = datetime(2026, 10, 17, 9, 0)
+
+    assert CronSchedule('0 8 * * 7').next_after(saturday) == datetime(2026, 10, 18, 8, 0)
+    assert CronSchedule('0 8 * * 0').next_after(saturday) == datetime(2026, 10, 18, 8, 0)
+    assert CronSchedule('0 8 * * 5-7').next_after(saturday - timedelta(days=1)) == datetime(2026, 10, 17, 8, 0)
+
+
+def test_day_of_month_or_day_of_week():
+    # 1일 또는 월요일 (둘 다 '*'가 아니면 하나만 맞아도 실행)
+    schedule = CronSchedule('0 8 1 * 1')
+    runs = [datetime(2026, 10, 17)]
+    for _ in range(4):
+        runs.append(schedule.next_after(runs[-1]))
+
+    assert runs[1:] == [datetime(2026, 10, 19, 8), datetime(2026, 10, 26, 8), datetime(2026, 11, 1, 8),
+                        datetime(2026, 11, 2, 8)]
+    # 한쪽이 '*'이면 다른 쪽만 봄
+    assert CronSchedule('0 8 1 * *').next_after(datetime(2026, 10, 17)) == datetime(2026, 11, 1, 8)
+
+
+class TickSchedule:
+    """interval초마다 실행하는 일정 (cron은 분 단위라 테스트에서 기다리기에 너무 김)."""
+
+    expression = 'tick'
+    tz = None
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.origin = datetime.now()
+
+    def next_after(self, moment=None):
+        elapsed = ((moment or datetime.now()) - self.origin).total_seconds()
+        return self.origin + timedelta(seconds=(int(elapsed / self.interval) + 1) * self.interval)
+
+
+def test_runs_missed_during_long_run_are_skipped(monkeypatch):
+    monkeypatch.setattr(scheduler_daemon, '_POLL_SECONDS', 0.05)
+    started = []
+
+    def job():
+        started.append(time.monotonic())
+        if len(started) == 1:
+            # 예약 시각 다섯 번을 지나치는 긴 실행
+            time.sleep(0.5)
+        if len(started) == 3:
+            daemon.stop()
+        return SUCCESS
+
+    daemon = SchedulerDaemon(TickSchedule(0.1), job)
+    daemon.run_forever()
+
+    assert len(started) == 3
+    # 긴 실행이 끝난 뒤 밀린 실행을 몰아서 하지 않고 다음 예약 시각을 기다림
+    assert started[1] - started[0] >= 0.5
+    assert started[2] - started[1] >= 0.05
+    assert daemon.results[SUCCESS] == 3
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_healthz_returns_503_when_loop_is_stuck_or_stopped():
+    daemon = SchedulerDaemon(CronSchedule('0 8 * * *'), lambda: SKIPPED)
+    server = start_health_server(daemon, port=0)
+    url = f"http://127.0.0.1:{server.server_port}/healthz"
+    try:
+        assert get(url)[0] == 200
+
+        # 일정 확인 루프가 오랫동안 깨어나지 않음
+        daemon._heartbeat -= scheduler_daemon._POLL_SECONDS * 5
+        status, body = get(url)
+        assert status == 503 and body['status'] == 'unavailable'
+
+        # 실행 중에는 루프가 멈춰 있어도 정상
+        daemon.running = True
+        assert get(url)[0] == 200
+
+        daemon.stop()
+        assert get(url)[0] == 503
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stop_interrupts_wait_for_next_run():
+    daemon = SchedulerDaemon(CronSchedule('0 8 * * *'), lambda: SUCCESS)
+    thread = threading.Thread(target=daemon.run_forever)
+    thread.start()
+    time.sleep(0.1)
+    daemon.stop()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert daemon.results[SUCCESS] == 0
@@ -0,0 +1,27 @@
+import seen_index
+from seen_index import SeenArticleIndex
+
+
+def test_novel_indices_computes_each_fingerprint_once(tmp_path, monkeypatch):
+    index = SeenArticleIndex(str(tmp_path / 'seen.sqlite3'))
+    index.stage({'url': f"https://news.example/{i}", 'text': f"이미 다룬 기사 {i} " * 20} for i in range(50))
+    index.commit()
+
+    calls = []
+    original = seen_index.simhash
+    monkeypatch.setattr(seen_index, 'simhash', lambda text: calls.append(text) or original(text))
+    texts = ["이미 다룬 기사 7 " * 20, "전혀 다른 새 기사 본문입니다. " * 20]
+    novel = index.novel_indices(texts, threshold=3)
+
+    assert novel == [1]
+    assert len(calls) == len(texts)
+
+
+def test_novel_indices_uses_given_fingerprints(tmp_path, monkeypatch):
+    def fail(text):
+        raise AssertionError(f"지문을 다시 계산했습니다: {text}")
+
+    index = SeenArticleIndex(str(tmp_path / 'seen.sqlite3'))
+    monkeypatch.setattr(seen_index, 'simhash', fail)
+
+    assert index.novel_indices(['a', 'b'], fingerprints=[1, 2]) == [0, 1]
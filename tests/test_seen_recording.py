@@ -0,0 +1,101 @@
+import random
+import time
+
+import real_estate_posting
+from publish_outbox import PUBLISHED, OutboxPublisher, PublishOutbox, RetryablePublishError
+from seen_index import SeenArticleIndex
+
+
+class MemoryCheckpoint:
+    def __init__(self, **stages):
+        self.stages = dict(stages)
+
+    def load(self, stage):
+        return self.stages.get(stage)
+
+    def save(self, stage, value):
+        self.stages[stage] = value
+
+
+def article(seed, prefix=''):
+    rng = random.Random(seed)
+    return prefix + ''.join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(300))
+
+
+def saved_articles():
+    relevant = article(1, '부동산 아파트 금리 대출 정책 ')
+    also_relevant = article(2, '전세 청약 분양 규제 대책 ')
+    unrelated = article(3)
+    return [
+        {'url': 'https://news.example/relevant', 'text': relevant},
+        {'url': 'https://news.example/also-relevant', 'text': also_relevant},
+        {'url': 'https://news.example/unrelated', 'text': unrelated},
+        {'url': 'https://news.example/unrelated-copy', 'text': unrelated + ' 끝'},
+    ]
+
+
+def test_articles_dropped_from_prompt_are_not_recorded(tmp_path, monkeypatch):
+    # 두 기사만 들어가는 토큰 예산
+    monkeypatch.setenv('PROMPT_TOKEN_BUDGET', '450')
+    monkeypatch.setenv('INCREMENTAL_MIN_NEW_ARTICLES', '1')
+    checkpoint = MemoryCheckpoint(articles=saved_articles())
+    index = SeenArticleIndex(str(tmp_path / 'seen.sqlite3'))
+
+    text = real_estate_posting.fetch_news_articles_text('2026-10-17', checkpoint=checkpoint, seen_index=index)
+
+    assert article(3)[:100] not in text
+    assert [a['url'] for a in index.pending] == [
+        'https://news.example/relevant', 'https://news.example/also-relevant',
+    ]
+    assert [a['url'] for a in checkpoint.load('articles') if a.get('dropped')] == [
+        'https://news.example/unrelated', 'https://news.example/unrelated-copy',
+    ]
+
+
+def test_resumed_run_records_only_articles_in_prompt(tmp_path):
+    articles = saved_articles()
+    for dropped in articles[2:]:
+        dropped['dropped'] = True
+    index = SeenArticleIndex(str(tmp_path / 'seen.sqlite3'))
+
+    published = real_estate_posting.published_articles(index, MemoryCheckpoint(articles=articles))
+    index.record(published)
+
+    assert [a['url'] for a in published] == ['https://news.example/relevant', 'https://news.example/also-relevant']
+    assert index.has_url('https://news.example/relevant')
+    assert not index.has_url('https://news.example/unrelated')
+    assert not index.has_url('https://news.example/unrelated-copy')
+
+
+def test_articles_are_recorded_when_pending_post_is_published_later(tmp_path, monkeypatch):
+    # 이번 실행은 게시를 기다리지 않고, 첫 시도는 서버 오류로 실패
+    monkeypatch.setenv('PUBLISH_OUTBOX_WAIT', '0')
+    index = SeenArticleIndex(str(tmp_path / 'seen.sqlite3'))
+    index.stage(saved_articles()[:2])
+    outbox = PublishOutbox(str(tmp_path / 'outbox.sqlite3'))
+    sender = real_estate_posting.TistoryOutboxSender(None, None, vault=object(), seen_index=index)
+    responses = [RetryablePublishError('503'), '/blog/1']
+
+    def send(item):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    publisher = OutboxPublisher(outbox, send, on_published=sender.record_published, per_minute=6000, burst=100,
+                                backoff_base=60.0, backoff_cap=60.0)
+    post = {'title': '2026-10-17 부동산 시장 분석 리포트', 'html': '<p>본문</p>', 'tags': ['부동산']}
+
+    success, message = real_estate_posting.publish_via_outbox(
+        publisher, 'blog', post, seen_articles=real_estate_posting.published_articles(index))
+
+    assert not success and '게시 대기 중' in message
+    assert not index.has_url('https://news.example/relevant')
+
+    # 재시도 시각이 지난 뒤 다음 실행이나 데몬의 대기열 처리에서 게시됨
+    publisher.publish_one(outbox.claim('blog', now=time.time() + 3600))
+
+    assert [item['status'] for item in outbox.items()] == [PUBLISHED]
+    assert index.has_url('https://news.example/relevant')
+    assert index.has_url('https://news.example/also-relevant')
+    assert index.novel_indices([saved_articles()[0]['text']]) == []
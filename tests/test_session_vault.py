@@ -0,0 +1,40 @@
+from session_vault import SessionVault
+
+COOKIE = 'TSSESSION=secret; _T_ANO=value'
+
+
+def test_plaintext_session_is_not_saved_in_ci(tmp_path, monkeypatch):
+    monkeypatch.setenv('CI', 'true')
+    monkeypatch.delenv('TISTORY_SESSION_PLAINTEXT', raising=False)
+    path = tmp_path / 'tistory_session'
+    vault = SessionVault(str(path))
+
+    vault.save(COOKIE)
+    assert not path.exists()
+
+    # 이전 캐시에서 복원된 평문 파일도 읽지 않음
+    path.write_text(COOKIE)
+    assert vault.load() is None
+
+
+def test_plaintext_session_is_saved_outside_ci(tmp_path, monkeypatch):
+    monkeypatch.delenv('CI', raising=False)
+    monkeypatch.delenv('TISTORY_SESSION_PLAINTEXT', raising=False)
+    vault = SessionVault(str(tmp_path / 'tistory_session'))
+
+    vault.save(COOKIE)
+
+    assert vault.load() == COOKIE
+
+
+def test_encrypted_session_is_saved_in_ci(tmp_path, monkeypatch):
+    from cryptography.fernet import Fernet
+
+    monkeypatch.setenv('CI', 'true')
+    path = tmp_path / 'tistory_session'
+    vault = SessionVault(str(path), key=Fernet.generate_key().decode())
+
+    vault.save(COOKIE)
+
+    assert COOKIE.encode() not in path.read_bytes()
+    assert vault.load() == COOKIE
@@ -0,0 +1,76 @@
+import time
+
+from stage_graph import StageGraph
+
+
+def sleeper(seconds, value=None):
+    def run(*args):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def failing(seconds=0.0):
+    def run(*args):
+        time.sleep(seconds)
+        raise RuntimeError("단계 실패")
+    return run
+
+
+def statuses(graph):
+    return {name: stage['status'] for name, stage in graph.report()['stages'].items()}
+
+
+def test_failed_stage_skips_dependents_transitively():
+    graph = StageGraph()
+    graph.add('fetch', failing())
+    graph.add('prompt', sleeper(0, 'prompt'), deps=('fetch',))
+    graph.add('generate', sleeper(0, 'draft'), deps=('prompt',))
+    graph.add('auth', sleeper(0.02, 'cookie'))
+    graph.add('check', lambda cookie: cookie + '!', deps=('auth',))
+    graph.add('publish', sleeper(0, 'posted'), deps=('auth', 'generate'))
+
+    results = graph.run()
+
+    assert statuses(graph) == {'fetch': 'failed', 'prompt': 'skipped', 'generate': 'skipped',
+                               'auth': 'done', 'check': 'done', 'publish': 'skipped'}
+    assert results == {'auth': 'cookie', 'check': 'cookie!'}
+    assert list(graph.errors) == ['fetch']
+    stages = graph.report()['stages']
+    assert stages['publish']['start'] is None and stages['publish']['error'] is None
+
+
+def test_critical_path_follows_latest_finishing_dependency():
+    graph = StageGraph()
+    graph.add('auth', sleeper(0.2))
+    graph.add('fetch', sleeper(0.02))
+    graph.add('generate', sleeper(0.02), deps=('fetch',))
+    graph.add('publish', sleeper(0.01), deps=('auth', 'generate'))
+    graph.run()
+
+    assert graph.critical_path() == ['auth', 'publish']
+
+    graph = StageGraph()
+    graph.add('auth', sleeper(0.01))
+    graph.add('fetch', sleeper(0.05))
+    graph.add('generate', sleeper(0.1), deps=('fetch',))
+    graph.add('publish', sleeper(0.01), deps=('auth', 'generate'))
+    graph.run()
+
+    assert graph.report()['critical_path'] == ['fetch', 'generate', 'publish']
+    assert graph.format_critical_path().startswith('fetch(')
+
+
+def test_critical_path_ends_at_failed_stage_when_dependents_are_skipped():
+    graph = StageGraph()
+    graph.add('auth', sleeper(0.01))
+    graph.add('fetch', sleeper(0.02))
+    graph.add('generate', failing(0.1), deps=('fetch',))
+    graph.add('render', sleeper(0), deps=('generate',))
+    graph.add('publish', sleeper(0), deps=('auth', 'render'))
+    graph.run()
+
+    # 건너뛴 단계는 시작/종료 시각이 없으므로 경로에 들어가지 않음
+    assert statuses(graph)['publish'] == 'skipped'
+    assert graph.critical_path() == ['fetch', 'generate']
+